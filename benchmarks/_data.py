@@ -0,0 +1,31 @@
+"""
+LinkedIn Rabbit - Benchmark Data
+
+The vocabulary and the synthetic post factories shared by the benchmarks and
+the mock LinkedIn site. Everything is generated from a seed, so every run of
+a benchmark works on the same posts.
+"""
+
+import random
+
+WORDS = ("team product launch growth hiring data engineering leadership customer "
+         "excited announce proud thanks journey learning AI startup market").split()
+EXTRAS = ["🚀", "🎉", "’", "“quoted”", "—", "café", "#hiring", "https://lnkd.in/abc"]
+
+def synthetic_text(rng, words, extras=(), extra_ratio=0.0):
+    """Return words tokens from WORDS, of which about extra_ratio are taken from extras instead."""
+    if not extras:
+        return ' '.join(rng.choice(WORDS) for _ in range(words))
+    return ' '.join(rng.choice(extras) if rng.random() < extra_ratio else rng.choice(WORDS) for _ in range(words))
+
+def synthetic_posts(count, seed=42, extras=(), extra_ratio=0.0):
+    """Return count Posts of one to four paragraphs of 20-100 words."""
+    # Imported here so that the mock site runs without the package on the path
+    from linkedin_rabbit.records import Post
+    rng = random.Random(seed)
+    return [
+        Post('\n\n'.join(synthetic_text(rng, rng.randint(20, 100), extras, extra_ratio)
+                         for _ in range(rng.randint(1, 4))),
+             f"{rng.randint(1, 11)}mo", rng.randint(0, 5000), rng.randint(0, 300), rng.randint(0, 50))
+        for _ in range(count)
+    ]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Text Parser Benchmark
+
+Writes a synthetic text output file and parses it back with the streaming
+parser (through a buffered file and through mmap) and, for comparison, with
+the previous read-everything parser, reporting posts and megabytes per second.
+
+Usage: python benchmarks/bench_parser.py [--posts 20000] [--repeat 3]
+"""
+
+import os
+import re
+import sys
+import argparse
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_rabbit.records import render_text, read_text_posts
+from _data import synthetic_posts
+
+def legacy_parse(file_path):
+    """The previous parser: reads the whole file and searches each engagement line three times."""
+    posts_data = []
+    current_post = None
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        content = f.read()
+    for line in content.split('\n'):
+        if line.startswith('Post #'):
+            if current_post:
+                posts_data.append(current_post)
+            current_post = {'content': ''}
+        elif current_post:
+            if line.startswith('Date:'):
+                current_post['date'] = line[5:].strip()
+            elif line.startswith('Engagement:'):
+                engagement_text = line[11:].strip()
+                engagement = {}
+                for name in ('likes', 'comments', 'shares'):
+                    match = re.search(r'(\d+) ' + name, engagement_text)
+                    engagement[name] = match.group(1) if match else '0'
+                current_post['engagement'] = engagement
+            elif not line.startswith('=') and not line.startswith('-') and not line.startswith('LinkedIn Posts for:') and not line.startswith('Extracted on:') and not line.startswith('Number of posts:'):
+                current_post['content'] += line + '\n'
+    if current_post:
+        posts_data.append(current_post)
+    return posts_data
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the text output parser')
+    parser.add_argument('--posts', type=int, default=20000, help='Number of synthetic posts')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (the best is reported)')
+    args = parser.parse_args()
+    
+    posts = synthetic_posts(args.posts, seed=11)
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, 'posts.txt')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            for chunk in render_text(posts, 'Benchmark'):
+                f.write(chunk)
+        megabytes = os.path.getsize(filepath) / 1024 / 1024
+        print(f"{args.posts} posts, {megabytes:.1f} MB")
+        
+        if list(read_text_posts(filepath)) != posts:
+            sys.exit("The parsed posts differ from the written ones")
+        
+        cases = [
+            ('legacy', lambda: legacy_parse(filepath)),
+            ('stream', lambda: sum(1 for _ in read_text_posts(filepath))),
+            ('mmap', lambda: sum(1 for _ in read_text_posts(filepath, use_mmap=True)))
+        ]
+        print(f"{'parser':>7} {'ms':>8} {'posts/s':>10} {'MB/s':>7}")
+        for name, parse in cases:
+            seconds = min(timeit.repeat(parse, number=1, repeat=args.repeat))
+            print(f"{name:>7} {seconds * 1000:>8.1f} {args.posts / seconds:>10.0f} {megabytes / seconds:>7.1f}")
+
+if __name__ == "__main__":
+    main()
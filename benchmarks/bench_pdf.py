@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - PDF Renderer Benchmark
+
+Renders synthetic corpora of 100, 1,000 and 10,000 posts with the streaming
+renderer and, for comparison, with the previous fpdf-based implementation,
+and reports the time and peak traced memory of each.
+
+Usage: python benchmarks/bench_pdf.py [--sizes 100 1000 10000] [--legacy-max 1000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpdf import FPDF
+from linkedin_rabbit.pdf_renderer import render_pdf
+from _data import EXTRAS, synthetic_posts
+
+def legacy_pdf(posts, filepath):
+    """The previous renderer: per-character sanitizing and 80-character multi_cell slices."""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, "LinkedIn Posts for: Benchmark", 0, 1, "C")
+    for idx, post in enumerate(posts, 1):
+        pdf.set_font("Arial", "B", 14)
+        pdf.cell(0, 10, f"Post #{idx}", 0, 1)
+        pdf.set_font("Arial", "I", 12)
+        pdf.cell(0, 10, f"Date: {post.date}", 0, 1)
+        pdf.cell(0, 10, f"Engagement: {post.engagement_text()}", 0, 1)
+        pdf.ln(5)
+        pdf.set_font("Arial", "", 12)
+        content = ''.join(char if ord(char) < 65536 else '?' for char in post.content)
+        for line in content.split('\n'):
+            if not line.strip():
+                pdf.ln(5)
+                continue
+            clean_line = ''
+            for char in line:
+                if 32 <= ord(char) <= 255:
+                    clean_line += char
+                else:
+                    clean_line += '?'
+            while len(clean_line) > 80:
+                pdf.multi_cell(0, 10, clean_line[:80])
+                clean_line = clean_line[80:]
+            pdf.multi_cell(0, 10, clean_line)
+        pdf.ln(5)
+        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+        pdf.ln(5)
+        if idx < len(posts) and pdf.get_y() > 250:
+            pdf.add_page()
+    pdf.output(filepath)
+
+def streaming_pdf(posts, filepath):
+    render_pdf(posts, filepath, "Benchmark")
+
+def measure(render, posts, filepath):
+    """Return (seconds, peak traced MB, file size MB) of one rendering."""
+    started = time.perf_counter()
+    render(posts, filepath)
+    seconds = time.perf_counter() - started
+    
+    tracemalloc.start()
+    render(posts, filepath)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024 / 1024, os.path.getsize(filepath) / 1024 / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the PDF renderers')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='Corpus sizes to render')
+    parser.add_argument('--legacy-max', type=int, default=1000, help='Largest corpus to render with the previous implementation')
+    args = parser.parse_args()
+    
+    renderers = [('streaming', streaming_pdf), ('legacy', legacy_pdf)]
+    print(f"{'posts':>7} {'renderer':>10} {'seconds':>9} {'peak MB':>9} {'file MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            # The corpus itself is not counted: both renderers get the same list
+            posts = synthetic_posts(size, extras=EXTRAS, extra_ratio=0.05)
+            for name, render in renderers:
+                if name == 'legacy' and size > args.legacy_max:
+                    continue
+                seconds, peak, file_size = measure(render, posts, os.path.join(directory, f"{name}_{size}.pdf"))
+                print(f"{size:>7} {name:>10} {seconds:>9.2f} {peak:>9.1f} {file_size:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Sanitization Microbenchmark
+
+Compares the per-character loops previously used for the text and PDF outputs
+with the precompiled-regex functions of linkedin_rabbit.sanitize on
+emoji-heavy synthetic posts.
+
+Usage: python benchmarks/bench_sanitize.py [--posts 2000] [--repeat 5]
+"""
+
+import os
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_rabbit.sanitize import clean_text, clean_pdf, EMOJI_TEXT
+from _data import synthetic_text
+
+EMOJI = list(EMOJI_TEXT) + ["👍🏽", "👨‍💻", "❤️", "🦄", "🧠"]
+
+def legacy_text(content):
+    return ''.join(char if ord(char) < 65536 else '?' for char in content)
+
+def legacy_pdf(content):
+    content = ''.join(char if ord(char) < 65536 else '?' for char in content)
+    lines = []
+    for line in content.split('\n'):
+        clean_line = ''
+        for char in line:
+            if 32 <= ord(char) <= 255:
+                clean_line += char
+            else:
+                clean_line += '?'
+        lines.append(clean_line)
+    return '\n'.join(lines)
+
+def new_pdf(content):
+    return clean_pdf(content).encode('cp1252', errors='replace')
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark text sanitization')
+    parser.add_argument('--posts', type=int, default=2000, help='Number of synthetic posts')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (the best is reported)')
+    args = parser.parse_args()
+    
+    # Posts of 150 words where roughly one token in five is an emoji
+    rng = random.Random(7)
+    posts = [synthetic_text(rng, 150, EMOJI, 0.2) for _ in range(args.posts)]
+    characters = sum(len(post) for post in posts)
+    print(f"{args.posts} posts, {characters} characters")
+    
+    cases = [
+        ('text', legacy_text, clean_text),
+        ('text+emoji', legacy_text, lambda content: clean_text(content, emoji_text=True)),
+        ('pdf', legacy_pdf, new_pdf),
+        ('pdf+emoji', legacy_pdf, lambda content: clean_pdf(content, emoji_text=True).encode('cp1252', errors='replace'))
+    ]
+    print(f"{'output':>11} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for name, legacy, new in cases:
+        legacy_time = min(timeit.repeat(lambda: [legacy(post) for post in posts], number=1, repeat=args.repeat))
+        new_time = min(timeit.repeat(lambda: [new(post) for post in posts], number=1, repeat=args.repeat))
+        print(f"{name:>11} {legacy_time * 1000:>10.1f} {new_time * 1000:>8.1f} {legacy_time / new_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - End-to-End Scrape Benchmark
+
+Runs scrape_linkedin_posts in headless Chrome against the mock LinkedIn site
+(mock_linkedin.py), with all human-like delays turned off, once with bulk
+extraction and once with per-element extraction. For each run it reports
+posts per second, WebDriver commands per post, the functions issuing the
+most commands, the peak Python memory and the page's JavaScript heap, and
+checks the scraped posts against the ones the mock site served.
+
+Needs Chrome; chromedriver is resolved like in a normal run (CHROMEDRIVER_PATH
+points to an installed one).
+
+Usage: python benchmarks/bench_scrape.py [--posts 60] [--feed-posts 200] [--latency 0.05] [--modes bulk per-element]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from mock_linkedin import MockFeed, MockLinkedIn
+
+# linkedin_rabbit reads its configuration when it is imported, so it is only
+# imported once main() has pointed the environment at the mock site
+
+USERNAME = "bench@example.com"
+PASSWORD = "mock-password"
+MODES = {'bulk': True, 'per-element': False}
+TOP_FUNCTIONS = 4
+
+def page_heap_mb(driver):
+    """Return the JavaScript heap used by the open page in MB, or None."""
+    try:
+        return driver.execute_script("return performance.memory.usedJSHeapSize") / 1024 / 1024
+    except Exception:
+        return None
+
+def check_posts(filepath, feed, count):
+    """Return how many scraped posts match the first count posts the mock site served."""
+    from linkedin_rabbit.records import read_posts, Post
+    expected = [Post.from_dict(post) for post in feed.expected_posts()[:count]]
+    scraped = list(read_posts(filepath)) if filepath else []
+    return sum(
+        ' '.join(got.content.split()) == ' '.join(want.content.split()) and got.engagement == want.engagement and got.date == want.date
+        for got, want in zip(scraped, expected)
+    )
+
+def run_scrape(lr, server, args, mode):
+    """Scrape args.posts posts from the mock site in one batch and return the results."""
+    from linkedin_rabbit.metrics import collecting
+    from linkedin_rabbit.tracing import DriverTracer
+    
+    random.seed(args.seed)  # Same scroll behaviour in every mode
+    
+    # Every mode starts from the default yield estimate, not from the one the
+    # previous mode saved, so all modes size their scroll budget alike
+    if os.path.exists(lr.YIELD_ESTIMATES_FILE):
+        os.remove(lr.YIELD_ESTIMATES_FILE)
+    tracer = DriverTracer()
+    with collecting() as run_metrics:
+        with lr.ScrapeSession(USERNAME, PASSWORD, headless=not args.headed, lean=args.lean, tracer=tracer) as session:
+            started = time.perf_counter()
+            if not session.start():
+                sys.exit("Could not log in to the mock site")
+            startup = time.perf_counter() - started
+            commands_before = len(tracer)
+            
+            # Only the scrape itself is measured, not Chrome's startup and the login
+            tracemalloc.start()
+            started = time.perf_counter()
+            result = lr.scrape_linkedin_posts(server.profile_url(), args.posts, USERNAME, PASSWORD, headless=not args.headed,
+                                              batch_size=args.posts, session=session, bulk_extract=MODES[mode])
+            elapsed = time.perf_counter() - started
+            python_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+            
+            commands = len(tracer) - commands_before
+            heap = page_heap_mb(session.driver)
+    
+    from linkedin_rabbit.records import count_posts
+    posts = count_posts(result) if result else 0
+    functions = [row for row in tracer.summary() if row['function'] not in ('start', 'setup_driver', 'login_to_linkedin', 'page_heap_mb')]
+    return {
+        'mode': mode,
+        'posts': posts,
+        'correct': check_posts(result, server.feed, posts),
+        'startup_seconds': round(startup, 2),
+        'seconds': round(elapsed, 2),
+        'posts_per_second': round(posts / elapsed, 2) if elapsed else 0.0,
+        'commands': commands,
+        'commands_per_post': round(commands / posts, 1) if posts else None,
+        'python_peak_mb': round(python_peak, 1),
+        'page_heap_mb': round(heap, 1) if heap is not None else None,
+        'top_functions': functions[:TOP_FUNCTIONS],
+        'phases': run_metrics.report()['phases']
+    }
+
+def print_results(results):
+    print(f"\n{'mode':<12} {'posts':>5} {'ok':>5} {'startup s':>9} {'scrape s':>9} {'posts/s':>8} "
+          f"{'cmds/post':>9} {'py peak MB':>10} {'JS heap MB':>10}")
+    for r in results:
+        heap = f"{r['page_heap_mb']:.1f}" if r['page_heap_mb'] is not None else '-'
+        per_post = f"{r['commands_per_post']:.1f}" if r['commands_per_post'] is not None else '-'
+        print(f"{r['mode']:<12} {r['posts']:>5} {r['correct']:>5} {r['startup_seconds']:>9.2f} {r['seconds']:>9.2f} "
+              f"{r['posts_per_second']:>8.2f} {per_post:>9} {r['python_peak_mb']:>10.1f} {heap:>10}")
+    
+    for r in results:
+        print(f"\nMost WebDriver commands ({r['mode']}):")
+        for row in r['top_functions']:
+            commands = ', '.join(f"{name} x{count}" for name, count in row['commands'].items())
+            print(f"  {row['function']:<28} {row['calls']:>6} calls {row['total_ms']:>9.1f} ms  {commands}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scraper end to end against a mock LinkedIn site')
+    parser.add_argument('--posts', type=int, default=60, help='Posts to scrape per run')
+    parser.add_argument('--feed-posts', type=int, default=200, help='Posts in the mock feed')
+    parser.add_argument('--page-size', type=int, default=10, help='Posts the mock feed loads per scroll')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds the mock site adds to every response')
+    parser.add_argument('--repost-ratio', type=float, default=0.15)
+    parser.add_argument('--see-more-ratio', type=float, default=0.4)
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--lean', action='store_true', help='Run Chrome in lean mode')
+    parser.add_argument('--headed', action='store_true', help='Show the browser window')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--out', metavar='FILE', help='Also write the results as JSON')
+    args = parser.parse_args()
+    if args.out:
+        args.out = os.path.abspath(args.out)
+    
+    feed = MockFeed(args.feed_posts, args.page_size, args.repost_ratio, args.see_more_ratio, args.seed)
+    with MockLinkedIn(feed, args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        # Configure the scraper before it is imported: the mock site, no delays,
+        # and a state directory and output folder that do not touch the user's
+        os.environ['LINKEDIN_RABBIT_BASE_URL'] = server.url
+        os.environ['LINKEDIN_RABBIT_DELAY_SCALE'] = '0'
+        os.environ['LINKEDIN_RABBIT_HOME'] = os.path.join(tmp, 'state')
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        from linkedin_rabbit import linkedin_rabbit as lr
+        
+        print(f"Mock site at {server.url}: {args.feed_posts} posts, {args.page_size} per load, "
+              f"{args.latency * 1000:.0f} ms latency")
+        results = []
+        for mode in args.modes:
+            print(f"\n=== {mode} ===")
+            results.append(run_scrape(lr, server, args, mode))
+        os.chdir(cwd)
+    
+    print_results(results)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Mock LinkedIn Site
+
+A local HTTP server that imitates the LinkedIn pages the scraper touches:
+the login form, the logged-in navigation bar and a profile's activity feed
+(/in/<username>/recent-activity/all/) that loads more posts as it is
+scrolled. Posts use LinkedIn's feed-shared-update-v2 markup, with reposts,
+truncated texts behind a "see more" button, dates and engagement counts.
+The posts are generated from a seed, so every run serves the same feed and
+the scraped posts can be compared with expected_posts().
+
+Point the scraper at it with LINKEDIN_RABBIT_BASE_URL (any username and
+password log in). Run it on its own to try the scraper by hand:
+
+Usage: python benchmarks/mock_linkedin.py [--port 8000] [--posts 200] [--latency 0.1]
+"""
+
+import re
+import sys
+import html
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from _data import synthetic_text
+
+AGES = ["2h", "5h", "1d", "3d", "6d", "1w", "2w", "3w", "1mo", "2mo", "4mo", "8mo", "1yr"]
+
+SESSION_COOKIE = "li_at"
+ACTIVITY_PATH = re.compile(r'^/in/([^/]+)/recent-activity/all/?$')
+FEED_API_PATH = "/voyager/api/feed"
+TRUNCATE_LENGTH = 210  # Characters shown before "see more"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title} | LinkedIn</title>
+<style>
+body {{ font-family: sans-serif; margin: 0; background: #f4f2ee; }}
+#global-nav {{ position: sticky; top: 0; height: 52px; background: #fff; border-bottom: 1px solid #ddd; }}
+main {{ max-width: 560px; margin: 0 auto; padding: 16px; }}
+.feed-shared-update-v2 {{ background: #fff; border: 1px solid #ddd; border-radius: 8px; margin: 8px 0; padding: 12px 16px; }}
+.social-details-social-counts span {{ margin-right: 12px; color: #666; }}
+</style></head>
+<body>{body}</body></html>
+"""
+
+LOGIN_BODY = """<main>
+<h1>Sign in</h1>
+<form method="post" action="/checkpoint/lg/login-submit">
+<input id="username" name="session_key" type="text" autocomplete="username">
+<input id="password" name="session_password" type="password" autocomplete="current-password">
+<button type="submit">Sign in</button>
+</form>
+</main>"""
+
+NAV = '<header id="global-nav"></header>'
+
+# Loads the next page of posts when the bottom of the feed comes into view,
+# and expands a post when its "see more" button is clicked
+FEED_SCRIPT = """<script>
+(function() {
+    const feed = document.getElementById('feed');
+    let next = Number(feed.dataset.next), loading = false;
+    function loadMore() {
+        if (loading || next < 0) return;
+        if (window.innerHeight + window.scrollY < document.body.scrollHeight - 600) return;
+        loading = true;
+        fetch('%(api)s?profile=' + feed.dataset.profile + '&start=' + next)
+            .then(function(response) {
+                next = Number(response.headers.get('X-Next-Start'));
+                return response.text();
+            })
+            .then(function(posts) {
+                feed.insertAdjacentHTML('beforeend', posts);
+                loading = false;
+            })
+            .catch(function() { loading = false; });
+    }
+    window.addEventListener('scroll', loadMore, {passive: true});
+    document.addEventListener('click', function(event) {
+        const button = event.target.closest('button.feed-shared-inline-show-more-text__button');
+        if (!button) return;
+        const text = button.closest('.feed-shared-update-v2').querySelector('.break-words');
+        text.innerText = text.dataset.fullText;
+        button.remove();
+    });
+})();
+</script>""" % {'api': FEED_API_PATH}
+
+class MockFeed:
+    """The generated feed of one profile.
+    
+    repost_ratio and see_more_ratio are the shares of reposts and of posts
+    long enough to be truncated; page_size posts are served per load.
+    """
+    
+    def __init__(self, posts=200, page_size=10, repost_ratio=0.15, see_more_ratio=0.4, seed=7, profile_name="Bench Marker"):
+        self.posts = posts
+        self.page_size = page_size
+        self.repost_ratio = repost_ratio
+        self.see_more_ratio = see_more_ratio
+        self.seed = seed
+        self.profile_name = profile_name
+    
+    def post(self, index):
+        """Return the post at index (0 is the newest) as a dict."""
+        rng = random.Random(self.seed * 1000003 + index)
+        long_post = rng.random() < self.see_more_ratio
+        paragraphs = [
+            synthetic_text(rng, rng.randint(40, 90) if long_post else rng.randint(5, 25))
+            for _ in range(rng.randint(2, 4) if long_post else 1)
+        ]
+        likes = rng.choice([0, rng.randint(1, 99), rng.randint(100, 5000)])
+        return {
+            'urn': f"urn:li:activity:{7100000000000000000 + self.seed * 100000 + index}",
+            'content': f"Post {index + 1}: " + '\n\n'.join(paragraphs),
+            'date': AGES[min(index * len(AGES) // max(self.posts, 1), len(AGES) - 1)],
+            'likes': likes,
+            'comments': rng.randint(1, 80) if likes and rng.random() < 0.6 else 0,
+            'shares': rng.randint(1, 30) if likes and rng.random() < 0.3 else 0,
+            'is_repost': rng.random() < self.repost_ratio
+        }
+    
+    def expected_posts(self):
+        """Return the posts the scraper should keep (all but reposts), newest first."""
+        return [post for post in map(self.post, range(self.posts)) if not post['is_repost']]
+    
+    def render_post(self, index):
+        """Return the HTML of the post at index."""
+        post = self.post(index)
+        content = post['content']
+        parts = ['<div class="feed-shared-update-v2" data-urn="%s">' % post['urn']]
+        if post['is_repost']:
+            parts.append('<div class="update-components-header"><li-icon type="repost-filled"></li-icon>'
+                         f'<span>{html.escape(self.profile_name)} reposted this</span></div>')
+        parts.append('<div class="feed-shared-actor__sub-description"><span aria-hidden="true">'
+                     f'{post["date"]} • </span></div>')
+        
+        truncated = len(content) > TRUNCATE_LENGTH
+        shown = content[:TRUNCATE_LENGTH].rstrip() + '…' if truncated else content
+        parts.append('<div class="feed-shared-update-v2__description-wrapper"><div class="feed-shared-text">'
+                     f'<span class="break-words" data-full-text="{html.escape(content)}">'
+                     f'{html.escape(shown).replace(chr(10), "<br>")}</span></div>')
+        if truncated:
+            parts.append('<button class="feed-shared-inline-show-more-text__button" type="button">…see more</button>')
+        parts.append('</div>')
+        
+        parts.append('<div class="social-details-social-counts">')
+        if post['likes']:
+            parts.append(f'<span class="social-details-social-counts__reactions-count">{post["likes"]:,}</span>')
+        if post['comments']:
+            parts.append(f'<span class="social-details-social-counts__comments-count">{post["comments"]} comments</span>')
+        if post['shares']:
+            parts.append(f'<span class="social-details-social-counts__shares-count">{post["shares"]} reposts</span>')
+        parts.append('</div></div>')
+        return ''.join(parts)
+    
+    def render_page(self, start):
+        """Return the HTML of the posts of one load and the start of the next load (-1 at the end)."""
+        end = min(start + self.page_size, self.posts)
+        next_start = end if end < self.posts else -1
+        return '\n'.join(self.render_post(index) for index in range(start, end)), next_start
+
+class MockLinkedInHandler(BaseHTTPRequestHandler):
+    """Serves the pages of the server's MockFeed, after the server's latency."""
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def send_page(self, body, status=200, headers=None):
+        time.sleep(self.server.latency)
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def redirect(self, location, headers=None):
+        self.send_page('', 303, {'Location': location, **(headers or {})})
+    
+    def logged_in(self):
+        return f"{SESSION_COOKIE}=" in self.headers.get('Cookie', '')
+    
+    def do_GET(self):
+        url = urlsplit(self.path)
+        feed = self.server.feed
+        if url.path == '/login':
+            self.send_page(PAGE_TEMPLATE.format(title="Sign in", body=LOGIN_BODY))
+        elif not self.logged_in():
+            self.redirect('/login')
+        elif url.path in ('/feed', '/feed/'):
+            self.send_page(PAGE_TEMPLATE.format(title="Feed", body=NAV + '<main><h2>Feed</h2></main>'))
+        elif ACTIVITY_PATH.match(url.path):
+            username = ACTIVITY_PATH.match(url.path).group(1)
+            posts, next_start = feed.render_page(0)
+            body = (f'{NAV}<main><h1 class="text-heading-xlarge">{html.escape(feed.profile_name)}</h1>'
+                    f'<div id="feed" data-profile="{html.escape(username)}" data-next="{next_start}">{posts}</div>'
+                    f'</main>{FEED_SCRIPT}')
+            self.send_page(PAGE_TEMPLATE.format(title=html.escape(feed.profile_name), body=body))
+        elif url.path == FEED_API_PATH:
+            start = int(parse_qs(url.query).get('start', ['0'])[0])
+            posts, next_start = feed.render_page(start)
+            self.send_page(posts, headers={'X-Next-Start': str(next_start)})
+        else:
+            self.send_page('Not found', 404)
+    
+    def do_POST(self):
+        if urlsplit(self.path).path != '/checkpoint/lg/login-submit':
+            self.send_page('Not found', 404)
+            return
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.redirect('/feed/', {'Set-Cookie': f"{SESSION_COOKIE}=mock-session; Path=/"})
+
+class MockLinkedIn:
+    """A MockLinkedInHandler server running in a background thread.
+    
+    latency is added to every response, in seconds. Port 0 picks a free port;
+    url is the base URL to give the scraper.
+    """
+    
+    def __init__(self, feed=None, latency=0.0, host='127.0.0.1', port=0, verbose=False):
+        self.feed = feed or MockFeed()
+        self.server = ThreadingHTTPServer((host, port), MockLinkedInHandler)
+        self.server.daemon_threads = True
+        self.server.feed = self.feed
+        self.server.latency = latency
+        self.server.verbose = verbose
+        self.thread = threading.Thread(target=self.server.serve_forever, name='mock-linkedin', daemon=True)
+    
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def profile_url(self, username='bench-marker'):
+        """Return the URL of a profile on the mock site."""
+        return f"{self.url}/in/{username}/"
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a mock LinkedIn site for the scraper')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--posts', type=int, default=200, help='Number of posts in the feed')
+    parser.add_argument('--page-size', type=int, default=10, help='Posts loaded per scroll')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--repost-ratio', type=float, default=0.15)
+    parser.add_argument('--see-more-ratio', type=float, default=0.4)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    
+    feed = MockFeed(args.posts, args.page_size, args.repost_ratio, args.see_more_ratio, args.seed)
+    server = MockLinkedIn(feed, args.latency, args.host, args.port, verbose=True)
+    print(f"Mock LinkedIn running at {server.url}, profile: {server.profile_url()}")
+    print(f"Scrape it with LINKEDIN_RABBIT_BASE_URL={server.url} LINKEDIN_RABBIT_DELAY_SCALE=0")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+if __name__ == "__main__":
+    sys.exit(main())
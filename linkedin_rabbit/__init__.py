@@ -9,4 +9,5 @@ __author__ = "Tensor Boy"
 __email__ = "manavgupta@duck.com"
 
 # Import and expose the main functions
-from .linkedin_rabbit import scrape_linkedin_posts, read_input_file 
\ No newline at end of file
+from .linkedin_rabbit import scrape_linkedin_posts, read_input_file, iter_posts, ScrapeSession
+from .records import Post, load_posts
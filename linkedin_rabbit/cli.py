@@ -10,125 +10,45 @@ import sys
 import argparse
 import time
 from datetime import datetime
-from fpdf import FPDF
-from .linkedin_rabbit import scrape_linkedin_posts, read_input_file
+from .linkedin_rabbit import read_input_file, open_post_writer, iter_posts, resolve_post_date, ScrapeSession, DEFAULT_USER_DATA_DIR, DEFAULT_COOKIE_DIR, account_cookie_file, account_user_data_dir, MAX_SCROLL_ATTEMPTS, DEFAULT_POSTS_PER_SCROLL
+from .records import read_posts, count_posts, recover_post_files
+from .pdf_renderer import render_pdf
+from .near_duplicates import DEFAULT_MAX_DISTANCE, MAX_DISTANCE_LIMIT
+from .metrics import MetricsCollector, collecting
+from .tracing import DriverTracer
 from .static.logo import print_logo
 
-def create_pdf(text_file):
+def create_pdf(text_file, emoji_text=False):
     """Create a PDF file from the text file."""
     try:
-        # Read the text file
-        with open(text_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
         # Extract profile name from the filename
         profile_name = os.path.basename(text_file).split('_linkedin_posts_')[0]
         
-        # Parse the text file
-        lines = content.split('\n')
-        posts_data = []
-        current_post = None
-        
-        for line in lines:
-            if line.startswith('Post #'):
-                if current_post:
-                    posts_data.append(current_post)
-                current_post = {'content': ''}
-            elif current_post:
-                if line.startswith('Date:'):
-                    current_post['date'] = line[5:].strip()
-                elif line.startswith('Engagement:'):
-                    engagement_text = line[11:].strip()
-                    likes = comments = shares = '0'
-                    
-                    import re
-                    likes_match = re.search(r'(\d+) likes', engagement_text)
-                    if likes_match:
-                        likes = likes_match.group(1)
-                    
-                    comments_match = re.search(r'(\d+) comments', engagement_text)
-                    if comments_match:
-                        comments = comments_match.group(1)
-                    
-                    shares_match = re.search(r'(\d+) shares', engagement_text)
-                    if shares_match:
-                        shares = shares_match.group(1)
-                    
-                    current_post['engagement'] = {
-                        'likes': likes,
-                        'comments': comments,
-                        'shares': shares
-                    }
-                elif not line.startswith('=') and not line.startswith('-') and not line.startswith('LinkedIn Posts for:') and not line.startswith('Extracted on:') and not line.startswith('Number of posts:'):
-                    current_post['content'] += line + '\n'
-        
-        # Add the last post
-        if current_post:
-            posts_data.append(current_post)
-        
-        # Create PDF
-        pdf = FPDF()
-        pdf.add_page()
-        
-        # Set font
-        pdf.set_font("Arial", "B", 16)
-        
-        # Title
-        pdf.cell(0, 10, f"LinkedIn Posts for: {profile_name}", 0, 1, "C")
-        pdf.set_font("Arial", "", 12)
-        pdf.cell(0, 10, f"Extracted on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 0, 1, "C")
-        pdf.cell(0, 10, f"Number of posts: {len(posts_data)}", 0, 1, "C")
-        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-        pdf.ln(5)
-        
-        # Add posts
-        for idx, post in enumerate(posts_data, 1):
-            pdf.set_font("Arial", "B", 14)
-            pdf.cell(0, 10, f"Post #{idx}", 0, 1)
-            
-            pdf.set_font("Arial", "I", 12)
-            pdf.cell(0, 10, f"Date: {post['date']}", 0, 1)
-            
-            # Format engagement data
-            engagement = post['engagement']
-            engagement_str = f"{engagement.get('likes', '0')} likes, {engagement.get('comments', '0')} comments, {engagement.get('shares', '0')} shares"
-            pdf.cell(0, 10, f"Engagement: {engagement_str}", 0, 1)
-            
-            pdf.ln(5)
-            pdf.set_font("Arial", "", 12)
-            
-            # Handle multi-line content
-            content_lines = post['content'].split('\n')
-            for line in content_lines:
-                # Split long lines
-                while len(line) > 80:
-                    pdf.multi_cell(0, 10, line[:80])
-                    line = line[80:]
-                pdf.multi_cell(0, 10, line)
-            
-            pdf.ln(5)
-            pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-            pdf.ln(5)
-            
-            # Add a new page if needed
-            if idx < len(posts_data) and pdf.get_y() > 250:
-                pdf.add_page()
-        
-        # Footer
-        pdf.set_y(-15)
-        pdf.set_font("Arial", "I", 8)
-        pdf.cell(0, 10, "Generated by LinkedIn Rabbit | @tensor._.boy", 0, 0, "C")
-        
-        # Save PDF
+        # Stream the posts from the structured file saved beside the text file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         pdf_filename = f"output/{profile_name}_linkedin_posts_{timestamp}.pdf"
-        pdf.output(pdf_filename)
-        
-        return pdf_filename
+        return render_pdf(read_posts(text_file), pdf_filename, profile_name, count=count_posts(text_file), emoji_text=emoji_text)
     except Exception as e:
         print(f"Error creating PDF: {e}")
         return None
 
+def parse_since(value):
+    """Parse a --since cutoff: a date (2024-01-31) or an age like 30d, 2w or 3mo."""
+    since = resolve_post_date(value)
+    if since is None:
+        raise argparse.ArgumentTypeError(f"invalid date or age: {value!r} (use e.g. 2024-01-31 or 30d)")
+    return since
+
+def parse_near_duplicate_distance(value):
+    """Parse a --near-duplicates distance: the number of fingerprint bits that may differ."""
+    try:
+        distance = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of bits: {value!r}")
+    if not 0 <= distance <= MAX_DISTANCE_LIMIT:
+        raise argparse.ArgumentTypeError(f"must be between 0 and {MAX_DISTANCE_LIMIT} bits, got {distance}")
+    return distance
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='LinkedIn Rabbit - LinkedIn Post Scraper')
@@ -144,6 +64,30 @@ def parse_arguments():
     parser.add_argument('--password', help='LinkedIn password')
     parser.add_argument('--headless', action='store_true', help='Run in headless mode')
     parser.add_argument('--pdf', action='store_true', help='Generate PDF output')
+    parser.add_argument('--emoji-text', action='store_true', help='Write common emoji as text labels such as [rocket] instead of ?')
+    parser.add_argument('--parquet', action='store_true', help='Also write the posts to a Parquet file (requires pyarrow)')
+    parser.add_argument('--lean', action='store_true', help='Block images, videos, fonts and trackers to load pages faster')
+    
+    parser.add_argument('--near-duplicates', type=parse_near_duplicate_distance, nargs='?', const=DEFAULT_MAX_DISTANCE, metavar='BITS',
+                        help=f'Also skip posts that are almost identical to an earlier one; BITS sets how many of the 64 fingerprint bits may differ (0-{MAX_DISTANCE_LIMIT}, default: {DEFAULT_MAX_DISTANCE})')
+    parser.add_argument('--since', type=parse_since, metavar='DATE',
+                        help='Only scrape posts newer than a date (2024-01-31) or age (30d, 2w, 3mo); scrolling stops at older posts')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only scrape posts that are newer than the ones scraped in earlier runs')
+    
+    parser.add_argument('--metrics-out', metavar='FILE',
+                        help='Write the duration of each phase (driver startup, login, scrolling, extraction, file writing, random delays) and counters of the run to a JSON file')
+    
+    parser.add_argument('--trace-out', metavar='FILE',
+                        help='Record every WebDriver command to a Chrome trace-event JSON file (open it in chrome://tracing) and print a summary per function')
+    
+    parser.add_argument('--chromedriver', help='Path to an installed chromedriver (skips the automatic download and version check)')
+    
+    # Session reuse between runs
+    parser.add_argument('--user-data-dir', nargs='?', const=DEFAULT_USER_DATA_DIR,
+                        help=f'Keep a persistent Chrome profile (login and cache) in this directory (default: one directory per account in {DEFAULT_USER_DATA_DIR})')
+    parser.add_argument('--cookie-file', nargs='?', const=DEFAULT_COOKIE_DIR,
+                        help=f'Save the login cookies to this file and reuse them on the next run (default: one file per account in {DEFAULT_COOKIE_DIR})')
     
     return parser.parse_args()
 
@@ -156,15 +100,19 @@ def main():
     # Create output directory if it doesn't exist
     os.makedirs("output", exist_ok=True)
     
+    # Finish the output files of earlier runs that were interrupted
+    recover_post_files("output")
+    
     # Determine input method
     if args.url:
         # Direct command line input
-        if not args.posts or not args.username or not args.password:
-            print("Error: When using --url, you must also provide --posts, --username, and --password")
+        if not (args.posts or args.since) or not args.username or not args.password:
+            print("Error: When using --url, you must also provide --posts (or --since), --username, and --password")
             sys.exit(1)
             
         profile_url = args.url
-        num_posts = args.posts
+        # With only a cutoff date, the date bounds the work instead of a count
+        num_posts = args.posts or MAX_SCROLL_ATTEMPTS * DEFAULT_POSTS_PER_SCROLL
         username = args.username
         password = args.password
         headless = args.headless
@@ -184,20 +132,45 @@ def main():
     
     print(f"Profile URL: {profile_url}")
     print(f"Number of posts: {num_posts}")
+    if args.since:
+        print(f"Posts since: {args.since:%Y-%m-%d %H:%M}")
     print(f"Username: {username}")
     print(f"Headless mode: {'Yes' if headless else 'No'}")
     
+    # The default locations keep a separate profile and cookie file per
+    # account, so a saved session is never reused for another account
+    user_data_dir = account_user_data_dir(username) if args.user_data_dir == DEFAULT_USER_DATA_DIR else args.user_data_dir
+    cookie_file = account_cookie_file(username) if args.cookie_file == DEFAULT_COOKIE_DIR else args.cookie_file
+    
     print("\nStarting the scraper...")
     start_time = time.time()
+    run_metrics = MetricsCollector()
+    tracer = DriverTracer() if args.trace_out else None
+    
+    # Stream posts from the scraper; scrolling stops once enough are found
+    # and each post is written to disk as soon as it is extracted
+    writer = None
+    with collecting(run_metrics):
+        try:
+            with ScrapeSession(username, password, headless, user_data_dir=user_data_dir, cookie_file=cookie_file, driver_path=args.chromedriver, lean=args.lean, near_duplicate_distance=args.near_duplicates, tracer=tracer) as session:
+                for post in iter_posts(session, profile_url, num_posts, incremental=args.incremental, since=args.since):
+                    if writer is None:
+                        writer = open_post_writer(session.profile_name, emoji_text=args.emoji_text,
+                                                  formats=('jsonl', 'parquet') if args.parquet else ('jsonl',))
+                    writer.write(post)
+                    print(f"Found valid post #{writer.count} of {num_posts}")
+        except Exception as e:
+            # Keep whatever was extracted before the error
+            print(f"An error occurred: {e}")
+        finally:
+            if writer is not None:
+                writer.close()
     
-    # Run the scraper
-    result_file = scrape_linkedin_posts(
-        profile_url,
-        num_posts,
-        username,
-        password,
-        headless
-    )
+    result_file = None
+    if writer is not None:
+        if writer.count < num_posts and not (args.since and not args.posts):
+            print(f"Warning: Only found {writer.count} valid posts out of {num_posts} requested")
+        result_file = writer.filepath
     
     end_time = time.time()
     elapsed_time = end_time - start_time
@@ -210,13 +183,28 @@ def main():
         # Generate PDF if requested
         if args.pdf:
             print("\nGenerating PDF...")
-            pdf_file = create_pdf(result_file)
+            with collecting(run_metrics):
+                pdf_file = create_pdf(result_file, emoji_text=args.emoji_text)
             if pdf_file:
                 print(f"PDF saved to: {pdf_file}")
             else:
                 print("Failed to generate PDF.")
+    elif args.incremental:
+        print("\nNo new posts since the last run.")
     else:
         print("\nFailed to extract posts. Please check your inputs and try again.")
+    
+    if args.metrics_out:
+        run_metrics.write(args.metrics_out)
+        print(f"Metrics saved to: {args.metrics_out}")
+    
+    if tracer is not None:
+        tracer.write_trace(args.trace_out)
+        print(f"\nWebDriver commands by function ({len(tracer)} round trips):")
+        print(tracer.format_summary())
+        print(f"Trace saved to: {args.trace_out}")
+    
+    if not result_file and not args.incremental:
         sys.exit(1)
 
 if __name__ == "__main__":
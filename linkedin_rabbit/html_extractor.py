@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Offline HTML Extractor
+
+This module extracts posts from saved page sources (driver.page_source or the
+.html snapshots written while scrolling) without a browser.
+It applies the same selectors as the Selenium extractors using lxml, and can
+parse a whole directory of snapshots across a process pool.
+"""
+
+import os
+import re
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from .linkedin_rabbit import (
+    REPOST_ICON_SELECTOR,
+    REPOST_TEXT_XPATH,
+    CONTENT_SELECTORS,
+    DATE_SELECTORS,
+    LIKE_SELECTORS,
+    COMMENT_SELECTORS,
+    SHARE_SELECTORS,
+    POST_URN_SELECTOR,
+    build_bulk_record,
+    check_post_record,
+    save_posts_to_file
+)
+
+# Same post selectors as find_post_elements
+PROFILE_POSTS_SELECTOR = CSSSelector("div.occludable-update, div.feed-shared-update-v2")
+COMPANY_POSTS_SELECTOR = CSSSelector("div.feed-shared-update-v2")
+
+REPOST_ICON = CSSSelector(REPOST_ICON_SELECTOR)
+POST_URN = CSSSelector(POST_URN_SELECTOR)
+SELECTOR_GROUPS = {
+    'content': [CSSSelector(selector) for selector in CONTENT_SELECTORS],
+    'date': [CSSSelector(selector) for selector in DATE_SELECTORS],
+    'likes': [CSSSelector(selector) for selector in LIKE_SELECTORS],
+    'comments': [CSSSelector(selector) for selector in COMMENT_SELECTORS],
+    'shares': [CSSSelector(selector) for selector in SHARE_SELECTORS]
+}
+
+# Elements whose text never shows up in the rendered page
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'head', 'title'}
+
+# Elements that start a new line in the rendered text
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+    'section', 'table', 'tr', 'ul'
+}
+
+# Block boundaries are marked with a soft break so that nested blocks do not
+# produce blank lines, while explicit <br> tags are kept as hard breaks
+SOFT_BREAK = '\x00'
+
+def _collect_text(element, parts):
+    """Append the text of an element and its children to parts."""
+    tag = element.tag if isinstance(element.tag, str) else None
+    if tag is None or tag in SKIPPED_TAGS or element.get('hidden') is not None:
+        # Comments and invisible elements only contribute their tail
+        if element.tail:
+            parts.append(element.tail)
+        return
+    
+    if tag == 'br':
+        parts.append('\n')
+    elif tag in BLOCK_TAGS:
+        parts.append(SOFT_BREAK)
+    
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        _collect_text(child, parts)
+    
+    if tag in BLOCK_TAGS:
+        parts.append(SOFT_BREAK)
+    if element.tail:
+        parts.append(element.tail)
+
+def inner_text(element):
+    """Approximate the browser's innerText (Selenium's .text) of an element."""
+    parts = []
+    # The element's own tail is not part of its text
+    tail, element.tail = element.tail, None
+    try:
+        _collect_text(element, parts)
+    finally:
+        element.tail = tail
+    
+    text = re.sub(r'[ \t\r\f\v\xa0]+', ' ', ''.join(parts))
+    text = re.sub(r' *([\n\x00]) *', r'\1', text)
+    text = re.sub(r'\x00*\n\x00*', '\n', text)
+    text = re.sub(r'\x00+', '\n', text)
+    return text.strip('\n')
+
+def _selector_texts(post, selectors):
+    """Return the text of the first element matching each selector (None if nothing matched)."""
+    texts = []
+    for selector in selectors:
+        # Like find_elements on an element, the element itself never matches
+        elements = [element for element in selector(post) if element is not post]
+        texts.append(inner_text(elements[0]) if elements else None)
+    return texts
+
+def extract_raw_post(post):
+    """Collect the same raw texts from an lxml post element as BULK_EXTRACT_SCRIPT."""
+    raw = {
+        'repost': bool(REPOST_ICON(post)) or bool(post.xpath(REPOST_TEXT_XPATH)),
+        'text': inner_text(post)
+    }
+    for name, selectors in SELECTOR_GROUPS.items():
+        raw[name] = _selector_texts(post, selectors)
+    urn_elements = POST_URN(post)
+    raw['urn'] = urn_elements[0].get('data-urn') if urn_elements else None
+    return raw
+
+def extract_posts_from_html(page_source, company=False):
+    """Extract the records of all posts in a page source.
+    
+    Returns the same records as extract_posts_bulk, in page order.
+    """
+    if not page_source or not page_source.strip():
+        return []
+    document = lxml_html.fromstring(page_source)
+    selector = COMPANY_POSTS_SELECTOR if company else PROFILE_POSTS_SELECTOR
+    return [build_bulk_record(extract_raw_post(post)) for post in selector(document)]
+
+def extract_posts_from_file(filepath, company=False):
+    """Extract the records of all posts in a saved .html file."""
+    try:
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            return extract_posts_from_html(f.read(), company)
+    except Exception as e:
+        print(f"Error extracting posts from {filepath}: {e}")
+        return []
+
+def extract_posts_from_directory(directory, company=False, max_workers=None, pattern="*.html"):
+    """Parse every snapshot in a directory across a process pool.
+    
+    Returns a list of (filepath, records) tuples sorted by file name, which
+    for scroll snapshots is the order they were taken in.
+    """
+    filepaths = sorted(glob.glob(os.path.join(directory, pattern)))
+    if not filepaths:
+        return []
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(extract_posts_from_file, filepaths, [company] * len(filepaths))
+        return list(zip(filepaths, results))
+
+def collect_valid_posts(snapshot_results, content_hashes=None, near_duplicates=None):
+    """Yield the valid posts of parsed snapshots, skipping reposts, empty posts and duplicates.
+    
+    Consecutive snapshots of one feed contain the same posts, so duplicates
+    are tracked across all of them. Pass a NearDuplicateIndex to skip
+    near-duplicates too.
+    """
+    if content_hashes is None:
+        content_hashes = set()
+    for _, records in snapshot_results:
+        for record in records:
+            if check_post_record(record, content_hashes, near_duplicates):
+                continue
+            yield {
+                'content': record['content'],
+                'date': record['date'],
+                'engagement': record['engagement']
+            }
+
+def main():
+    """Extract posts from a directory of snapshots and save them to a text file."""
+    parser = argparse.ArgumentParser(description='LinkedIn Rabbit - Offline HTML Extractor')
+    parser.add_argument('directory', help='Directory with saved .html snapshots')
+    parser.add_argument('--profile-name', default='LinkedIn_User', help='Profile name used for the output file')
+    parser.add_argument('--company', action='store_true', help='Snapshots are from a company page')
+    parser.add_argument('--workers', type=int, help='Number of worker processes (default: number of CPUs)')
+    args = parser.parse_args()
+    
+    results = extract_posts_from_directory(args.directory, company=args.company, max_workers=args.workers)
+    print(f"Parsed {len(results)} snapshots")
+    
+    posts_data = list(collect_valid_posts(results))
+    if not posts_data:
+        print("No valid posts found in the snapshots.")
+        return
+    
+    print(f"Found {len(posts_data)} valid posts")
+    save_posts_to_file(posts_data, args.profile_name)
+
+if __name__ == "__main__":
+    main()
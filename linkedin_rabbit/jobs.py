@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Background Scrape Jobs
+
+This module runs scrapes in background threads, so a user interface such as
+the Streamlit app stays responsive while posts are extracted. Every job is
+kept in a module-level registry under its id, so a page that was refreshed
+can find its job again. The UI polls the job for its progress events and
+can ask it to stop; the scraper checks for that between posts and scroll
+steps, and keeps the posts found until then. A finished job is removed from
+the registry (remove_job) once the UI has read its results.
+"""
+
+import uuid
+import threading
+from datetime import datetime
+from .linkedin_rabbit import ScrapeSession, scrape_linkedin_posts
+
+# Job states; the last three are final
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+class ScrapeJob:
+    """A scrape of one profile, run batch by batch in a background thread.
+    
+    All batches share one ScrapeSession. Progress events of the scraper (see
+    report_progress) are collected in events, with the time they arrived.
+    """
+    
+    def __init__(self, profile_url, num_posts, username, password, headless=True, batch_size=30, cookie_file=None, lean=False):
+        self.id = uuid.uuid4().hex
+        self.profile_url = profile_url
+        self.num_posts = num_posts
+        self.batch_size = batch_size
+        self.session = ScrapeSession(username, password, headless, cookie_file=cookie_file, lean=lean)
+        self.state = RUNNING
+        self.profile_name = None
+        self.posts_scraped = 0
+        self.batch_files = []  # Output file of every saved batch, in order
+        self.error = None  # Message of the last 'error' event
+        self.started = datetime.now()
+        self.finished = None
+        self.events = []
+        self.lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"scrape-{self.id[:8]}", daemon=True)
+    
+    def _record(self, event):
+        event['time'] = datetime.now()
+        with self.lock:
+            self.events.append(event)
+            if event['event'] == 'profile_opened':
+                self.profile_name = event['profile_name']
+            elif event['event'] == 'batch_saved':
+                self.batch_files.append(event['filename'])
+                self.posts_scraped = event['posts_scraped']
+            elif event['event'] == 'error':
+                self.error = event['message']
+    
+    def _run(self):
+        try:
+            with self.session:
+                while self.posts_scraped < self.num_posts and not self.cancel_event.is_set():
+                    result = scrape_linkedin_posts(
+                        self.profile_url, self.num_posts,
+                        self.session.username, self.session.password, self.session.headless,
+                        start_from=self.posts_scraped, batch_size=self.batch_size,
+                        session=self.session, progress=self._record, cancel=self.cancel_event
+                    )
+                    
+                    # A dict asks for the next batch; the last batch returns its
+                    # filename, and None means nothing (more) was found
+                    if not isinstance(result, dict):
+                        break
+        except Exception as e:
+            print(f"Scrape job {self.id} failed: {e}")
+            self._record({'event': 'error', 'message': str(e)})
+        finally:
+            if self.cancel_event.is_set():
+                state = CANCELLED
+            elif self.batch_files:
+                # Also when the feed ran out before num_posts posts were found
+                state = DONE
+            else:
+                state = FAILED
+            with self.lock:
+                self.state = state
+                self.finished = datetime.now()
+    
+    def start(self):
+        """Start the job in its background thread."""
+        self.thread.start()
+        return self
+    
+    def cancel(self):
+        """Ask the job to stop after the post or scroll step in progress."""
+        self.cancel_event.set()
+    
+    @property
+    def running(self):
+        """True until the job is finished."""
+        return self.state == RUNNING
+    
+    def poll(self, since=0):
+        """Return the progress events from index since on, and the index to poll from next."""
+        with self.lock:
+            events = self.events[since:]
+        return events, since + len(events)
+    
+    def wait(self, timeout=None):
+        """Block until the job is finished or timeout seconds passed; return True if it finished."""
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+def start_job(profile_url, num_posts, username, password, **options):
+    """Create a ScrapeJob, register it and start it.
+    
+    options are passed on to ScrapeJob (headless, batch_size, cookie_file, lean).
+    """
+    job = ScrapeJob(profile_url, num_posts, username, password, **options)
+    with _jobs_lock:
+        _jobs[job.id] = job
+    return job.start()
+
+def get_job(job_id):
+    """Return the registered job with this id, or None."""
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+def list_jobs(running_only=False):
+    """Return the registered jobs, oldest first."""
+    with _jobs_lock:
+        jobs = list(_jobs.values())
+    if running_only:
+        jobs = [job for job in jobs if job.running]
+    return sorted(jobs, key=lambda job: job.started)
+
+def remove_job(job_id):
+    """Forget a job, e.g. once its results were read; a running job is cancelled first."""
+    with _jobs_lock:
+        job = _jobs.pop(job_id, None)
+    if job is not None and job.running:
+        job.cancel()
+    return job
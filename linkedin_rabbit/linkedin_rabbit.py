@@ -11,45 +11,250 @@ Made by Tensor Boy
 import os
 import time
 import re
+import json
+import math
 import random
 import hashlib
-from datetime import datetime
+import itertools
+import sqlite3
+from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, SessionNotCreatedException
 from webdriver_manager.chrome import ChromeDriverManager
 from tqdm import tqdm
+from .near_duplicates import NearDuplicateIndex
+from . import metrics
+from .records import Post, PostWriter, render_text, structured_path, unique_filepath, write_jsonl, write_parquet
 
 # Constants
-MIN_SCROLL_DELAY = 2.5
+MIN_SCROLL_DELAY = 2.5  # Minimum interval between two scrolls (see ScrollPacer)
 MAX_SCROLL_DELAY = 5.0
 MIN_ACTION_DELAY = 0.5
 MAX_ACTION_DELAY = 1.5
+SCROLL_WAIT_TIMEOUT = 10.0  # Longest wait for new posts after a scroll
+STUCK_WAIT_TIMEOUT = 3.0  # The same once the previous scroll loaded nothing (e.g. at the end of the feed)
+CHANGE_CHECK_TIMEOUT = 1.0  # Wait for new posts after the extra scrolls that mimic a human or get unstuck
+CONTENT_SETTLE_MS = 250  # DOM quiet time before new posts count as rendered
+CONTENT_SETTLE_MAX_MS = 1500  # Longest settle wait after the first change, for feeds that never go quiet
+
+# Factor for all human-like delays (random delays, typing, scroll pacing);
+# 0 turns them off, e.g. for benchmarks against a local stand-in of the site
+DELAY_SCALE = float(os.environ.get("LINKEDIN_RABBIT_DELAY_SCALE", "1"))
+
+# Base URL of the site; can point to a local stand-in for testing
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_RABBIT_BASE_URL", "https://www.linkedin.com").rstrip('/')
+
+# Where state that outlives a run (yield estimates, browser profile, cookies, ...) is kept
+STATE_DIR = os.environ.get("LINKEDIN_RABBIT_HOME", os.path.join(os.path.expanduser("~"), ".linkedin_rabbit"))
+YIELD_ESTIMATES_FILE = os.path.join(STATE_DIR, "yield_estimates.json")
+DEFAULT_USER_DATA_DIR = os.path.join(STATE_DIR, "chrome-profile")  # One profile per account below it
+DEFAULT_COOKIE_DIR = os.path.join(STATE_DIR, "cookies")  # One cookie file per account
+SEEN_INDEX_FILE = os.path.join(STATE_DIR, "seen_posts.sqlite3")
+CHROMEDRIVER_CACHE_FILE = os.path.join(STATE_DIR, "chromedriver.json")
+CHROMEDRIVER_CACHE_MAX_AGE = 24 * 60 * 60  # Re-check for a new chromedriver once a day
+
+# Chromedriver path resolved in this process (see resolve_chromedriver)
+_chromedriver_path = None
+
+# Lean mode: requests the scraper never needs (it only reads text and counts)
+LEAN_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*media.licdn.com*", "*dms.licdn.com*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*doubleclick.net*",
+    "*google-analytics.com*", "*googletagmanager.com*"
+]
+LEAN_WINDOW_SIZE = "1280,900"
+
+TRANSFER_STATS_SCRIPT = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+let bytes = 0;
+for (const entry of entries) {
+    bytes += entry.transferSize || entry.encodedBodySize || 0;
+}
+return {bytes: bytes, requests: entries.length};
+"""
+
+# Over-fetch estimation: the share of loaded elements that are valid posts
+DEFAULT_VALID_RATIO = 0.25  # Same as the old fixed "load 4x the posts" guess
+MIN_VALID_RATIO = 0.05
+PRIOR_WEIGHT = 10  # The remembered ratio counts as this many elements
+MIN_ELEMENTS_FOR_ESTIMATE = 10
+DEFAULT_POSTS_PER_SCROLL = 5
+SCROLL_BUDGET_MARGIN = 1.5
+BUDGET_RESIZE_CHANGE = 0.2  # Relative change of the estimated yield that resizes a scroll budget
+MAX_SCROLL_ATTEMPTS = 200  # Hard cap, whatever the estimate says
+
+# Incremental mode stops after this many known posts in a row (a single known
+# post can be a pinned one above newer posts)
+KNOWN_RUN_LIMIT = 5
+
+# A --since cutoff stops after this many older posts in a row, for the same reason
+OLD_RUN_LIMIT = 3
+
+# Progress events passed to a progress callback, in the order they first occur
+PROGRESS_EVENTS = ('driver_ready', 'logged_in', 'profile_opened', 'posts_loaded', 'post_skipped', 'post_extracted', 'batch_saved', 'cancelled', 'error')
+
+def report_progress(progress, event, **details):
+    """Pass a progress event to a callback, if there is one.
+    
+    The callback gets a dict with the event name (see PROGRESS_EVENTS) under
+    'event' and the details of the event; queue.Queue().put works as well.
+    Errors in the callback are printed and do not stop the scraper.
+    """
+    if progress is None:
+        return
+    try:
+        progress({'event': event, **details})
+    except Exception as e:
+        print(f"Error reporting progress: {e}")
 
 def random_delay(min_seconds=MIN_ACTION_DELAY, max_seconds=MAX_ACTION_DELAY):
     """Add a random delay to avoid detection."""
-    delay = random.uniform(min_seconds, max_seconds)
+    delay = random.uniform(min_seconds, max_seconds) * DELAY_SCALE
     time.sleep(delay)
+    metrics.add_time('random_delay', delay)
     return delay
 
-def setup_driver(headless=False):
-    """Initialize and configure the Chrome WebDriver with anti-detection measures."""
+def load_cached_chromedriver():
+    """Return the chromedriver path cached by a previous process, or None."""
+    try:
+        with open(CHROMEDRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if time.time() - cached['resolved_at'] > CHROMEDRIVER_CACHE_MAX_AGE:
+            return None
+        if not os.path.isfile(cached['path']):
+            return None
+        return cached['path']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def save_cached_chromedriver(path):
+    """Cache a resolved chromedriver path for other processes."""
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        temp_file = f"{CHROMEDRIVER_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'resolved_at': time.time()}, f)
+        os.replace(temp_file, CHROMEDRIVER_CACHE_FILE)
+    except Exception as e:
+        print(f"Error caching the chromedriver path: {e}")
+
+def resolve_chromedriver(driver_path=None, refresh=False):
+    """Return the path of the chromedriver executable.
+    
+    An explicit driver_path (or the CHROMEDRIVER_PATH environment variable)
+    is used as is. Otherwise the path found by ChromeDriverManager is cached
+    in this process and on disk, so version discovery only runs once a day
+    instead of on every launch. refresh skips both caches.
+    """
+    global _chromedriver_path
+    
+    driver_path = driver_path or os.environ.get("CHROMEDRIVER_PATH")
+    if driver_path:
+        return driver_path
+    
+    if not refresh:
+        if _chromedriver_path and os.path.isfile(_chromedriver_path):
+            return _chromedriver_path
+        cached_path = load_cached_chromedriver()
+        if cached_path:
+            _chromedriver_path = cached_path
+            return cached_path
+    
+    _chromedriver_path = ChromeDriverManager().install()
+    save_cached_chromedriver(_chromedriver_path)
+    return _chromedriver_path
+
+def open_page(driver, url):
+    """Navigate to a URL, recording when the browser's first page was ready."""
+    driver.get(url)
+    timings = getattr(driver, 'startup_timings', None)
+    if timings is not None and 'first_page' not in timings:
+        timings['first_page'] = time.perf_counter() - timings.pop('spawned_at')
+        print(format_startup_timings(timings))
+
+def format_startup_timings(timings):
+    """Format the browser startup timings recorded by setup_driver and open_page."""
+    parts = [f"{name.replace('_', ' ')} {seconds:.2f}s" for name, seconds in timings.items() if name != 'spawned_at']
+    return "Browser startup: " + ", ".join(parts)
+
+def enable_lean_mode(driver):
+    """Block images, media, fonts and trackers through Chrome DevTools."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+        return True
+    except Exception as e:
+        print(f"Error enabling request blocking: {e}")
+        return False
+
+def get_transfer_stats(driver):
+    """Return the bytes transferred and the number of requests of the current page.
+    
+    Based on the Resource Timing API, so cross-origin responses without a
+    Timing-Allow-Origin header are counted by request but not by size.
+    Outside lean mode the browser only buffers the first 250 requests.
+    """
+    try:
+        stats = driver.execute_script(TRANSFER_STATS_SCRIPT)
+        if stats:
+            return stats
+    except Exception as e:
+        print(f"Error reading transfer stats: {e}")
+    return {'bytes': 0, 'requests': 0}
+
+@metrics.timed('setup_driver')
+def setup_driver(headless=False, user_data_dir=None, driver_path=None, lean=False):
+    """Initialize and configure the Chrome WebDriver with anti-detection measures.
+    
+    lean drops what the scraper never reads: images, videos, fonts and
+    tracking scripts are blocked, the GPU is disabled and the window has a
+    small fixed size, which cuts page-load time and Chrome's memory use.
+    
+    With user_data_dir, Chrome keeps its profile (cookies, login session and
+    HTTP/asset cache) in that directory between runs. A profile directory
+    can only be used by one browser at a time.
+    driver_path points to an already installed chromedriver (see
+    resolve_chromedriver).
+    
+    The time spent resolving chromedriver and spawning the browser is
+    recorded in driver.startup_timings; open_page adds the time until the
+    first page was ready.
+    """
     chrome_options = Options()
     if headless:
         chrome_options.add_argument("--headless=new")
     
+    if user_data_dir:
+        os.makedirs(user_data_dir, exist_ok=True)
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+    
     # Basic options
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-notifications")
     chrome_options.add_argument("--disable-popup-blocking")
-    chrome_options.add_argument("--start-maximized")
     chrome_options.add_argument("--disable-extensions")
     
+    if lean:
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument(f"--window-size={LEAN_WINDOW_SIZE}")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2
+        })
+    else:
+        chrome_options.add_argument("--start-maximized")
+    
     # Anti-detection measures
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
@@ -58,19 +263,130 @@ def setup_driver(headless=False):
     # Add a user agent to appear more like a real browser
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     
-    # Updated ChromeDriverManager setup
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Resolve chromedriver (cached) and start the browser
+    started = time.perf_counter()
+    service = Service(resolve_chromedriver(driver_path))
+    resolved = time.perf_counter()
+    try:
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    except SessionNotCreatedException:
+        if driver_path or os.environ.get("CHROMEDRIVER_PATH"):
+            raise
+        # The cached chromedriver may no longer match an updated Chrome
+        print("Cached chromedriver failed to start Chrome, resolving it again...")
+        service = Service(resolve_chromedriver(refresh=True))
+        resolved = time.perf_counter()
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    spawned = time.perf_counter()
+    
+    driver.startup_timings = {
+        'resolve': resolved - started,
+        'spawn': spawned - resolved,
+        'spawned_at': spawned
+    }
     
     # Additional anti-detection measures
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     
+    if lean:
+        # Keep every request in the resource timing buffer so get_transfer_stats
+        # sees the whole feed, not just the first 250 requests
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                "source": "performance.setResourceTimingBufferSize(100000);"
+            })
+        except Exception:
+            pass
+        enable_lean_mode(driver)
+    
     return driver
 
-def login_to_linkedin(driver, username, password):
-    """Log in to LinkedIn with the provided credentials."""
+def account_key(username):
+    """Return a short hash of a LinkedIn username to name the saved state of its account."""
+    return hashlib.sha256(username.strip().lower().encode('utf-8')).hexdigest()[:16]
+
+def account_cookie_file(username, directory=DEFAULT_COOKIE_DIR):
+    """Return the cookie file of an account in directory.
+    
+    Every account has its own file, so a session saved for one account is
+    never reused when scraping with another.
+    """
+    return os.path.join(directory, f"{account_key(username)}.json")
+
+def account_user_data_dir(username, directory=DEFAULT_USER_DATA_DIR):
+    """Return the persistent Chrome profile directory of an account below directory."""
+    return os.path.join(directory, account_key(username))
+
+def save_cookies(driver, cookie_file):
+    """Save the browser's cookies so a later run can reuse the login session."""
+    try:
+        directory = os.path.dirname(cookie_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # The cookies grant access to the account, so keep them private
+        fd = os.open(cookie_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(driver.get_cookies(), f)
+        return True
+    except Exception as e:
+        print(f"Error saving cookies: {e}")
+        return False
+
+def load_cookies(driver, cookie_file):
+    """Add the cookies saved by save_cookies to the browser."""
+    try:
+        with open(cookie_file, 'r', encoding='utf-8') as f:
+            cookies = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading cookies: {e}")
+        return False
+    
+    # Cookies can only be added for the domain that is currently open
+    open_page(driver, LINKEDIN_BASE_URL)
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            pass
+    return True
+
+def is_logged_in(driver, timeout=10):
+    """Check whether the browser already has a valid LinkedIn session."""
+    try:
+        open_page(driver, f"{LINKEDIN_BASE_URL}/feed/")
+        # Wait for either the navigation bar of a logged-in page or the login form
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.find_elements(By.ID, "global-nav") or d.find_elements(By.ID, "username")
+        )
+        return bool(driver.find_elements(By.ID, "global-nav"))
+    except TimeoutException:
+        return False
+    except Exception as e:
+        print(f"Error checking the LinkedIn session: {e}")
+        return False
+
+@metrics.timed('login')
+def login_to_linkedin(driver, username, password, cookie_file=None, reuse_session=False):
+    """Log in to LinkedIn with the provided credentials.
+    
+    With reuse_session (a persistent browser profile) or a saved cookie_file,
+    the existing session is checked first and the login form is only filled
+    in when that session turns out to be invalid. After a full login the
+    cookies are saved to cookie_file.
+    
+    The saved session is not checked against username, so the profile and
+    cookie file must belong to this account (see account_cookie_file and
+    account_user_data_dir).
+    """
+    if cookie_file and os.path.exists(cookie_file):
+        reuse_session = load_cookies(driver, cookie_file) or reuse_session
+    
+    if reuse_session and is_logged_in(driver):
+        print("Reusing the saved LinkedIn session")
+        return True
+    
     print("Logging in to LinkedIn...")
-    driver.get("https://www.linkedin.com/login")
+    open_page(driver, f"{LINKEDIN_BASE_URL}/login")
     
     # Add a random delay before login
     random_delay(2.0, 4.0)
@@ -85,7 +401,7 @@ def login_to_linkedin(driver, username, password):
         username_field = driver.find_element(By.ID, "username")
         for char in username:
             username_field.send_keys(char)
-            time.sleep(random.uniform(0.05, 0.15))
+            time.sleep(random.uniform(0.05, 0.15) * DELAY_SCALE)
         
         random_delay(0.5, 1.5)
         
@@ -93,7 +409,7 @@ def login_to_linkedin(driver, username, password):
         password_field = driver.find_element(By.ID, "password")
         for char in password:
             password_field.send_keys(char)
-            time.sleep(random.uniform(0.05, 0.15))
+            time.sleep(random.uniform(0.05, 0.15) * DELAY_SCALE)
         
         random_delay(0.5, 1.5)
         
@@ -107,6 +423,9 @@ def login_to_linkedin(driver, username, password):
         
         print("Successfully logged in to LinkedIn")
         
+        if cookie_file:
+            save_cookies(driver, cookie_file)
+        
         # Add a longer delay after login to avoid suspicion
         random_delay(3.0, 5.0)
         
@@ -127,30 +446,423 @@ def get_posts_url(profile_url):
     else:
         # Extract username from URL
         username = profile_url.split('/')[-1]
-        return f"https://www.linkedin.com/in/{username}/recent-activity/all/"
+        return f"{LINKEDIN_BASE_URL}/in/{username}/recent-activity/all/"
+
+# Clicks the "see more" button of every post that has not been expanded yet
+# and marks the post, so no post is ever touched twice. Posts whose content
+# is not rendered yet (occluded placeholders) are left for a later pass.
+EXPAND_SEE_MORE_SCRIPT = """
+const posts = arguments[1] || document.querySelectorAll(arguments[0]);
+const inlineText = /^(…|\\.\\.\\.)\\s*see more$/i;
+let expanded = 0;
+for (const post of posts) {
+    if (post.dataset.rabbitExpanded || !post.textContent.trim()) continue;
+    let buttons = Array.from(post.querySelectorAll('button.feed-shared-inline-show-more-text__button'))
+        .filter(button => button.textContent.toLowerCase().includes('see more'));
+    if (!buttons.length) {
+        // Only the inline control of the post text, not "See more comments" and the like
+        buttons = Array.from(post.querySelectorAll('button')).filter(button =>
+            button.classList.contains('see-more') || inlineText.test(button.textContent.trim()));
+    }
+    for (const button of buttons) {
+        button.click();
+        expanded++;
+    }
+    // Posts without a control yet are looked at again on the next pass
+    if (buttons.length) post.dataset.rabbitExpanded = '1';
+}
+return expanded;
+"""
 
-def expand_see_more_buttons(driver):
-    """Find and click all 'see more' buttons in the page."""
+@metrics.timed('expand_see_more')
+def expand_see_more_buttons(driver, posts=None):
+    """Expand the truncated text of all posts that were not expanded before.
+    
+    Runs in a single round trip over the rendered posts (or only the given
+    post elements). Returns the number of 'see more' buttons clicked, or
+    None if the script failed.
+    """
     try:
-        see_more_buttons = driver.find_elements(By.XPATH, "//button[contains(., 'see more')]")
-        for button in see_more_buttons:
-            try:
-                # Scroll to the button
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-                random_delay(0.3, 0.7)
-                
-                # Click the button
-                driver.execute_script("arguments[0].click();", button)
-                random_delay(0.5, 1.0)
-            except:
-                pass
-        return True
+        expanded = driver.execute_script(EXPAND_SEE_MORE_SCRIPT, get_post_selector(driver), posts) or 0
+        metrics.count('see_more_expanded', expanded)
+        return expanded
     except Exception as e:
         print(f"Error expanding 'see more' buttons: {e}")
-        return False
+        return None
+
+def get_post_selector(driver):
+    """Return the CSS selector for the post elements of the open activity page."""
+    if '/company/' in driver.current_url:
+        # Company page posts
+        return "div.feed-shared-update-v2"
+    # Personal profile posts - try different selectors
+    return "div.occludable-update, div.feed-shared-update-v2"
 
-def scroll_to_load_posts(driver, num_posts, start_from=0, max_attempts=40):
-    """Scroll down the page to load the specified number of posts."""
+def find_post_elements(driver):
+    """Return all post elements currently rendered on the activity page."""
+    return driver.find_elements(By.CSS_SELECTOR, get_post_selector(driver))
+
+class ScrollPacer:
+    """Minimum interval between two scroll steps.
+    
+    Pacing is kept separate from waiting for content: a scroll step waits
+    only until new posts arrive, and the pacer makes sure the next scroll
+    does not happen before a random interval between min_interval and
+    max_interval has passed since the previous one. Time spent extracting
+    posts counts towards that interval.
+    """
+    
+    def __init__(self, min_interval=MIN_SCROLL_DELAY, max_interval=MAX_SCROLL_DELAY):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.next_allowed = 0.0
+    
+    def wait_turn(self):
+        """Sleep until the next scroll is allowed and schedule the one after it."""
+        remaining = self.next_allowed - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+            metrics.add_time('scroll_pacing', remaining)
+        self.next_allowed = time.monotonic() + random.uniform(self.min_interval, self.max_interval) * DELAY_SCALE
+        return max(remaining, 0.0)
+
+# Scrolls (optionally) and waits until new post nodes are attached or the
+# page height changes, then until the DOM has been quiet for a moment so the
+# new posts are fully rendered. Returns early instead of sleeping a fixed time.
+# Ads, carousels and overlays can keep mutating the page, so the settle wait
+# ends at most maxSettle ms after the first change.
+WAIT_FOR_CONTENT_SCRIPT = """
+const selector = arguments[0], baseCount = arguments[1], baseHeight = arguments[2];
+const timeout = arguments[3], settle = arguments[4], scroll = arguments[5];
+const maxSettle = arguments[6];
+const done = arguments[arguments.length - 1];
+let changed = false, finished = false, settleTimer = null, settleDeadline = null;
+function result() {
+    return {changed: changed, posts: document.querySelectorAll(selector).length,
+            height: document.body.scrollHeight};
+}
+function finish() {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timeoutTimer);
+    clearTimeout(settleTimer);
+    clearTimeout(settleDeadline);
+    done(result());
+}
+function check() {
+    if (!changed && (document.querySelectorAll(selector).length > baseCount ||
+                     document.body.scrollHeight !== baseHeight)) {
+        changed = true;
+        settleDeadline = setTimeout(finish, maxSettle);
+    }
+    if (changed) {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(finish, settle);
+    }
+}
+const observer = new MutationObserver(check);
+observer.observe(document.body, {childList: true, subtree: true});
+const timeoutTimer = setTimeout(finish, timeout);
+if (scroll) {
+    window.scrollTo({top: document.body.scrollHeight, behavior: 'smooth'});
+}
+check();
+"""
+
+def wait_for_new_content(driver, post_count, height, timeout=SCROLL_WAIT_TIMEOUT, scroll=False):
+    """Wait until new posts are attached or the page height changes.
+    
+    post_count and height describe the page before the change we wait for.
+    With scroll, the page is scrolled to the bottom in the same round trip.
+    Returns a dict with 'changed', the current 'posts' count and 'height';
+    'changed' is False if nothing happened within timeout seconds.
+    """
+    try:
+        return driver.execute_async_script(
+            WAIT_FOR_CONTENT_SCRIPT, get_post_selector(driver), post_count, height,
+            int(timeout * 1000), CONTENT_SETTLE_MS, scroll, CONTENT_SETTLE_MAX_MS
+        )
+    except TimeoutException:
+        pass
+    except Exception as e:
+        print(f"Error waiting for new content: {e}")
+    
+    # Fall back to polling the page height
+    if scroll:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.25).until(
+            lambda d: d.execute_script("return document.body.scrollHeight") != height
+        )
+        changed = True
+    except TimeoutException:
+        changed = False
+    return {
+        'changed': changed,
+        'posts': len(find_post_elements(driver)),
+        'height': driver.execute_script("return document.body.scrollHeight")
+    }
+
+def save_page_snapshot(driver, snapshot_dir, index):
+    """Save the current page source as an HTML file for offline extraction."""
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = os.path.join(snapshot_dir, f"snapshot_{timestamp}_{index:04d}.html")
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(driver.page_source)
+        return filepath
+    except Exception as e:
+        print(f"Error saving page snapshot: {e}")
+        return None
+
+def profile_key(url):
+    """Return a stable key for a profile, e.g. 'in/username' or 'company/name'."""
+    match = re.search(r'/(in|company)/([^/?#]+)', url or '')
+    if match:
+        return f"{match.group(1)}/{match.group(2).lower()}"
+    return (url or '').rstrip('/')
+
+def load_yield_estimates():
+    """Read the remembered valid-post ratios of all profiles."""
+    try:
+        with open(YIELD_ESTIMATES_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_yield_estimate(profile_url, ratio):
+    """Remember the valid-post ratio of a profile for the next run."""
+    try:
+        estimates = load_yield_estimates()
+        estimates[profile_key(profile_url)] = round(ratio, 4)
+        os.makedirs(STATE_DIR, exist_ok=True)
+        with open(YIELD_ESTIMATES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(estimates, f, indent=2)
+    except Exception as e:
+        print(f"Error saving yield estimate: {e}")
+
+class YieldTracker:
+    """Live ratio of valid posts to loaded post elements of one profile.
+    
+    Reposts, empty posts and duplicates all count against the ratio. The
+    remembered ratio of the previous run acts as a prior worth PRIOR_WEIGHT
+    elements, so early estimates are stable and later ones follow the feed.
+    Posts skipped for reasons of one run only (already seen, older than the
+    cutoff) count against the live ratio but not against the remembered one.
+    """
+    
+    def __init__(self, profile_url=None):
+        self.profile_url = profile_url
+        self.prior = load_yield_estimates().get(profile_key(profile_url), DEFAULT_VALID_RATIO) if profile_url else DEFAULT_VALID_RATIO
+        self.handled = 0
+        self.valid = 0
+        self.run_skipped = 0  # Handled elements left out of the remembered ratio
+        self.loaded_per_scroll = None  # Average number of elements one scroll loads
+    
+    def record(self, valid, remember=True):
+        """Count one handled post element; remember=False keeps it out of the saved ratio."""
+        self.handled += 1
+        if valid:
+            self.valid += 1
+        if not remember:
+            self.run_skipped += 1
+    
+    def record_scroll(self, new_elements):
+        """Count how many post elements one scroll step added."""
+        if new_elements <= 0:
+            return
+        if self.loaded_per_scroll is None:
+            self.loaded_per_scroll = float(new_elements)
+        else:
+            self.loaded_per_scroll = 0.7 * self.loaded_per_scroll + 0.3 * new_elements
+    
+    def _estimate(self, handled):
+        """Return the valid-post ratio over handled elements, blended with the prior."""
+        ratio = (self.valid + self.prior * PRIOR_WEIGHT) / (handled + PRIOR_WEIGHT)
+        return min(max(ratio, MIN_VALID_RATIO), 1.0)
+    
+    @property
+    def ratio(self):
+        """Estimated share of loaded elements that turn out to be valid posts."""
+        return self._estimate(self.handled)
+    
+    @property
+    def profile_ratio(self):
+        """The ratio saved for the next run, without the run-specific skips."""
+        return self._estimate(self.handled - self.run_skipped)
+    
+    @property
+    def posts_per_scroll(self):
+        """Estimated number of valid posts one scroll step adds."""
+        return self.ratio * (self.loaded_per_scroll or DEFAULT_POSTS_PER_SCROLL)
+    
+    def elements_needed(self, remaining_posts):
+        """Estimate how many more elements must be loaded for remaining_posts valid posts."""
+        return math.ceil(max(remaining_posts, 0) / self.ratio)
+    
+    def scrolls_needed(self, remaining_posts, unprocessed_elements=0):
+        """Estimate how many more scroll steps are needed, with a safety margin."""
+        missing = self.elements_needed(remaining_posts) - unprocessed_elements
+        if missing <= 0:
+            return 0
+        per_scroll = self.loaded_per_scroll or DEFAULT_POSTS_PER_SCROLL
+        return math.ceil(missing / per_scroll * SCROLL_BUDGET_MARGIN)
+    
+    def save(self):
+        """Remember the ratio for the next run, once enough elements were seen."""
+        if self.profile_url and self.handled - self.run_skipped >= MIN_ELEMENTS_FOR_ESTIMATE:
+            save_yield_estimate(self.profile_url, self.profile_ratio)
+
+class ScrollBudget:
+    """Number of scroll steps one scrape may take, sized from a YieldTracker.
+    
+    The budget is set once from the estimated valid posts per scroll step and
+    only extended when that estimate moves by BUDGET_RESIZE_CHANGE, so a feed
+    that keeps loading invalid posts cannot extend it on every step.
+    """
+    
+    def __init__(self, tracker, num_posts, limit=MAX_SCROLL_ATTEMPTS):
+        self.tracker = tracker
+        self.limit = limit
+        self.rate = tracker.posts_per_scroll
+        self.steps = min(tracker.scrolls_needed(num_posts), limit)
+    
+    def update(self, attempts, remaining_posts):
+        """Extend the budget if the estimated yield changed, and return it."""
+        rate = self.tracker.posts_per_scroll
+        if abs(rate - self.rate) >= BUDGET_RESIZE_CHANGE * self.rate:
+            self.rate = rate
+            self.steps = min(max(self.steps, attempts + self.tracker.scrolls_needed(remaining_posts)), self.limit)
+        return self.steps
+
+class SeenIndex:
+    """On-disk index of the posts already scraped, per profile.
+    
+    Posts are keyed by their URN when LinkedIn provides one and by their
+    content hash, so a post counts as seen if either key was stored before.
+    """
+    
+    def __init__(self, path=SEEN_INDEX_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen_posts ("
+            "profile TEXT NOT NULL, key TEXT NOT NULL, first_seen TEXT NOT NULL, "
+            "PRIMARY KEY (profile, key)) WITHOUT ROWID"
+        )
+        self.connection.commit()
+    
+    @staticmethod
+    def post_keys(record):
+        """Return the keys a post record is stored under."""
+        keys = [generate_content_hash(record['content'])]
+        if record.get('urn'):
+            keys.append(record['urn'])
+        return keys
+    
+    def contains(self, profile_url, record):
+        """Check whether a post of a profile was seen in an earlier run."""
+        keys = self.post_keys(record)
+        row = self.connection.execute(
+            f"SELECT 1 FROM seen_posts WHERE profile = ? AND key IN ({','.join('?' * len(keys))}) LIMIT 1",
+            [profile_key(profile_url)] + keys
+        ).fetchone()
+        return row is not None
+    
+    def add(self, profile_url, record):
+        """Remember a post of a profile."""
+        profile = profile_key(profile_url)
+        first_seen = datetime.now().isoformat(timespec='seconds')
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO seen_posts (profile, key, first_seen) VALUES (?, ?, ?)",
+            [(profile, key, first_seen) for key in self.post_keys(record)]
+        )
+        self.connection.commit()
+    
+    def count(self, profile_url):
+        """Return the number of keys stored for a profile."""
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM seen_posts WHERE profile = ?", (profile_key(profile_url),)
+        ).fetchone()[0]
+    
+    def close(self):
+        self.connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+@metrics.timed('scroll')
+def scroll_feed_step(driver, last_height, no_change_count, pacer=None, timeout=SCROLL_WAIT_TIMEOUT):
+    """Scroll to the bottom of the feed once and wait for new posts to load.
+    
+    The pacer decides when the scroll may happen; the wait afterwards ends
+    as soon as new posts arrive (or after timeout seconds, STUCK_WAIT_TIMEOUT
+    once the previous scroll loaded nothing). The pauses of the extra scrolls
+    are random delays, so they scale with DELAY_SCALE.
+    Returns the new page height and the number of scrolls in a row that did
+    not change it.
+    """
+    if pacer is None:
+        pacer = ScrollPacer()
+    pacer.wait_turn()
+    metrics.count('scrolls')
+    
+    # Scroll down with a smooth, human-like behavior and wait for new posts
+    post_count = len(find_post_elements(driver))
+    wait = timeout if no_change_count == 0 else min(timeout, STUCK_WAIT_TIMEOUT)
+    result = wait_for_new_content(driver, post_count, last_height, timeout=wait, scroll=True)
+    
+    # Expand the "see more" buttons of the newly loaded posts
+    expanded = expand_see_more_buttons(driver)
+    if expanded:
+        print(f"Expanded {expanded} truncated posts")
+    
+    new_height = result['height']
+    
+    # Check if the page has changed
+    if not result['changed'] and new_height == last_height:
+        no_change_count += 1
+        
+        # If we're stuck, try a different scroll approach
+        if no_change_count >= 3:
+            # Try a random scroll position to trigger more content loading
+            random_scroll = random.uniform(0.5, 0.9) * last_height
+            driver.execute_script(f"window.scrollTo(0, {random_scroll});")
+            random_delay(1.0, 2.0)
+            result = wait_for_new_content(driver, result['posts'], new_height, timeout=CHANGE_CHECK_TIMEOUT, scroll=True)
+            new_height = result['height']
+            if result['changed']:
+                no_change_count = 0
+    else:
+        no_change_count = 0
+    
+    # Add some randomness to the scrolling behavior
+    if random.random() < 0.2:  # 20% chance
+        # Scroll up a bit and then back down to mimic human behavior
+        up_scroll = random.uniform(0.7, 0.9) * new_height
+        driver.execute_script(f"window.scrollTo(0, {up_scroll});")
+        random_delay(1.0, 2.0)
+        result = wait_for_new_content(driver, result['posts'], new_height, timeout=CHANGE_CHECK_TIMEOUT, scroll=True)
+        new_height = result['height']
+    
+    return new_height, no_change_count
+
+@metrics.timed('scroll_to_load_posts')
+def scroll_to_load_posts(driver, num_posts, start_from=0, max_attempts=40, snapshot_dir=None):
+    """Scroll down the page to load the specified number of posts.
+    
+    iter_posts is usually the better choice: it extracts posts while
+    scrolling and stops as soon as enough valid posts were found.
+    With snapshot_dir, the page source is saved after every scroll so it can
+    be parsed later with html_extractor.
+    """
     print(f"Scrolling to load at least {num_posts} posts (starting after post #{start_from})...")
     
     posts = []
@@ -159,8 +871,9 @@ def scroll_to_load_posts(driver, num_posts, start_from=0, max_attempts=40):
     max_no_change = 5  # Stop after 5 scrolls with no new content
     attempts = 0
     
-    # We load more posts than needed to account for filtering and duplicates
-    target_posts = num_posts * 4
+    # We load more posts than needed to account for filtering and duplicates,
+    # sized from the share of valid posts remembered for this profile
+    target_posts = YieldTracker(driver.current_url).elements_needed(num_posts)
     
     # Create a progress bar
     pbar = tqdm(total=target_posts, desc="Loading posts")
@@ -171,80 +884,38 @@ def scroll_to_load_posts(driver, num_posts, start_from=0, max_attempts=40):
         initial_scroll_count = min(start_from // 5, 20)  # Estimate how many scrolls needed
         
         # Initial rapid scrolling to get past the already processed posts
+        fast_pacer = ScrollPacer(1.0, 2.0)
         for _ in range(initial_scroll_count):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            random_delay(1.0, 2.0)
+            fast_pacer.wait_turn()
+            wait_for_new_content(driver, len(find_post_elements(driver)), last_height, scroll=True)
             
             # Expand any "see more" buttons to ensure all content is loaded
             expand_see_more_buttons(driver)
             
             # Get current posts to check progress
-            if '/company/' in driver.current_url:
-                current_posts = driver.find_elements(By.CSS_SELECTOR, "div.feed-shared-update-v2")
-            else:
-                current_posts = driver.find_elements(By.CSS_SELECTOR, "div.occludable-update, div.feed-shared-update-v2")
+            current_posts = find_post_elements(driver)
+            last_height = driver.execute_script("return document.body.scrollHeight")
             
             # If we've loaded enough posts to skip, break early
             if len(current_posts) >= start_from * 1.5:  # Load extra to account for filtering
                 print(f"Loaded {len(current_posts)} posts during initial scrolling")
                 break
     
+    pacer = ScrollPacer()
     while len(posts) < target_posts and no_change_count < max_no_change and attempts < max_attempts:
-        # Scroll down with a smooth, human-like behavior
-        driver.execute_script("""
-            window.scrollTo({
-                top: document.body.scrollHeight,
-                behavior: 'smooth'
-            });
-        """)
-        
-        # Random delay between scrolls to mimic human behavior
-        scroll_delay = random_delay(MIN_SCROLL_DELAY, MAX_SCROLL_DELAY)
-        
-        # Expand any "see more" buttons
-        expand_see_more_buttons(driver)
-        
-        # Get new scroll height
-        new_height = driver.execute_script("return document.body.scrollHeight")
+        last_height, no_change_count = scroll_feed_step(driver, last_height, no_change_count, pacer)
         
         # Find all posts
-        if '/company/' in driver.current_url:
-            # Company page posts
-            posts = driver.find_elements(By.CSS_SELECTOR, "div.feed-shared-update-v2")
-        else:
-            # Personal profile posts - try different selectors
-            posts = driver.find_elements(By.CSS_SELECTOR, "div.occludable-update, div.feed-shared-update-v2")
+        posts = find_post_elements(driver)
+        
+        if snapshot_dir:
+            save_page_snapshot(driver, snapshot_dir, attempts)
         
         # Update progress bar
         pbar.n = min(len(posts), target_posts)
         pbar.refresh()
         
-        # Check if the page height has changed
-        if new_height == last_height:
-            no_change_count += 1
-            
-            # If we're stuck, try a different scroll approach
-            if no_change_count >= 3:
-                # Try a random scroll position to trigger more content loading
-                random_scroll = random.uniform(0.5, 0.9) * last_height
-                driver.execute_script(f"window.scrollTo(0, {random_scroll});")
-                random_delay(1.0, 2.0)
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                random_delay(1.0, 2.0)
-        else:
-            no_change_count = 0
-            
-        last_height = new_height
         attempts += 1
-        
-        # Add some randomness to the scrolling behavior
-        if random.random() < 0.2:  # 20% chance
-            # Scroll up a bit and then back down to mimic human behavior
-            up_scroll = random.uniform(0.7, 0.9) * last_height
-            driver.execute_script(f"window.scrollTo(0, {up_scroll});")
-            random_delay(1.0, 2.0)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            random_delay(1.0, 2.0)
     
     pbar.close()
     
@@ -257,14 +928,157 @@ def scroll_to_load_posts(driver, num_posts, start_from=0, max_attempts=40):
     
     return posts
 
+# Selectors shared by the per-element extractors and extract_posts_bulk
+REPOST_ICON_SELECTOR = "li-icon[type='repost-filled']"
+REPOST_TEXT_XPATH = ".//*[contains(text(), 'reposted') or contains(text(), 'shared')]"
+CONTENT_SELECTORS = [
+    ".feed-shared-update-v2__description-wrapper",
+    ".feed-shared-text",
+    ".feed-shared-text__text-view",
+    ".break-words",
+    ".update-components-text",
+    ".feed-shared-update-v2__description",
+    ".feed-shared-inline-show-more-text",
+    ".feed-shared-text-view"
+]
+DATE_SELECTORS = [
+    ".feed-shared-actor__sub-description",
+    ".feed-shared-actor__sub-description span",
+    ".ml4.mt2.text-body-xsmall.t-black--light",
+    ".visually-hidden"
+]
+LIKE_SELECTORS = [
+    ".social-details-social-counts__reactions-count",
+    ".social-details-social-counts__count-value"
+]
+COMMENT_SELECTORS = [
+    ".social-details-social-counts__comments-count",
+    ".social-details-social-counts__comments span"
+]
+SHARE_SELECTORS = [
+    ".social-details-social-counts__shares-count"
+]
+
+# LinkedIn's id of a post, on the post element or its first child
+POST_URN_SELECTOR = "[data-urn]"
+
+REPOST_MARKER = "[Reposted content - skipped]"
+NO_CONTENT_MARKER = "[No text content found]"
+CONTENT_ERROR_MARKER = "[Error extracting post content]"
+
+def first_non_empty(texts):
+    """Return the first stripped, non-empty text of a selector cascade, or None.
+    
+    Each item is the text of the first element matching one selector (None if
+    nothing matched), in selector order.
+    """
+    for text in texts:
+        if text and text.strip():
+            return text.strip()
+    return None
+
+def selector_texts(post, selectors):
+    """Lazily yield the text of the first element matching each selector."""
+    for selector in selectors:
+        elements = post.find_elements(By.CSS_SELECTOR, selector)
+        yield elements[0].text if elements else None
+
+def clean_post_text(all_text):
+    """Clean the full text of a post when no content element was found."""
+    if not all_text:
+        return NO_CONTENT_MARKER
+    
+    # Try to clean up the text by removing common headers
+    cleaned_lines = []
+    for line in all_text.split('\n'):
+        # Skip lines that are likely headers or metadata
+        if any(x in line.lower() for x in ["likes", "comments", "repost", "shared", "following"]):
+            continue
+            
+        # Skip date lines (often short and contain time indicators)
+        if len(line) < 30 and any(x in line.lower() for x in ["min", "hour", "day", "week", "month", "year"]):
+            continue
+            
+        cleaned_lines.append(line)
+    
+    return '\n'.join(cleaned_lines)
+
+def clean_date_text(date_text):
+    """Clean up the date text (remove any "• Edited" or similar)."""
+    if "•" in date_text:
+        date_text = date_text.split("•")[0].strip()
+    return date_text
+
+# Lengths of the units LinkedIn uses for post ages ("5m", "2w", "3mo", "1yr");
+# months and years are approximated, which is as precise as the label itself
+DATE_UNITS = {
+    's': timedelta(seconds=1), 'sec': timedelta(seconds=1), 'second': timedelta(seconds=1),
+    'm': timedelta(minutes=1), 'min': timedelta(minutes=1), 'minute': timedelta(minutes=1),
+    'h': timedelta(hours=1), 'hr': timedelta(hours=1), 'hour': timedelta(hours=1),
+    'd': timedelta(days=1), 'day': timedelta(days=1),
+    'w': timedelta(weeks=1), 'wk': timedelta(weeks=1), 'week': timedelta(weeks=1),
+    'mo': timedelta(days=30), 'month': timedelta(days=30),
+    'y': timedelta(days=365), 'yr': timedelta(days=365), 'year': timedelta(days=365)
+}
+RELATIVE_DATE_PATTERN = re.compile(r'(\d+)\s*([a-z]+?)s?\b')
+ABSOLUTE_DATE_FORMATS = ("%Y-%m-%d", "%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y")
+
+def resolve_post_date(date_text, now=None):
+    """Turn a post date like "2w", "3mo • Edited" or "Jan 5, 2024" into a datetime.
+    
+    Relative ages are counted back from now (the time of the run).
+    Returns None if the text is not a recognizable date.
+    """
+    if not date_text:
+        return None
+    if now is None:
+        now = datetime.now()
+    text = clean_date_text(date_text).strip().lower()
+    
+    if text in ("now", "just now"):
+        return now
+    
+    match = RELATIVE_DATE_PATTERN.match(text)
+    if match and match.group(2) in DATE_UNITS:
+        return now - int(match.group(1)) * DATE_UNITS[match.group(2)]
+    
+    for date_format in ABSOLUTE_DATE_FORMATS:
+        try:
+            return datetime.strptime(clean_date_text(date_text).strip(), date_format)
+        except ValueError:
+            continue
+    return None
+
+def parse_engagement_text(social_text, stats):
+    """Fill in engagement counts from the full post text when no counters were found."""
+    social_text = social_text.lower()
+    
+    # Parse the text for numbers
+    if "like" in social_text:
+        likes_match = re.search(r'(\d+)\s+like', social_text)
+        if likes_match:
+            stats["likes"] = likes_match.group(1)
+    
+    if "comment" in social_text:
+        comments_match = re.search(r'(\d+)\s+comment', social_text)
+        if comments_match:
+            stats["comments"] = comments_match.group(1)
+    
+    if "share" in social_text:
+        shares_match = re.search(r'(\d+)\s+share', social_text)
+        if shares_match:
+            stats["shares"] = shares_match.group(1)
+    
+    return stats
+
 def is_reposted_content(post):
     """Check if the post is reposted content."""
     try:
-        repost_indicators = post.find_elements(By.CSS_SELECTOR, "li-icon[type='repost-filled']")
+        repost_indicators = post.find_elements(By.CSS_SELECTOR, REPOST_ICON_SELECTOR)
         if repost_indicators:
             return True
             
-        repost_text = post.find_elements(By.XPATH, ".//*[contains(text(), 'reposted') or contains(text(), 'shared')]")
+        repost_text = post.find_elements(By.XPATH, REPOST_TEXT_XPATH)
         if repost_text:
             return True
             
@@ -277,73 +1091,25 @@ def extract_post_content(post):
     try:
         # Check if this is a reposted content
         if is_reposted_content(post):
-            return "[Reposted content - skipped]"
+            return REPOST_MARKER
         
         # Try different selectors for post content
-        selectors = [
-            ".feed-shared-update-v2__description-wrapper",
-            ".feed-shared-text",
-            ".feed-shared-text__text-view",
-            ".break-words",
-            ".update-components-text",
-            ".feed-shared-update-v2__description",
-            ".feed-shared-inline-show-more-text",
-            ".feed-shared-text-view"
-        ]
-        
-        for selector in selectors:
-            elements = post.find_elements(By.CSS_SELECTOR, selector)
-            if elements and elements[0].text.strip():
-                return elements[0].text.strip()
+        content = first_non_empty(selector_texts(post, CONTENT_SELECTORS))
+        if content:
+            return content
         
         # If no specific content found, get all text from the post
-        all_text = post.text.strip()
-        if all_text:
-            # Try to clean up the text by removing common headers
-            lines = all_text.split('\n')
-            cleaned_lines = []
-            skip_next = False
-            
-            for i, line in enumerate(lines):
-                if skip_next:
-                    skip_next = False
-                    continue
-                    
-                # Skip lines that are likely headers or metadata
-                if any(x in line.lower() for x in ["likes", "comments", "repost", "shared", "following"]):
-                    continue
-                    
-                # Skip date lines (often short and contain time indicators)
-                if len(line) < 30 and any(x in line.lower() for x in ["min", "hour", "day", "week", "month", "year"]):
-                    continue
-                    
-                cleaned_lines.append(line)
-            
-            return '\n'.join(cleaned_lines)
-        
-        return "[No text content found]"
+        return clean_post_text(post.text.strip())
     except Exception as e:
         print(f"Error extracting post content: {e}")
-        return "[Error extracting post content]"
+        return CONTENT_ERROR_MARKER
 
 def extract_post_date(post):
     """Extract the date from a post element."""
     try:
-        date_selectors = [
-            ".feed-shared-actor__sub-description",
-            ".feed-shared-actor__sub-description span",
-            ".ml4.mt2.text-body-xsmall.t-black--light",
-            ".visually-hidden"
-        ]
-        
-        for selector in date_selectors:
-            elements = post.find_elements(By.CSS_SELECTOR, selector)
-            if elements and elements[0].text.strip():
-                date_text = elements[0].text.strip()
-                # Clean up the date text (remove any "• Edited" or similar)
-                if "•" in date_text:
-                    date_text = date_text.split("•")[0].strip()
-                return date_text
+        date_text = first_non_empty(selector_texts(post, DATE_SELECTORS))
+        if date_text:
+            return clean_date_text(date_text)
         
         return "Unknown date"
     except Exception as e:
@@ -355,63 +1121,132 @@ def extract_engagement_stats(post):
     try:
         stats = {"likes": "0", "comments": "0", "shares": "0"}
         
-        # Try to find likes
-        like_selectors = [
-            ".social-details-social-counts__reactions-count",
-            ".social-details-social-counts__count-value"
-        ]
-        for selector in like_selectors:
-            elements = post.find_elements(By.CSS_SELECTOR, selector)
-            if elements and elements[0].text.strip():
-                stats["likes"] = elements[0].text.strip()
-                break
-                
-        # Try to find comments
-        comment_selectors = [
-            ".social-details-social-counts__comments-count",
-            ".social-details-social-counts__comments span"
-        ]
-        for selector in comment_selectors:
-            elements = post.find_elements(By.CSS_SELECTOR, selector)
-            if elements and elements[0].text.strip():
-                stats["comments"] = elements[0].text.strip()
-                break
-                
-        # Try to find shares
-        share_selectors = [
-            ".social-details-social-counts__shares-count"
-        ]
-        for selector in share_selectors:
-            elements = post.find_elements(By.CSS_SELECTOR, selector)
-            if elements and elements[0].text.strip():
-                stats["shares"] = elements[0].text.strip()
-                break
+        # Try to find likes, comments and shares
+        stats["likes"] = first_non_empty(selector_texts(post, LIKE_SELECTORS)) or "0"
+        stats["comments"] = first_non_empty(selector_texts(post, COMMENT_SELECTORS)) or "0"
+        stats["shares"] = first_non_empty(selector_texts(post, SHARE_SELECTORS)) or "0"
         
         # Alternative approach - look for the social activity section
         if stats["likes"] == "0" and stats["comments"] == "0" and stats["shares"] == "0":
-            social_text = post.text.lower()
-            
-            # Parse the text for numbers
-            if "like" in social_text:
-                likes_match = re.search(r'(\d+)\s+like', social_text)
-                if likes_match:
-                    stats["likes"] = likes_match.group(1)
-            
-            if "comment" in social_text:
-                comments_match = re.search(r'(\d+)\s+comment', social_text)
-                if comments_match:
-                    stats["comments"] = comments_match.group(1)
-            
-            if "share" in social_text:
-                shares_match = re.search(r'(\d+)\s+share', social_text)
-                if shares_match:
-                    stats["shares"] = shares_match.group(1)
+            parse_engagement_text(post.text, stats)
         
         return stats
     except Exception as e:
         print(f"Error extracting engagement stats: {e}")
         return {"likes": "0", "comments": "0", "shares": "0"}
 
+def get_post_urn(post):
+    """Return LinkedIn's id of a post (e.g. 'urn:li:activity:123'), or None."""
+    try:
+        urn = post.get_attribute('data-urn')
+        if urn:
+            return urn
+        elements = post.find_elements(By.CSS_SELECTOR, POST_URN_SELECTOR)
+        return elements[0].get_attribute('data-urn') if elements else None
+    except Exception:
+        return None
+
+@metrics.timed('extract')
+def extract_post_record(post):
+    """Extract content, date, engagement and repost flag from one post element."""
+    content = extract_post_content(post)
+    is_repost = content == REPOST_MARKER
+    return {
+        'content': content,
+        'date': extract_post_date(post) if not is_repost else "Unknown date",
+        'engagement': extract_engagement_stats(post) if not is_repost else {"likes": "0", "comments": "0", "shares": "0"},
+        'is_repost': is_repost,
+        'urn': get_post_urn(post)
+    }
+
+# Collects the raw texts for every post in a single WebDriver round trip.
+# The selector cascade itself is applied in Python (build_bulk_record) so
+# the bulk and the per-element path give the same results.
+BULK_EXTRACT_SCRIPT = """
+const posts = arguments[0];
+const selectors = arguments[1];
+function texts(post, list) {
+    return list.map(function(selector) {
+        const element = post.querySelector(selector);
+        return element ? element.innerText : null;
+    });
+}
+function urn(post) {
+    const element = post.matches(selectors.urn) ? post : post.querySelector(selectors.urn);
+    return element ? element.getAttribute('data-urn') : null;
+}
+return posts.map(function(post) {
+    const repostText = document.evaluate(selectors.repost_xpath, post, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return {
+        repost: !!post.querySelector(selectors.repost_icon) || !!repostText,
+        content: texts(post, selectors.content),
+        date: texts(post, selectors.date),
+        likes: texts(post, selectors.likes),
+        comments: texts(post, selectors.comments),
+        shares: texts(post, selectors.shares),
+        text: post.innerText || '',
+        urn: urn(post)
+    };
+});
+"""
+
+def build_bulk_record(raw):
+    """Turn the raw texts collected by BULK_EXTRACT_SCRIPT into a post record."""
+    if raw['repost']:
+        return {
+            'content': REPOST_MARKER,
+            'date': "Unknown date",
+            'engagement': {"likes": "0", "comments": "0", "shares": "0"},
+            'is_repost': True,
+            'urn': raw.get('urn')
+        }
+    
+    content = first_non_empty(raw['content']) or clean_post_text(raw['text'].strip())
+    date_text = first_non_empty(raw['date'])
+    stats = {
+        "likes": first_non_empty(raw['likes']) or "0",
+        "comments": first_non_empty(raw['comments']) or "0",
+        "shares": first_non_empty(raw['shares']) or "0"
+    }
+    if stats["likes"] == "0" and stats["comments"] == "0" and stats["shares"] == "0":
+        parse_engagement_text(raw['text'], stats)
+    
+    return {
+        'content': content,
+        'date': clean_date_text(date_text) if date_text else "Unknown date",
+        'engagement': stats,
+        'is_repost': False,
+        'urn': raw.get('urn')
+    }
+
+@metrics.timed('extract')
+def extract_posts_bulk(driver, posts):
+    """Extract the records of many post elements with one execute_script call.
+    
+    Returns a list of records in the same order as posts, or None if the
+    script failed (e.g. a stale element) and the caller should fall back to
+    extract_post_record.
+    """
+    if not posts:
+        return []
+    selectors = {
+        'repost_icon': REPOST_ICON_SELECTOR,
+        'repost_xpath': REPOST_TEXT_XPATH,
+        'content': CONTENT_SELECTORS,
+        'date': DATE_SELECTORS,
+        'likes': LIKE_SELECTORS,
+        'comments': COMMENT_SELECTORS,
+        'shares': SHARE_SELECTORS,
+        'urn': POST_URN_SELECTOR
+    }
+    try:
+        raw_records = driver.execute_script(BULK_EXTRACT_SCRIPT, posts, selectors)
+        return [build_bulk_record(raw) for raw in raw_records]
+    except Exception as e:
+        print(f"Bulk extraction failed, falling back to per-post extraction: {e}")
+        return None
+
 def get_profile_name(driver, profile_url):
     """Extract the profile name from the page."""
     try:
@@ -459,10 +1294,9 @@ def get_profile_name(driver, profile_url):
         # Final fallback
         return "LinkedIn_User"
 
-def save_posts_to_file(posts_data, profile_name):
-    """Save the extracted posts to a text file."""
+def output_filepath(profile_name, output_dir="output"):
+    """Return the profile name to use and a new timestamped text file path for it."""
     # Create output directory if it doesn't exist
-    output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
     
     # Ensure we have a valid profile name
@@ -470,31 +1304,37 @@ def save_posts_to_file(posts_data, profile_name):
         profile_name = "LinkedIn_User"
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{profile_name}_linkedin_posts_{timestamp}.txt"
-    filepath = os.path.join(output_dir, filename)
+    
+    # Two batches can finish within the same second; never replace an earlier file
+    filepath = unique_filepath(os.path.join(output_dir, f"{profile_name}_linkedin_posts_{timestamp}.txt"))
+    return profile_name, filepath
+
+def open_post_writer(profile_name, output_dir="output", emoji_text=False, formats=('jsonl',)):
+    """Open an append-only PostWriter for a new output file of a profile.
+    
+    formats are the structured files written beside the text file ('jsonl', 'parquet').
+    """
+    profile_name, filepath = output_filepath(profile_name, output_dir)
+    return PostWriter(filepath, profile_name, emoji_text=emoji_text, formats=formats)
+
+@metrics.timed('write_file')
+def save_posts_to_file(posts_data, profile_name, formats=('jsonl',), emoji_text=False):
+    """Save the extracted posts to a text file.
+    
+    The same records are also written to a structured file beside the text
+    file for every format in formats ('jsonl', 'parquet'); readers use those
+    instead of parsing the text. With emoji_text, common emoji are written
+    to the text file as labels instead of '?'.
+    """
+    profile_name, filepath = output_filepath(profile_name)
+    
+    posts = [Post.from_dict(post) for post in posts_data]
+    save_structured_posts(posts, filepath, formats)
     
     try:
         with open(filepath, 'w', encoding='utf-8', errors='ignore') as f:
-            f.write(f"LinkedIn Posts for: {profile_name}\n")
-            f.write(f"Extracted on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Number of posts: {len(posts_data)}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            for idx, post in enumerate(posts_data, 1):
-                f.write(f"Post #{idx}\n")
-                f.write(f"Date: {post['date']}\n")
-                
-                # Format engagement data
-                engagement = post['engagement']
-                engagement_str = f"{engagement.get('likes', '0')} likes, {engagement.get('comments', '0')} comments, {engagement.get('shares', '0')} shares"
-                f.write(f"Engagement: {engagement_str}\n\n")
-                
-                # Write content - handle any potential encoding issues
-                content = post['content']
-                # Replace any problematic characters
-                content = ''.join(char if ord(char) < 65536 else '?' for char in content)
-                f.write(content + "\n")
-                f.write("\n" + "-" * 80 + "\n\n")
+            for chunk in render_text(posts, profile_name, emoji_text=emoji_text):
+                f.write(chunk)
         
         print(f"Posts saved to {filepath}")
         return filepath
@@ -503,23 +1343,8 @@ def save_posts_to_file(posts_data, profile_name):
         # Try with a more basic encoding as fallback
         try:
             with open(filepath, 'w', encoding='ascii', errors='replace') as f:
-                f.write(f"LinkedIn Posts for: {profile_name}\n")
-                f.write(f"Extracted on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Number of posts: {len(posts_data)}\n")
-                f.write("=" * 80 + "\n\n")
-                
-                for idx, post in enumerate(posts_data, 1):
-                    f.write(f"Post #{idx}\n")
-                    f.write(f"Date: {post['date']}\n")
-                    
-                    # Format engagement data
-                    engagement = post['engagement']
-                    engagement_str = f"{engagement.get('likes', '0')} likes, {engagement.get('comments', '0')} comments, {engagement.get('shares', '0')} shares"
-                    f.write(f"Engagement: {engagement_str}\n\n")
-                    
-                    # Write content with replacement for non-ASCII characters
-                    f.write(post['content'] + "\n")
-                    f.write("\n" + "-" * 80 + "\n\n")
+                for chunk in render_text(posts, profile_name, emoji_text=emoji_text):
+                    f.write(chunk)
             
             print(f"Posts saved to {filepath} with fallback encoding")
             return filepath
@@ -527,165 +1352,476 @@ def save_posts_to_file(posts_data, profile_name):
             print(f"Error saving posts with fallback encoding: {e2}")
             return None
 
+def save_structured_posts(posts, filepath, formats=('jsonl',)):
+    """Write posts to the structured files beside filepath; returns the paths written."""
+    writers = {'jsonl': write_jsonl, 'parquet': write_parquet}
+    written = []
+    for fmt in formats:
+        try:
+            written.append(writers[fmt](posts, structured_path(filepath, fmt)))
+        except Exception as e:
+            print(f"Error saving posts as {fmt}: {e}")
+    return written
+
 def generate_content_hash(content):
     """Generate a hash of the content to identify duplicates."""
     return hashlib.md5(content.encode('utf-8')).hexdigest()
 
+SKIP_MESSAGES = {
+    'repost': "Skipping reposted content",
+    'empty': "Skipping post with no valid content",
+    'duplicate': "Skipping duplicate post",
+    'near_duplicate': "Skipping near-duplicate post",
+    'seen': "Skipping post already scraped in an earlier run",
+    'old': "Skipping post older than the cutoff date"
+}
+
+def check_post_record(record, content_hashes, near_duplicates=None):
+    """Return why a post record should be skipped, or None for a new valid post.
+    
+    The hash of every valid post is added to content_hashes. With a
+    NearDuplicateIndex, posts almost identical to an earlier one are skipped
+    as well, and the fingerprint of every valid post is added to it.
+    """
+    content = record['content']
+    
+    # Skip reposted content
+    if record['is_repost']:
+        return 'repost'
+    
+    # Skip posts with no content
+    if not content or content == NO_CONTENT_MARKER or content == CONTENT_ERROR_MARKER:
+        return 'empty'
+    
+    # Check for duplicates
+    content_hash = generate_content_hash(content)
+    if content_hash in content_hashes:
+        return 'duplicate'
+    
+    # Check for near-duplicates (edited or truncated copies)
+    if near_duplicates is not None and near_duplicates.check(content):
+        return 'near_duplicate'
+    
+    # Add hash to set to track duplicates
+    content_hashes.add(content_hash)
+    return None
+
 def expand_post_see_more(driver, post):
     """Expand 'see more' buttons in a specific post."""
-    try:
-        # Find all "see more" buttons in this post
-        see_more_buttons = post.find_elements(By.CSS_SELECTOR, "button.feed-shared-inline-show-more-text__button")
-        for button in see_more_buttons:
-            try:
-                if "see more" in button.text.lower():
-                    # Scroll to the button
-                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-                    random_delay(0.3, 0.7)
-                    
-                    # Click the button
-                    driver.execute_script("arguments[0].click();", button)
-                    random_delay(0.5, 1.0)
-            except (StaleElementReferenceException, Exception) as e:
-                print(f"Error clicking 'see more' button: {e}")
-                continue
-        return True
-    except Exception as e:
-        print(f"Error expanding post 'see more' buttons: {e}")
-        return False
+    return expand_see_more_buttons(driver, [post])
 
-def scrape_linkedin_posts(profile_url, num_posts, username, password, headless=False, start_from=0, batch_size=30):
-    """Main function to scrape LinkedIn posts."""
-    driver = None
-    try:
-        # Set up the driver
-        driver = setup_driver(headless)
+class ScrapeSession:
+    """A logged-in browser that is kept alive across scraping batches.
+    
+    The session remembers the profile page it has open and how many post
+    elements on that page were already handled, so the next batch continues
+    from where the previous one stopped instead of launching Chrome, logging
+    in and scrolling from the top again.
+    
+    The password is dropped once the login succeeded (and when the session
+    is closed), so it is not kept in memory for the life of the session.
+    
+    With near_duplicate_distance, posts whose SimHash fingerprint differs in
+    at most that many bits from an earlier post are skipped as well.
+    
+    With a tracer (see tracing.DriverTracer), every WebDriver command of the
+    session's browser is recorded.
+    """
+    
+    def __init__(self, username, password, headless=False, user_data_dir=None, cookie_file=None, driver_path=None, lean=False, near_duplicate_distance=None, tracer=None):
+        self.username = username
+        self.password = password
+        self.headless = headless
+        self.user_data_dir = user_data_dir  # Persistent Chrome profile, see setup_driver
+        self.cookie_file = cookie_file  # Saved login cookies, see login_to_linkedin
+        self.driver_path = driver_path  # Installed chromedriver, see resolve_chromedriver
+        self.lean = lean  # Block heavy resources, see setup_driver
+        self.driver = None
+        self.logged_in = False
+        self.profile_url = None
+        self.profile_name = None
+        self.feed_position = 0  # Index of the next unprocessed post element
+        self.content_hashes = set()  # Duplicates are tracked across batches
+        self.near_duplicate_distance = near_duplicate_distance  # None: exact duplicates only
+        self.near_duplicates = None
+        self.yield_tracker = None
+        self.pacer = ScrollPacer()  # Minimum interval between scrolls, across batches
+        self.tracer = tracer
+    
+    def start(self, progress=None):
+        """Launch the browser and log in, unless that already happened.
         
-        # Login to LinkedIn
-        if not login_to_linkedin(driver, username, password):
-            return None
+        Reports 'driver_ready' and 'logged_in' to progress, with 'reused'
+        set when the browser or login of an earlier batch is kept.
+        """
+        reused = self.driver is not None
+        if not reused:
+            self.driver = setup_driver(self.headless, user_data_dir=self.user_data_dir, driver_path=self.driver_path, lean=self.lean)
+            if self.tracer is not None:
+                self.tracer.attach(self.driver)
+        report_progress(progress, 'driver_ready', reused=reused)
+        
+        reused = self.logged_in
+        if not reused:
+            self.logged_in = login_to_linkedin(
+                self.driver, self.username, self.password,
+                cookie_file=self.cookie_file,
+                reuse_session=bool(self.user_data_dir)
+            )
+        if self.logged_in:
+            self.password = None
+            report_progress(progress, 'logged_in', reused=reused)
+        else:
+            report_progress(progress, 'error', message="Failed to log in to LinkedIn")
+        return self.logged_in
+    
+    @metrics.timed('open_profile')
+    def open_profile(self, profile_url):
+        """Navigate to the posts page of a profile and return the profile name.
+        
+        Opening the profile that is already open keeps the current feed position.
+        """
+        if self.profile_url == profile_url:
+            return self.profile_name
         
-        # Navigate to the posts page
         posts_url = get_posts_url(profile_url)
-        driver.get(posts_url)
+        self.driver.get(posts_url)
         print(f"Navigating to {posts_url}")
         
         # Add a random delay after navigation
         random_delay(3.0, 5.0)
         
-        # Get the profile name
-        profile_name = get_profile_name(driver, profile_url)
-        print(f"Scraping posts for: {profile_name}")
-        
-        # Determine how many posts to scrape in this batch
-        posts_to_scrape = min(batch_size, num_posts - start_from)
-        
-        # Load posts by scrolling - load more than needed to account for filtering
-        all_posts = scroll_to_load_posts(driver, posts_to_scrape, start_from=start_from)
-        
-        if not all_posts:
-            print("No posts found. Check the profile URL and try again.")
-            return None
+        self.profile_url = profile_url
+        self.profile_name = get_profile_name(self.driver, profile_url)
+        self.feed_position = 0
+        self.content_hashes = set()
+        if self.near_duplicate_distance is not None:
+            self.near_duplicates = NearDuplicateIndex(self.near_duplicate_distance)
+        self.yield_tracker = YieldTracker(profile_url)
+        return self.profile_name
+    
+    def close(self):
+        """Quit the browser."""
+        if self.driver:
+            # Add a final delay before quitting to avoid suspicion
+            random_delay(2.0, 4.0)
+            self.driver.quit()
+        self.driver = None
+        self.logged_in = False
+        self.profile_url = None
+        self.password = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+def is_cancelled(cancel, progress=None, found=0):
+    """Return True if cancel is set, reporting the cancellation to progress."""
+    if cancel is None or not cancel.is_set():
+        return False
+    print(f"Scraping cancelled after {found} valid posts")
+    report_progress(progress, 'cancelled', posts=found)
+    return True
+
+def iter_posts(session, profile_url, num_posts, max_attempts=None, bulk_extract=True, snapshot_dir=None, wait_timeout=SCROLL_WAIT_TIMEOUT, seen_index=None, incremental=False, since=None, progress=None, cancel=None):
+    """Yield valid posts from a profile while scrolling, newest first.
+    
+    Newly rendered posts are extracted after every scroll step, reposts,
+    empty posts and duplicates are skipped, and each remaining post is
+    yielded as soon as it is extracted. Scrolling stops as soon as num_posts
+    posts were yielded, or when the feed stops growing.
+    
+    Unless max_attempts is given, the number of scroll steps is sized from
+    the live share of valid posts (see YieldTracker and ScrollBudget), which
+    is remembered per profile for the next run.
+    
+    After a scroll, at most wait_timeout seconds are spent waiting for new
+    posts; how often the feed is scrolled is set by the session's pacer.
+    
+    With a SeenIndex, posts scraped in earlier runs are skipped and every
+    yielded post is added to the index. With incremental, scrolling stops at
+    the first KNOWN_RUN_LIMIT known posts in a row, so only posts newer than
+    the previous run are scraped.
+    
+    Post dates such as "2w" are resolved to a 'timestamp' relative to the
+    start of the call. With since (a datetime), older posts are skipped and
+    scrolling stops at the first OLD_RUN_LIMIT older posts in a row.
+    
+    The session keeps its feed position, so a second call continues after
+    the last post handled by the first one.
+    
+    progress is a callback for progress events (see report_progress): the
+    session start, 'profile_opened', 'posts_loaded' after every scroll step
+    and 'post_skipped' with the reason a post was skipped.
+    
+    cancel is a threading.Event (or anything with is_set()) that stops the
+    scrape cooperatively: it is checked before every post and scroll step.
+    """
+    # Set up the driver and login to LinkedIn
+    if not session.start(progress):
+        return
+    driver = session.driver
+    
+    # Navigate to the posts page (a no-op if it is already open)
+    profile_name = session.open_profile(profile_url)
+    print(f"Scraping posts for: {profile_name}")
+    report_progress(progress, 'profile_opened', profile_name=profile_name)
+    
+    tracker = session.yield_tracker
+    print(f"Expecting about {tracker.ratio:.0%} of loaded posts to be valid "
+          f"(~{tracker.elements_needed(num_posts)} posts to load for {num_posts})")
+    
+    found = 0
+    last_height = driver.execute_script("return document.body.scrollHeight")
+    no_change_count = 0
+    max_no_change = 5  # Stop after 5 scrolls with no new content
+    attempts = 0
+    scroll_seconds = 0.0
+    loaded_count = None
+    known_run = 0
+    old_run = 0
+    run_started = datetime.now()
+    
+    # Posts loaded by scrolling are expanded in scroll_feed_step, the ones
+    # already on the page are expanded here
+    expand_see_more_buttons(driver)
+    
+    budget = ScrollBudget(tracker, num_posts)
+    owns_index = incremental and seen_index is None
+    if owns_index:
+        seen_index = SeenIndex()
+    
+    try:
+        while True:
+            loaded = find_post_elements(driver)
+            new_posts = loaded[session.feed_position:]
+            if loaded_count is not None:
+                tracker.record_scroll(len(loaded) - loaded_count)
+            loaded_count = len(loaded)
+            metrics.count('posts_loaded', len(new_posts))
+            report_progress(progress, 'posts_loaded', loaded=loaded_count, new=len(new_posts), scrolls=attempts,
+                            expected=session.feed_position + tracker.elements_needed(num_posts - found))
             
-        # Extract data from each post
-        posts_data = []
-        valid_posts_count = 0
-        content_hashes = set()  # To track duplicate content
-        
-        print(f"Processing {len(all_posts)} posts to find {posts_to_scrape} valid ones...")
-        
-        # Create a progress bar for processing posts
-        with tqdm(total=posts_to_scrape, desc="Processing posts") as pbar:
-            for post in all_posts:
-                try:
-                    # Try to expand "see more" buttons in this specific post
-                    expand_post_see_more(driver, post)
-                    
-                    # Extract content
-                    content = extract_post_content(post)
+            if snapshot_dir:
+                save_page_snapshot(driver, snapshot_dir, attempts)
+            
+            position = 0
+            while position < len(new_posts) and found < num_posts:
+                # Each valid post needs at least one element, so a chunk of the
+                # still missing count never extracts more than necessary
+                chunk = new_posts[position:position + num_posts - found]
+                position += len(chunk)
+                
+                # Extract the whole chunk in one round trip if possible
+                records = extract_posts_bulk(driver, chunk) if bulk_extract else None
+                
+                for index, post in enumerate(chunk):
+                    if is_cancelled(cancel, progress, found):
+                        return
                     
-                    # Skip reposted content
-                    if content == "[Reposted content - skipped]":
-                        print("Skipping reposted content")
-                        continue
+                    # Every element we look at is handled, valid or not
+                    session.feed_position += 1
+                    try:
+                        record = records[index] if records is not None else extract_post_record(post)
                         
-                    # Skip posts with no content
-                    if not content or content == "[No text content found]" or content == "[Error extracting post content]":
-                        print("Skipping post with no valid content")
+                        # Skip reposts, posts with no content and duplicates
+                        skip_reason = check_post_record(record, session.content_hashes, session.near_duplicates)
+                        if skip_reason:
+                            tracker.record(valid=False)
+                            print(SKIP_MESSAGES[skip_reason])
+                            metrics.count(f"skipped_{skip_reason}")
+                            report_progress(progress, 'post_skipped', reason=skip_reason)
+                            continue
+                    except StaleElementReferenceException:
+                        tracker.record(valid=False)
+                        print("Encountered a stale element. Skipping this post.")
+                        metrics.count('skipped_stale')
+                        report_progress(progress, 'post_skipped', reason='stale')
                         continue
-                        
-                    # Check for duplicates
-                    content_hash = generate_content_hash(content)
-                    if content_hash in content_hashes:
-                        print("Skipping duplicate post")
+                    except Exception as e:
+                        tracker.record(valid=False)
+                        print(f"Error processing post: {e}")
+                        metrics.count('skipped_error')
+                        report_progress(progress, 'post_skipped', reason='error')
                         continue
-                        
-                    # Add hash to set to track duplicates
-                    content_hashes.add(content_hash)
                     
-                    # Extract date and engagement stats
-                    date = extract_post_date(post)
-                    engagement = extract_engagement_stats(post)
+                    # Skip posts older than the cutoff
+                    timestamp = resolve_post_date(record['date'], run_started)
+                    if since is not None and timestamp is not None:
+                        if timestamp < since:
+                            tracker.record(valid=False, remember=False)
+                            old_run += 1
+                            print(SKIP_MESSAGES['old'])
+                            metrics.count('skipped_old')
+                            report_progress(progress, 'post_skipped', reason='old')
+                            if old_run >= OLD_RUN_LIMIT:
+                                print(f"Reached posts older than {since:%Y-%m-%d} after {found} posts")
+                                return
+                            continue
+                        old_run = 0
                     
-                    # Add post data
-                    posts_data.append({
-                        'content': content,
-                        'date': date,
-                        'engagement': engagement
-                    })
-                    valid_posts_count += 1
-                    pbar.update(1)
-                    print(f"Found valid post #{valid_posts_count + start_from}")
+                    # Skip posts scraped in an earlier run
+                    if seen_index is not None and seen_index.contains(profile_url, record):
+                        tracker.record(valid=False, remember=False)
+                        known_run += 1
+                        print(SKIP_MESSAGES['seen'])
+                        metrics.count('skipped_seen')
+                        report_progress(progress, 'post_skipped', reason='seen')
+                        if incremental and known_run >= KNOWN_RUN_LIMIT:
+                            print(f"Reached posts scraped in an earlier run after {found} new posts")
+                            return
+                        continue
+                    known_run = 0
+                    
+                    # Only posts that are actually yielded count as valid
+                    tracker.record(valid=True)
+                    found += 1
+                    metrics.count('posts_extracted')
+                    yield {
+                        'content': record['content'],
+                        'date': record['date'],
+                        'engagement': record['engagement'],
+                        'timestamp': timestamp.isoformat(timespec='seconds') if timestamp else None
+                    }
+                    if seen_index is not None:
+                        seen_index.add(profile_url, record)
+                    
+                    # Stop as soon as we have enough valid posts
+                    if found >= num_posts:
+                        return
                     
                     # Add a random delay between processing posts
                     random_delay(0.5, 1.5)
-                    
-                    # Break if we have enough valid posts for this batch
-                    if valid_posts_count >= posts_to_scrape:
-                        break
-                        
-                except StaleElementReferenceException:
-                    print("Encountered a stale element. Skipping this post.")
-                    continue
-                except Exception as e:
-                    print(f"Error processing post: {e}")
-                    continue
+            
+            if no_change_count >= max_no_change:
+                print(f"Reached the end of the feed after {found} valid posts")
+                return
+            
+            # Size the remaining scroll work from the live valid-post ratio
+            scroll_budget = max_attempts if max_attempts is not None else budget.update(attempts, num_posts - found)
+            if attempts >= scroll_budget:
+                print(f"Stopped scrolling after {attempts} attempts with {found} valid posts")
+                return
+            if is_cancelled(cancel, progress, found):
+                return
+            
+            step_started = time.perf_counter()
+            last_height, no_change_count = scroll_feed_step(driver, last_height, no_change_count, session.pacer, timeout=wait_timeout)
+            scroll_seconds += time.perf_counter() - step_started
+            attempts += 1
+    finally:
+        # Remember the valid-post ratio for the next run on this profile
+        tracker.save()
+        if owns_index:
+            seen_index.close()
+        
+        # Report what scrolling cost, to compare e.g. lean and normal mode
+        if attempts:
+            transfer = get_transfer_stats(driver)
+            print(f"Scrolled {attempts} times ({scroll_seconds / attempts:.2f}s per step), "
+                  f"page transferred {transfer['bytes'] / 1024:.0f} KB in {transfer['requests']} requests")
+
+def scrape_linkedin_posts(profile_url, num_posts, username, password, headless=False, start_from=0, batch_size=30, session=None, bulk_extract=True, snapshot_dir=None, seen_index=None, incremental=False, since=None, progress=None, cancel=None, formats=('jsonl',)):
+    """Main function to scrape LinkedIn posts.
+    
+    Pass a ScrapeSession to keep the browser open between batches; without one
+    a temporary session is created and closed again before returning.
+    With bulk_extract, posts are extracted with one execute_script per chunk
+    instead of one find_elements call per selector and post.
+    snapshot_dir keeps an HTML snapshot of the page after every scroll.
+    Posts are appended to the output file as they are extracted, so an error
+    in the middle of a batch returns the posts found up to that point.
+    seen_index and incremental skip posts scraped in earlier runs, and since
+    skips posts older than a datetime (see iter_posts).
+    progress is a callback for progress events (see report_progress); on
+    top of the events of iter_posts, 'post_extracted' is reported for every
+    saved post, then 'batch_saved' or 'error'.
+    cancel stops the batch between two posts or scroll steps (see iter_posts);
+    the posts found until then are saved as usual.
+    formats are the structured files written beside the text file; add
+    'parquet' for a Parquet file (requires pyarrow).
+    """
+    owns_session = session is None
+    if owns_session:
+        session = ScrapeSession(username, password, headless)
+    writer = None
+    try:
+        # Determine how many posts to scrape in this batch
+        posts_to_scrape = min(batch_size, num_posts - start_from)
+        
+        # A kept session continues at its feed position, a temporary one
+        # starts at the top of the feed and has to skip 'start_from' posts
+        skip = start_from if owns_session else 0
+        posts = iter_posts(session, profile_url, skip + posts_to_scrape, bulk_extract=bulk_extract, snapshot_dir=snapshot_dir,
+                           seen_index=seen_index, incremental=incremental, since=since, progress=progress, cancel=cancel)
+        if skip:
+            print(f"Skipping the first {skip} posts that were already processed")
+        
+        # Append each post to the output file as soon as it is extracted,
+        # so an error keeps everything found before it
+        try:
+            # Create a progress bar for processing posts
+            with tqdm(total=posts_to_scrape, desc="Processing posts") as pbar:
+                for post in itertools.islice(posts, skip, None):
+                    if writer is None:
+                        writer = open_post_writer(session.profile_name, formats=formats)
+                    writer.write(post)
+                    pbar.update(1)
+                    print(f"Found valid post #{writer.count + start_from}")
+                    report_progress(progress, 'post_extracted', posts=writer.count, batch_size=posts_to_scrape,
+                                    posts_scraped=start_from + writer.count, total=num_posts)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            report_progress(progress, 'error', message=str(e))
+            if writer is None:
+                return None
+            print(f"Keeping the {writer.count} posts extracted before the error")
         
         # Save posts to a file
-        if posts_data:
-            if len(posts_data) < posts_to_scrape:
-                print(f"Warning: Only found {len(posts_data)} valid posts out of {posts_to_scrape} requested")
-                
-            filename = save_posts_to_file(posts_data, profile_name)
-            
-            # Check if we need to continue scraping
-            posts_remaining = num_posts - (start_from + valid_posts_count)
-            if posts_remaining > 0:
-                print(f"Scraped {valid_posts_count} posts. {posts_remaining} posts remaining.")
-                print(f"Continuing to scrape more posts...")
-                
-                # Return a dictionary with the current results and a flag to continue
-                return {
-                    'filename': filename,
-                    'continue_scraping': True,
-                    'posts_scraped': start_from + valid_posts_count,
-                    'posts_remaining': posts_remaining
-                }
-            else:
-                # Return just the filename when we're done
-                return filename
-        else:
+        if writer is None:
             print("No valid posts found after filtering.")
+            if cancel is None or not cancel.is_set():
+                report_progress(progress, 'error', message="No valid posts found after filtering")
             return None
         
+        valid_posts_count = writer.count
+        if valid_posts_count < posts_to_scrape:
+            print(f"Warning: Only found {valid_posts_count} valid posts out of {posts_to_scrape} requested")
+        
+        filename = writer.close()
+        
+        # Check if we need to continue scraping
+        posts_remaining = num_posts - (start_from + valid_posts_count)
+        report_progress(progress, 'batch_saved', filename=filename, posts=valid_posts_count,
+                        posts_scraped=start_from + valid_posts_count, posts_remaining=max(posts_remaining, 0))
+        if posts_remaining > 0:
+            print(f"Scraped {valid_posts_count} posts. {posts_remaining} posts remaining.")
+            print(f"Continuing to scrape more posts...")
+            
+            # Return a dictionary with the current results and a flag to continue
+            return {
+                'filename': filename,
+                'continue_scraping': True,
+                'posts_scraped': start_from + valid_posts_count,
+                'posts_remaining': posts_remaining
+            }
+        else:
+            # Return just the filename when we're done
+            return filename
+        
     except Exception as e:
         print(f"An error occurred: {e}")
+        report_progress(progress, 'error', message=str(e))
         return None
     finally:
-        if driver:
-            # Add a final delay before quitting to avoid suspicion
-            random_delay(2.0, 4.0)
-            driver.quit()
+        if writer is not None:
+            # Render the text file even if we were interrupted
+            writer.close()
+        if owns_session:
+            session.close()
 
 def read_input_file(filename="linkedin_input.txt"):
     """Read inputs from a file."""
@@ -740,46 +1876,49 @@ def main():
     batch_size = 30  # Process in batches of 30
     all_filenames = []
     
-    while posts_scraped < total_posts:
-        print(f"\nScraping batch: {posts_scraped+1}-{min(posts_scraped+batch_size, total_posts)} of {total_posts}")
-        
-        # Call the scraper function with the current progress
-        result = scrape_linkedin_posts(
-            inputs['profile_url'],
-            total_posts,
-            inputs['username'],
-            inputs['password'],
-            inputs['headless'],
-            start_from=posts_scraped,
-            batch_size=batch_size
-        )
-        
-        # Handle the result
-        if isinstance(result, dict) and result.get('continue_scraping'):
-            # Save the batch result
-            all_filenames.append(result['filename'])
-            posts_scraped = result['posts_scraped']
-            
-            print(f"\nBatch complete! Scraped {posts_scraped} posts so far.")
-            print(f"Batch results saved to: {result['filename']}")
-            print(f"{result['posts_remaining']} posts remaining.")
-            
-            # Provide a brief pause between batches
-            print("\nContinuing to next batch in 5 seconds...")
-            time.sleep(5)
+    # Keep one browser session alive for all batches
+    with ScrapeSession(inputs['username'], inputs['password'], inputs['headless']) as session:
+        while posts_scraped < total_posts:
+            print(f"\nScraping batch: {posts_scraped+1}-{min(posts_scraped+batch_size, total_posts)} of {total_posts}")
             
-        elif result:
-            # Final batch - scraping complete
-            all_filenames.append(result)
-            posts_scraped = total_posts
+            # Call the scraper function with the current progress
+            result = scrape_linkedin_posts(
+                inputs['profile_url'],
+                total_posts,
+                inputs['username'],
+                inputs['password'],
+                inputs['headless'],
+                start_from=posts_scraped,
+                batch_size=batch_size,
+                session=session
+            )
             
-            print(f"\nSuccess! All {posts_scraped} posts have been extracted from {inputs['profile_url']}")
-            print(f"Final results saved to: {result}")
-            break
-            
-        else:
-            print("\nFailed to extract posts. Please check your inputs and try again.")
-            break
+            # Handle the result
+            if isinstance(result, dict) and result.get('continue_scraping'):
+                # Save the batch result
+                all_filenames.append(result['filename'])
+                posts_scraped = result['posts_scraped']
+                
+                print(f"\nBatch complete! Scraped {posts_scraped} posts so far.")
+                print(f"Batch results saved to: {result['filename']}")
+                print(f"{result['posts_remaining']} posts remaining.")
+                
+                # Provide a brief pause between batches
+                print("\nContinuing to next batch in 5 seconds...")
+                time.sleep(5)
+                
+            elif result:
+                # Final batch - scraping complete
+                all_filenames.append(result)
+                posts_scraped = total_posts
+                
+                print(f"\nSuccess! All {posts_scraped} posts have been extracted from {inputs['profile_url']}")
+                print(f"Final results saved to: {result}")
+                break
+                
+            else:
+                print("\nFailed to extract posts. Please check your inputs and try again.")
+                break
     
     if all_filenames:
         print("\nAll batches completed successfully!")
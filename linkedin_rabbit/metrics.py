@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Run Metrics
+
+This module collects where the time of a scrape run goes: the duration of
+each phase (driver startup, login, scrolling, "see more" expansion,
+extraction, file writing), counters such as scrolls, loaded posts and
+skipped reposts, and the time spent in random delays.
+
+A MetricsCollector is made active for the current thread with collecting();
+the scraper reports to whichever collector is active, so nothing has to be
+passed through its functions, and reporting is a no-op when none is.
+"""
+
+import json
+import time
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+
+_active = contextvars.ContextVar('linkedin_rabbit_metrics', default=None)
+
+class MetricsCollector:
+    """Durations and counters of one scrape run.
+    
+    Phases may contain each other (the login includes its random delays),
+    so their durations do not add up to the elapsed time.
+    """
+    
+    def __init__(self):
+        self.started = datetime.now()
+        self.start_time = time.perf_counter()
+        self.phases = {}  # Name -> {'calls', 'seconds'}
+        self.counts = {}
+        self.lock = threading.Lock()
+    
+    def add_time(self, name, seconds):
+        """Add one call of seconds to a phase."""
+        with self.lock:
+            phase = self.phases.setdefault(name, {'calls': 0, 'seconds': 0.0})
+            phase['calls'] += 1
+            phase['seconds'] += seconds
+    
+    def count(self, name, amount=1):
+        """Increase a counter."""
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+    
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one call of a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+    
+    def report(self):
+        """Return the metrics as a JSON-serializable dict."""
+        with self.lock:
+            phases = {
+                name: {'calls': phase['calls'], 'seconds': round(phase['seconds'], 3)}
+                for name, phase in sorted(self.phases.items(), key=lambda item: -item[1]['seconds'])
+            }
+            counts = dict(sorted(self.counts.items()))
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'elapsed_seconds': round(time.perf_counter() - self.start_time, 3),
+            'phases': phases,
+            'counts': counts
+        }
+    
+    def write(self, filepath):
+        """Write the report to a JSON file and return its path."""
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return filepath
+
+@contextmanager
+def collecting(collector=None):
+    """Make a collector (a new one by default) active for the enclosed block."""
+    if collector is None:
+        collector = MetricsCollector()
+    token = _active.set(collector)
+    try:
+        yield collector
+    finally:
+        _active.reset(token)
+
+def active_collector():
+    """Return the active MetricsCollector, or None."""
+    return _active.get()
+
+def count(name, amount=1):
+    """Increase a counter of the active collector, if there is one."""
+    collector = _active.get()
+    if collector is not None:
+        collector.count(name, amount)
+
+def add_time(name, seconds):
+    """Add time to a phase of the active collector, if there is one."""
+    collector = _active.get()
+    if collector is not None:
+        collector.add_time(name, seconds)
+
+@contextmanager
+def phase(name):
+    """Time the enclosed block for the active collector, if there is one."""
+    collector = _active.get()
+    if collector is None:
+        yield
+        return
+    with collector.phase(name):
+        yield
+
+def timed(name):
+    """Decorator that times every call of a function as the phase name."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            collector = _active.get()
+            if collector is None:
+                return function(*args, **kwargs)
+            with collector.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
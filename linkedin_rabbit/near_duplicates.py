@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Near-Duplicate Detection
+
+This module flags posts that are almost identical to a post seen before, e.g.
+the same text with a truncated "...see more", a small edit or different
+whitespace. Each post gets a 64-bit SimHash fingerprint, and fingerprints are
+kept in a banded index, so a lookup only compares against the few posts that
+share a band instead of against every post seen so far.
+"""
+
+import re
+import hashlib
+
+FINGERPRINT_BITS = 64
+
+# Two posts are near-duplicates if their fingerprints differ in at most this
+# many bits. Larger values also catch bigger edits of short posts, but make
+# the bands narrower, so more unrelated posts have to be compared.
+DEFAULT_MAX_DISTANCE = 4
+
+# Largest supported distance: with more, the bands of NearDuplicateIndex would
+# be a single bit wide and the index would compare against nearly every post
+MAX_DISTANCE_LIMIT = FINGERPRINT_BITS // 2 - 1
+
+# Word pairs keep a one-word edit from changing too many features of a short post
+SHINGLE_SIZE = 2
+
+# Text that changes between two renderings of the same post
+TRUNCATION_PATTERN = re.compile(r'(?:…|\.\.\.)\s*(?:see\s+)?(?:more)?\s*$', re.IGNORECASE)
+WORD_PATTERN = re.compile(r'\w+')
+
+# A truncated preview is matched against the posts that start with the same
+# words; shorter previews are left to the fingerprints
+PREFIX_WORDS = 6
+
+def shingles(text):
+    """Return the overlapping word n-grams of a normalized text."""
+    text = TRUNCATION_PATTERN.sub('', text.strip())
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return words
+    return [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+def preview_words(text):
+    """Return the lowercased words of a text and whether it was truncated.
+    
+    The last word of a truncated text is dropped, as it may be cut in half.
+    """
+    text = text.strip()
+    stripped = TRUNCATION_PATTERN.sub('', text)
+    truncated = stripped != text
+    words = WORD_PATTERN.findall(stripped.lower())
+    return tuple(words[:-1] if truncated else words), truncated
+
+def simhash(text):
+    """Return the 64-bit SimHash fingerprint of a text, or None if it has no words."""
+    features = shingles(text)
+    if not features:
+        return None
+    
+    # Count the set bits of all feature hashes per position, column by column
+    hashes = [
+        format(int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big'), '064b')
+        for feature in features
+    ]
+    half = len(hashes) / 2
+    bits = ''.join('1' if column.count('1') > half else '0' for column in map(''.join, zip(*hashes)))
+    return int(bits, 2)
+
+def hamming_distance(a, b):
+    """Return the number of bits in which two fingerprints differ."""
+    return bin(a ^ b).count('1')
+
+class NearDuplicateIndex:
+    """Banded index of SimHash fingerprints.
+    
+    The 64 bits are split into max_distance + 1 bands. Two fingerprints that
+    differ in at most max_distance bits are equal in at least one band, so
+    only fingerprints sharing a band with the new one have to be compared.
+    
+    A short preview of a long post has a different fingerprint, so the words
+    of every text are also kept under their first PREFIX_WORDS words, and a
+    truncated text that is the start of another one counts as a duplicate.
+    """
+    
+    def __init__(self, max_distance=DEFAULT_MAX_DISTANCE):
+        if not 0 <= max_distance <= MAX_DISTANCE_LIMIT:
+            raise ValueError(f"max_distance must be between 0 and {MAX_DISTANCE_LIMIT}")
+        self.max_distance = max_distance
+        
+        # Bit ranges of the bands, as (shift, mask) pairs
+        band_count = max_distance + 1
+        band_width, extra = divmod(FINGERPRINT_BITS, band_count)
+        self.bands = []
+        shift = 0
+        for band in range(band_count):
+            width = band_width + (1 if band < extra else 0)
+            self.bands.append((shift, (1 << width) - 1))
+            shift += width
+        
+        self.buckets = {}
+        self.prefixes = {}  # First words -> [(words, truncated)]
+        self.size = 0
+    
+    def _keys(self, fingerprint):
+        return [(band, fingerprint >> shift & mask) for band, (shift, mask) in enumerate(self.bands)]
+    
+    def find(self, fingerprint):
+        """Return a stored fingerprint within max_distance bits, or None."""
+        for key in self._keys(fingerprint):
+            for candidate in self.buckets.get(key, ()):
+                if hamming_distance(candidate, fingerprint) <= self.max_distance:
+                    return candidate
+        return None
+    
+    def add(self, fingerprint):
+        """Store a fingerprint."""
+        for key in self._keys(fingerprint):
+            self.buckets.setdefault(key, []).append(fingerprint)
+        self.size += 1
+    
+    def find_prefix(self, words, truncated):
+        """Return True if one of two texts is a truncated start of the other."""
+        if len(words) < PREFIX_WORDS:
+            return False
+        for other, other_truncated in self.prefixes.get(words[:PREFIX_WORDS], ()):
+            if truncated and len(words) <= len(other) and other[:len(words)] == words:
+                return True
+            if other_truncated and len(other) <= len(words) and words[:len(other)] == other:
+                return True
+        return False
+    
+    def check(self, text):
+        """Return True if text is a near-duplicate of a stored text, otherwise store it.
+        
+        Texts without words (only emoji or punctuation) have no fingerprint;
+        they are never near-duplicates and are not stored.
+        """
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return False
+        words, truncated = preview_words(text)
+        if self.find_prefix(words, truncated) or self.find(fingerprint) is not None:
+            return True
+        self.add(fingerprint)
+        if len(words) >= PREFIX_WORDS:
+            self.prefixes.setdefault(words[:PREFIX_WORDS], []).append((words, truncated))
+        return False
+    
+    def __len__(self):
+        return self.size
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - PDF Renderer
+
+This module renders posts to a PDF file for the CLI and the Streamlit app.
+Pages are laid out one at a time and written to the file as soon as they are
+full, so memory use does not grow with the number of posts. Text is set in
+the standard Helvetica fonts (WinAnsi encoding), wrapped by its measured
+width using the font metrics that ship with fpdf.
+"""
+
+import os
+import zlib
+from datetime import datetime
+from fpdf.fonts import fpdf_charwidths
+from .records import Post
+from .sanitize import clean_pdf, emoji_to_text
+from . import metrics
+
+# A4 page in points, with margins and layout sizes in millimeters
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+MM = 72 / 25.4
+MARGIN = 10
+BOTTOM_MARGIN = 20
+CONTENT_WIDTH = PAGE_WIDTH / MM - 2 * MARGIN
+
+FOOTER_TEXT = "Generated by LinkedIn Rabbit | @tensor._.boy"
+
+# Resource names of the fonts used, in the order their objects are written
+FONTS = {
+    '': ('F1', 'Helvetica', 'helvetica'),
+    'B': ('F2', 'Helvetica-Bold', 'helveticaB'),
+    'I': ('F3', 'Helvetica-Oblique', 'helveticaI')
+}
+
+# Width of every byte of the encoding, in 1/1000 of the font size
+CHAR_WIDTHS = {
+    style: [fpdf_charwidths[metrics][chr(code)] for code in range(256)]
+    for style, (_, _, metrics) in FONTS.items()
+}
+
+def encode_text(text):
+    """Encode a line of text for the PDF fonts (cp1252, i.e. WinAnsi, with '?' for missing characters)."""
+    return clean_pdf(text).encode('cp1252', errors='replace')
+
+def escape_text(data):
+    """Escape an encoded string for a PDF text operator."""
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+def text_width(data, style='', size=12):
+    """Return the width of an encoded string in millimeters."""
+    return sum(map(CHAR_WIDTHS[style].__getitem__, data)) * size / 1000 / MM
+
+def wrap_text(data, max_width, style='', size=12):
+    """Split an encoded line into lines no wider than max_width millimeters.
+    
+    Lines are broken between words; a word wider than a whole line is
+    broken between characters.
+    """
+    widths = CHAR_WIDTHS[style]
+    limit = max_width * MM * 1000 / size
+    space = widths[32]
+    
+    lines = []
+    line = []
+    line_width = 0
+    for word in data.split(b' '):
+        word_width = sum(map(widths.__getitem__, word))
+        if line and line_width + space + word_width <= limit:
+            line.append(word)
+            line_width += space + word_width
+            continue
+        if line:
+            lines.append(b' '.join(line))
+        
+        # Break words that do not fit on a line of their own
+        while word_width > limit:
+            cut = 0
+            cut_width = 0
+            while cut < len(word) and cut_width + widths[word[cut]] <= limit:
+                cut_width += widths[word[cut]]
+                cut += 1
+            cut = max(cut, 1)
+            lines.append(word[:cut])
+            word = word[cut:]
+            word_width = sum(map(widths.__getitem__, word))
+        line = [word]
+        line_width = word_width
+    lines.append(b' '.join(line))
+    return lines
+
+class PDFWriter:
+    """Minimal PDF file writer that writes every page as soon as it is added.
+    
+    Only the byte offsets of the objects and the ids of the pages are kept
+    until close(), which writes the page tree, fonts and cross-reference table.
+    """
+    
+    # Fixed object numbers; pages start after them
+    PAGES_ID = 1
+    RESOURCES_ID = 2
+    FIRST_FONT_ID = 3
+    
+    def __init__(self, file, title=None):
+        self.file = file
+        self.title = title
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = self.FIRST_FONT_ID + len(FONTS)
+        self.file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    
+    def _write_object(self, object_id, body, stream=None):
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(f"{object_id} 0 obj\n".encode('ascii'))
+        self.file.write(body)
+        if stream is not None:
+            self.file.write(b'\nstream\n')
+            self.file.write(stream)
+            self.file.write(b'\nendstream')
+        self.file.write(b'\nendobj\n')
+    
+    def _new_id(self):
+        object_id = self.next_id
+        self.next_id += 1
+        return object_id
+    
+    def add_page(self, content):
+        """Write one page with the given content stream."""
+        stream = zlib.compress(content)
+        content_id = self._new_id()
+        self._write_object(content_id, f"<< /Filter /FlateDecode /Length {len(stream)} >>".encode('ascii'), stream)
+        
+        page_id = self._new_id()
+        self._write_object(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES_ID} 0 R /Resources {self.RESOURCES_ID} 0 R "
+            f"/MediaBox [0 0 {PAGE_WIDTH:.2f} {PAGE_HEIGHT:.2f}] /Contents {content_id} 0 R >>"
+        ).encode('ascii'))
+        self.page_ids.append(page_id)
+    
+    def close(self):
+        """Write the document structure and the cross-reference table."""
+        font_refs = []
+        for index, (name, base_font, _) in enumerate(FONTS.values()):
+            font_id = self.FIRST_FONT_ID + index
+            self._write_object(font_id, (
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} /Encoding /WinAnsiEncoding >>"
+            ).encode('ascii'))
+            font_refs.append(f"/{name} {font_id} 0 R")
+        self._write_object(self.RESOURCES_ID, f"<< /Font << {' '.join(font_refs)} >> >>".encode('ascii'))
+        
+        kids = ' '.join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self._write_object(self.PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode('ascii'))
+        
+        info_id = self._new_id()
+        info = b"<< /Producer (LinkedIn Rabbit)"
+        if self.title:
+            info += b" /Title (" + escape_text(encode_text(self.title)) + b")"
+        info += datetime.now().strftime(" /CreationDate (D:%Y%m%d%H%M%S)").encode('ascii') + b" >>"
+        self._write_object(info_id, info)
+        
+        catalog_id = self._new_id()
+        self._write_object(catalog_id, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode('ascii'))
+        
+        xref_offset = self.file.tell()
+        self.file.write(f"xref\n0 {self.next_id}\n0000000000 65535 f \n".encode('ascii'))
+        for object_id in range(1, self.next_id):
+            self.file.write(f"{self.offsets[object_id]:010d} 00000 n \n".encode('ascii'))
+        self.file.write((
+            f"trailer\n<< /Size {self.next_id} /Root {catalog_id} 0 R /Info {info_id} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode('ascii'))
+
+class PageLayout:
+    """Lays out lines of text top to bottom and starts a new page when one is full."""
+    
+    def __init__(self, writer):
+        self.writer = writer
+        self.operations = []
+        self.y = MARGIN
+        self.started = False
+    
+    def _start_page(self):
+        self.operations = []
+        self.y = MARGIN
+        self.started = True
+    
+    def finish_page(self):
+        """Add the footer and hand the page to the writer."""
+        if not self.started:
+            return
+        self.text(FOOTER_TEXT, 'I', 8, 10, align='C', y=PAGE_HEIGHT / MM - 15)
+        self.writer.add_page(b'\n'.join(self.operations))
+        self.started = False
+    
+    def ensure_space(self, height):
+        """Start a new page unless height millimeters still fit on this one."""
+        if not self.started:
+            self._start_page()
+        elif self.y + height > PAGE_HEIGHT / MM - BOTTOM_MARGIN:
+            self.finish_page()
+            self._start_page()
+    
+    def text(self, data, style, size, height, align='L', y=None):
+        """Draw one line of text in a row height millimeters high."""
+        if isinstance(data, str):
+            data = encode_text(data)
+        if y is None:
+            self.ensure_space(height)
+            y = self.y
+            self.y += height
+        
+        x = MARGIN
+        if align == 'C':
+            x = MARGIN + (CONTENT_WIDTH - text_width(data, style, size)) / 2
+        
+        # Vertically centered in the row, like fpdf's cell()
+        baseline = PAGE_HEIGHT - (y + height / 2 + 0.3 * size / MM) * MM
+        self.operations.append(
+            b'BT /' + FONTS[style][0].encode('ascii') + f" {size} Tf {x * MM:.2f} {baseline:.2f} Td (".encode('ascii')
+            + escape_text(data) + b') Tj ET'
+        )
+    
+    def paragraph(self, text, style, size, height):
+        """Draw text wrapped to the page width, one row per line."""
+        for line in text.split('\n'):
+            if not line.strip():
+                self.space(height / 2)
+                continue
+            for wrapped in wrap_text(encode_text(line), CONTENT_WIDTH, style, size):
+                self.text(wrapped, style, size, height)
+    
+    def rule(self):
+        """Draw a horizontal line across the page."""
+        self.ensure_space(0)
+        y = PAGE_HEIGHT - self.y * MM
+        self.operations.append(f"0.57 w {MARGIN * MM:.2f} {y:.2f} m {PAGE_WIDTH - MARGIN * MM:.2f} {y:.2f} l S".encode('ascii'))
+    
+    def space(self, height):
+        """Leave height millimeters of empty space."""
+        self.ensure_space(0)
+        self.y += height
+
+@metrics.timed('render_pdf')
+def render_pdf(posts, filepath, profile_name, username=None, count=None, extracted_on=None, emoji_text=False):
+    """Render posts to a PDF file and return its path.
+    
+    posts may be any iterable of Post records or scraper dicts (such as
+    read_jsonl) when count is given; it is consumed one post at a time.
+    With emoji_text, common emoji are written as text labels instead of '?'.
+    """
+    if extracted_on is None:
+        extracted_on = datetime.now()
+    if count is None:
+        count = len(posts)
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+    
+    with open(filepath, 'wb') as f:
+        writer = PDFWriter(f, title=f"LinkedIn Posts for: {profile_name}")
+        layout = PageLayout(writer)
+        
+        # Title
+        layout.text(f"LinkedIn Posts for: {profile_name}", 'B', 16, 10, align='C')
+        if username:
+            layout.text(f"LinkedIn Username: {username}", 'I', 14, 10, align='C')
+        layout.text(f"Extracted on: {extracted_on.strftime('%Y-%m-%d %H:%M:%S')}", '', 12, 10, align='C')
+        layout.text(f"Number of posts: {count}", '', 12, 10, align='C')
+        layout.rule()
+        layout.space(5)
+        
+        # Add posts
+        for idx, post in enumerate(posts, 1):
+            post = Post.from_dict(post)
+            
+            # Keep the heading of a post together with its first lines
+            layout.ensure_space(40)
+            layout.text(f"Post #{idx}", 'B', 14, 10)
+            layout.text(f"Date: {post.date}", 'I', 12, 8)
+            layout.text(f"Engagement: {post.engagement_text()}", 'I', 12, 8)
+            layout.space(3)
+            layout.paragraph(emoji_to_text(post.content) if emoji_text else post.content, '', 12, 6)
+            layout.space(5)
+            layout.rule()
+            layout.space(5)
+        
+        layout.finish_page()
+        writer.close()
+    
+    return filepath
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Post Records
+
+This module defines the typed post record and the structured output formats.
+Posts are exchanged as JSON Lines (one post per line) or Parquet files; the
+human-readable text file is rendered from the same records.
+"""
+
+import os
+import re
+import json
+import mmap
+import codecs
+import hashlib
+from datetime import datetime
+from .sanitize import clean_structured, clean_text
+from . import metrics
+
+# Columns of the structured outputs, in order
+POST_FIELDS = ('content', 'date', 'likes', 'comments', 'shares', 'timestamp')
+
+ENGAGEMENT_FIELDS = ('likes', 'comments', 'shares')
+
+# Lines of the text file format written by render_text
+TEXT_HEADER_END = "=" * 80 + "\n\n"
+POST_SEPARATOR = "\n\n" + "-" * 80 + "\n\n"
+POST_HEADING_PATTERN = re.compile(
+    r'^Post #(\d+)\n(?:Date: ([^\n]*)\n)?(?:Engagement: ([^\n]*)\n)?\n?',
+    re.MULTILINE
+)
+
+# The engagement line written by render_text; older files have the counters
+# as LinkedIn showed them ("1,234 likes", "Jane and 45 others likes",
+# "12 comments comments")
+ENGAGEMENT_NUMBERS_PATTERN = re.compile(r'(\d+) likes, (\d+) comments, (\d+) shares$')
+ENGAGEMENT_LINE_PATTERN = re.compile(r'(.*) likes, (.*) comments, (.*) shares\s*$')
+ENGAGEMENT_COUNT_PATTERNS = [re.compile(r'(\S+) ' + name) for name in ENGAGEMENT_FIELDS]
+
+# Characters decoded per read while parsing, and buffered ahead of a heading
+PARSE_BLOCK_SIZE = 64 * 1024
+HEADING_LOOKAHEAD = 1024
+
+# Text files at least this large are memory-mapped by read_posts
+MMAP_MIN_SIZE = 16 * 1024 * 1024
+
+# Matches counts like "1,234", "1.2K" or "3M"
+COUNT_PATTERN = re.compile(r'(\d+(?:[.,]\d+)*)\s*([KkMm]?)')
+
+def parse_count(value):
+    """Convert an engagement counter ("1,234", "1.2K", "12 reactions", 7) to an int."""
+    if isinstance(value, int):
+        return value
+    if not value:
+        return 0
+    match = COUNT_PATTERN.search(str(value))
+    if not match:
+        return 0
+    number, suffix = match.groups()
+    if suffix:
+        # "1.2K" uses the dot as decimal separator
+        multiplier = 1000 if suffix.lower() == 'k' else 1000000
+        return int(float(number.replace(',', '')) * multiplier)
+    return int(re.sub(r'[.,]', '', number))
+
+def parse_engagement_line(text):
+    """Return the likes, comments and shares of the text after "Engagement: "."""
+    match = ENGAGEMENT_NUMBERS_PATTERN.match(text)
+    if match:
+        return tuple(map(int, match.groups()))
+    match = ENGAGEMENT_LINE_PATTERN.match(text)
+    if match:
+        return tuple(parse_count(value) for value in match.groups())
+    counts = []
+    for pattern in ENGAGEMENT_COUNT_PATTERNS:
+        match = pattern.search(text)
+        counts.append(parse_count(match.group(1)) if match else 0)
+    return tuple(counts)
+
+class Post:
+    """One extracted post with numeric engagement counts."""
+    
+    __slots__ = POST_FIELDS
+    
+    def __init__(self, content, date="Unknown date", likes=0, comments=0, shares=0, timestamp=None):
+        self.content = content
+        self.date = date  # As shown on LinkedIn, e.g. "2w"
+        self.likes = likes
+        self.comments = comments
+        self.shares = shares
+        self.timestamp = timestamp  # ISO date and time resolved from date, or None
+    
+    @classmethod
+    def from_dict(cls, post):
+        """Build a record from a scraper dict ({'content', 'date', 'engagement'}) or a flat row."""
+        if isinstance(post, cls):
+            return post
+        engagement = post.get('engagement') or post
+        return cls(
+            clean_structured(post.get('content') or ""),
+            post.get('date') or "Unknown date",
+            *(parse_count(engagement.get(name)) for name in ENGAGEMENT_FIELDS),
+            timestamp=post.get('timestamp')
+        )
+    
+    def to_dict(self):
+        """Return the record as a flat row of the structured outputs."""
+        return {name: getattr(self, name) for name in POST_FIELDS}
+    
+    @property
+    def engagement(self):
+        """Engagement counts as a dict, in the shape the scraper returns them."""
+        return {name: getattr(self, name) for name in ENGAGEMENT_FIELDS}
+    
+    def engagement_text(self):
+        """Format the engagement counts for the text and PDF outputs."""
+        return f"{self.likes} likes, {self.comments} comments, {self.shares} shares"
+    
+    def __eq__(self, other):
+        if not isinstance(other, Post):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+    
+    def __repr__(self):
+        return f"Post(date={self.date!r}, likes={self.likes}, comments={self.comments}, shares={self.shares}, content={self.content[:40]!r})"
+
+def structured_path(filepath, fmt='jsonl'):
+    """Return the path of the structured file stored beside an output file."""
+    return os.path.splitext(filepath)[0] + '.' + fmt
+
+def unique_filepath(filepath):
+    """Return filepath, or filepath with a "_2", "_3", ... suffix if it or its JSONL file exists."""
+    base, extension = os.path.splitext(filepath)
+    suffix = 1
+    while os.path.exists(filepath) or os.path.exists(structured_path(filepath, 'jsonl')):
+        suffix += 1
+        filepath = f"{base}_{suffix}{extension}"
+    return filepath
+
+def render_text(posts, profile_name, username=None, extracted_on=None, count=None, emoji_text=False, start=1):
+    """Yield the text-file rendering of posts, chunk by chunk.
+    
+    posts may be any iterable (such as read_jsonl) when count is given.
+    With emoji_text, common emoji are written as text labels instead of '?'.
+    The first chunk is the header, then one chunk per post, numbered from start.
+    """
+    if extracted_on is None:
+        extracted_on = datetime.now()
+    if count is None:
+        count = len(posts)
+    
+    header = f"LinkedIn Posts for: {profile_name}\n"
+    if username:
+        header += f"LinkedIn Username: {username}\n"
+    header += f"Extracted on: {extracted_on.strftime('%Y-%m-%d %H:%M:%S')}\n"
+    header += f"Number of posts: {count}\n"
+    yield header + "=" * 80 + "\n\n"
+    
+    for idx, post in enumerate(posts, start):
+        # Replace any problematic characters
+        content = clean_text(post.content, emoji_text)
+        yield (
+            f"Post #{idx}\n"
+            f"Date: {post.date}\n"
+            f"Engagement: {post.engagement_text()}\n\n"
+            f"{content}\n"
+            "\n" + "-" * 80 + "\n\n"
+        )
+
+def write_jsonl(posts, filepath):
+    """Write posts to a JSON Lines file, one record per line."""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for post in posts:
+            f.write(json.dumps(Post.from_dict(post).to_dict(), ensure_ascii=False) + "\n")
+    return filepath
+
+def read_jsonl(filepath):
+    """Yield the posts of a JSON Lines file."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                # A line cut off by a crash in the middle of a write
+                break
+            if line.strip():
+                yield Post.from_dict(json.loads(line))
+
+class PostWriter:
+    """Append-only writer that makes every post durable as soon as it is extracted.
+    
+    Each post is appended to the JSONL file beside filepath, flushed and
+    fsynced. The JSONL file is created anew, so an earlier file of the same
+    name is replaced (see unique_filepath for picking a new name). Nothing is
+    held in memory, and a crash keeps every post written so far. close()
+    renders the text file from the JSONL file and writes the other structured
+    files in formats (e.g. 'parquet').
+    
+    A checkpoint file beside the output records that the file is being
+    written, and how to finish it, until close() completes; see
+    recover_post_files for finishing the files of an interrupted run. It is
+    not rewritten per post: the fsynced JSONL file is the source of truth for
+    the posts committed so far, and the post count is only recorded once the
+    output is complete.
+    
+    With durable=False, posts are only buffered and no checkpoint is kept,
+    for files that can simply be written again (such as merges).
+    """
+    
+    def __init__(self, filepath, profile_name, emoji_text=False, username=None, formats=('jsonl',), durable=True):
+        self.filepath = filepath
+        self.profile_name = profile_name
+        self.username = username  # Shown in the text file header
+        self.emoji_text = emoji_text  # Passed on to render_text
+        self.formats = tuple(formats)
+        self.durable = durable
+        self.jsonl_path = structured_path(filepath, 'jsonl')
+        self.checkpoint_path = structured_path(filepath, 'checkpoint.json')
+        self.count = 0
+        self.closed = False
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        self.file = open(self.jsonl_path, 'w', encoding='utf-8')
+        if durable:
+            self.save_checkpoint(complete=False)
+    
+    @metrics.timed('write_file')
+    def write(self, post):
+        """Append one post and, unless the writer is not durable, commit it to disk."""
+        self.file.write(json.dumps(Post.from_dict(post).to_dict(), ensure_ascii=False) + "\n")
+        if self.durable:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.count += 1
+    
+    def save_checkpoint(self, complete):
+        """Atomically record whether the output is complete and how to finish it."""
+        checkpoint = {
+            'profile_name': self.profile_name,
+            'username': self.username,
+            'emoji_text': self.emoji_text,
+            'formats': list(self.formats),
+            'pid': os.getpid(),
+            'complete': complete,
+            'updated': datetime.now().isoformat(timespec='seconds')
+        }
+        if complete:
+            checkpoint['posts'] = self.count
+        temp_path = self.checkpoint_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, self.checkpoint_path)
+    
+    @metrics.timed('write_file')
+    def close(self):
+        """Close the JSONL file, render the text file from it and return its path."""
+        if not self.closed:
+            self.closed = True
+            self.file.close()
+            finish_post_file(self.filepath, self.profile_name, self.username, self.emoji_text, self.formats, self.count)
+            if self.durable:
+                self.save_checkpoint(complete=True)
+            print(f"Posts saved to {self.filepath}")
+        return self.filepath
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def finish_post_file(filepath, profile_name, username=None, emoji_text=False, formats=('jsonl',), count=None):
+    """Render the text file and the structured files other than JSONL from the JSONL file beside filepath."""
+    jsonl_path = structured_path(filepath, 'jsonl')
+    if count is None:
+        count = count_posts(jsonl_path)
+    with open(filepath, 'w', encoding='utf-8', errors='ignore') as f:
+        for chunk in render_text(read_jsonl(jsonl_path), profile_name, username, count=count, emoji_text=emoji_text):
+            f.write(chunk)
+    if 'parquet' in formats:
+        try:
+            write_parquet(read_jsonl(jsonl_path), structured_path(filepath, 'parquet'))
+        except Exception as e:
+            print(f"Error saving posts as parquet: {e}")
+    return filepath
+
+def _writer_running(pid):
+    """Return True if the process that wrote a checkpoint may still be writing."""
+    if not pid:
+        return False
+    if pid == os.getpid():
+        return True
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+def recover_post_files(output_dir="output"):
+    """Finish the output files a crashed or killed run left behind; return their text files.
+    
+    Every checkpoint still marked incomplete belongs to a PostWriter that was
+    never closed (those of processes that are still running are left alone).
+    Its posts are the ones in the fsynced JSONL file: a line cut off in the
+    middle of a write is dropped, and the text file is rendered from the
+    posts committed before it.
+    """
+    recovered = []
+    try:
+        names = sorted(os.listdir(output_dir))
+    except OSError:
+        return recovered
+    
+    for name in names:
+        if not name.endswith('.checkpoint.json'):
+            continue
+        checkpoint_path = os.path.join(output_dir, name)
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading checkpoint {checkpoint_path}: {e}")
+            continue
+        if checkpoint.get('complete') or _writer_running(checkpoint.get('pid')):
+            continue
+        
+        filepath = checkpoint_path[:-len('.checkpoint.json')] + '.txt'
+        jsonl_path = structured_path(filepath, 'jsonl')
+        if not os.path.exists(jsonl_path):
+            os.remove(checkpoint_path)
+            continue
+        
+        # Drop a partly written last line
+        with open(jsonl_path, 'rb+') as f:
+            data = f.read()
+            f.truncate(data.rfind(b'\n') + 1)
+        
+        count = count_posts(jsonl_path)
+        finish_post_file(filepath, checkpoint.get('profile_name') or "LinkedIn_User", checkpoint.get('username'),
+                         checkpoint.get('emoji_text', False), checkpoint.get('formats', ('jsonl',)), count)
+        checkpoint.update(posts=count, complete=True, updated=datetime.now().isoformat(timespec='seconds'))
+        with open(checkpoint_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        print(f"Recovered {count} posts of an interrupted run to {filepath}")
+        recovered.append(filepath)
+    return recovered
+
+def merge_post_files(filepaths, filepath, profile_name, username=None):
+    """Merge the posts of several output files into one, skipping duplicates.
+    
+    Posts are streamed one at a time from each file into a buffered
+    PostWriter, so only one hash per post is kept in memory, whatever the
+    number of files. Posts are renumbered in order. Returns the PostWriter,
+    already closed.
+    """
+    content_hashes = set()
+    with PostWriter(filepath, profile_name, username=username, durable=False) as writer:
+        for source in filepaths:
+            for post in read_posts(source):
+                # Same hash as generate_content_hash, as a compact digest
+                content_hash = hashlib.md5(post.content.encode('utf-8')).digest()
+                if content_hash in content_hashes:
+                    continue
+                content_hashes.add(content_hash)
+                writer.write(post)
+    return writer
+
+def write_parquet(posts, filepath):
+    """Write posts to a Parquet file (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Writing Parquet files requires pyarrow: pip install pyarrow")
+    
+    columns = {name: [] for name in POST_FIELDS}
+    for post in posts:
+        post = Post.from_dict(post)
+        for name in POST_FIELDS:
+            columns[name].append(getattr(post, name))
+    
+    schema = pa.schema([
+        ('content', pa.string()),
+        ('date', pa.string()),
+        ('likes', pa.int64()),
+        ('comments', pa.int64()),
+        ('shares', pa.int64()),
+        ('timestamp', pa.string())
+    ])
+    pq.write_table(pa.table(columns, schema=schema), filepath)
+    return filepath
+
+def read_parquet(filepath):
+    """Yield the posts of a Parquet file (requires pyarrow)."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files requires pyarrow: pip install pyarrow")
+    
+    # Files written before a field was added simply lack its column
+    available = pq.read_schema(filepath).names
+    columns = [name for name in POST_FIELDS if name in available]
+    for row in pq.read_table(filepath, columns=columns).to_pylist():
+        yield Post(**row)
+
+def _text_blocks(file):
+    """Yield the decoded text of a binary file object or mmap in blocks, with newlines normalized."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    carry = ''
+    while True:
+        data = file.read(PARSE_BLOCK_SIZE)
+        text = carry + decoder.decode(data, final=not data)
+        
+        # Hold back a trailing '\r' until it is known whether '\n' follows
+        carry = ''
+        if data and text.endswith('\r'):
+            text, carry = text[:-1], '\r'
+        yield text.replace('\r\n', '\n')
+        if not data:
+            return
+
+def parse_text_posts(file):
+    """Yield the posts of a text file written by save_posts_to_file, one at a time.
+    
+    file is a file object opened in binary mode or an mmap; it is read in
+    blocks, so only the post being parsed is held in memory. A post ends at
+    its separator rule only when the next post's heading follows it (or the
+    file ends), so content containing rules of dashes, "Post #" lines or
+    blank lines is kept as written.
+    """
+    blocks = _text_blocks(file)
+    buffer = ''
+    position = 0
+    at_end = False
+    
+    def read_more():
+        nonlocal buffer, position, at_end
+        block = next(blocks, None)
+        if block is None:
+            at_end = True
+        else:
+            buffer = buffer[position:] + block
+            position = 0
+        return not at_end
+    
+    # Skip the header
+    while True:
+        header_end = buffer.find(TEXT_HEADER_END, position)
+        if header_end >= 0:
+            position = header_end + len(TEXT_HEADER_END)
+            break
+        position = max(position, len(buffer) - len(TEXT_HEADER_END))
+        if not read_more():
+            return
+    
+    while True:
+        # Make sure a whole heading is buffered before matching it
+        while not at_end and len(buffer) - position < HEADING_LOOKAHEAD:
+            read_more()
+        heading = POST_HEADING_PATTERN.search(buffer, position)
+        if not heading:
+            return
+        index, date, engagement = heading.groups()
+        
+        # Offsets from position, which moves when read_more() trims the buffer
+        position = heading.start()
+        start = searched = heading.end() - position
+        
+        # Content runs up to a separator followed by the next heading or the end of the file
+        separator = f"{POST_SEPARATOR}Post #{int(index) + 1}\n"
+        while True:
+            end = buffer.find(separator, position + searched)
+            if end >= 0 or at_end:
+                break
+            searched = max(start, len(buffer) - position - len(separator))
+            read_more()
+        start += position
+        
+        if end >= 0:
+            content = buffer[start:end]
+            position = end + len(POST_SEPARATOR)
+        elif buffer.endswith(POST_SEPARATOR, start):
+            content = buffer[start:len(buffer) - len(POST_SEPARATOR)]
+            position = len(buffer)
+        else:
+            # A file cut off in the middle of a post
+            content = buffer[start:].rstrip('\n')
+            position = len(buffer)
+        
+        # The content was already cleaned by render_text when the file was written
+        yield Post(
+            content, date if date is not None else "Unknown date",
+            *(parse_engagement_line(engagement) if engagement is not None else (0, 0, 0))
+        )
+
+def read_text_posts(filepath, use_mmap=False):
+    """Yield the posts of a text file (see parse_text_posts).
+    
+    With use_mmap, the file is memory-mapped instead of read through a
+    buffered file object, which is faster for large combined files.
+    """
+    with open(filepath, 'rb') as f:
+        if use_mmap and os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from parse_text_posts(mapped)
+        else:
+            yield from parse_text_posts(f)
+
+def read_posts(filepath):
+    """Yield the posts of an output file one at a time.
+    
+    .jsonl and .parquet files are read directly. For a text file the
+    structured file beside it is used when there is one, and the text is
+    only parsed as a fallback.
+    """
+    fmt = os.path.splitext(filepath)[1].lstrip('.').lower()
+    if fmt == 'jsonl':
+        return read_jsonl(filepath)
+    if fmt == 'parquet':
+        return read_parquet(filepath)
+    
+    sidecar = structured_path(filepath, 'jsonl')
+    if os.path.exists(sidecar):
+        return read_jsonl(sidecar)
+    return read_text_posts(filepath, use_mmap=os.path.getsize(filepath) >= MMAP_MIN_SIZE)
+
+def count_posts(filepath):
+    """Return the number of posts read_posts yields for an output file, without parsing them."""
+    fmt = os.path.splitext(filepath)[1].lstrip('.').lower()
+    if fmt != 'jsonl' and fmt != 'parquet' and os.path.exists(structured_path(filepath, 'jsonl')):
+        filepath, fmt = structured_path(filepath, 'jsonl'), 'jsonl'
+    if fmt == 'jsonl':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return sum(1 for line in f if line.endswith('\n') and line.strip())
+    return sum(1 for _ in read_posts(filepath))
+
+def load_posts(filepath):
+    """Load the posts of an output file as a list of Post records (see read_posts)."""
+    return list(read_posts(filepath))
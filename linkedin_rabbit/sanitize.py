@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - Text Sanitization
+
+This module cleans post text for the different outputs with precompiled
+regular expressions (and str.replace for single characters), so no output
+loops over the characters of a post in Python. Emoji can optionally be written as short
+text labels instead of being replaced with '?'.
+"""
+
+import re
+
+# Common emoji in LinkedIn posts and the text written in their place
+EMOJI_TEXT = {
+    '🚀': '[rocket]', '🎉': '[party]', '🔥': '[fire]', '💡': '[idea]', '✅': '[check]',
+    '❌': '[x]', '👉': '->', '👈': '<-', '👇': '[down]', '👆': '[up]', '➡': '->',
+    '⬅': '<-', '⬇': '[down]', '⬆': '[up]', '📈': '[chart up]', '📉': '[chart down]',
+    '📊': '[chart]', '💪': '[strong]', '🤝': '[handshake]', '👏': '[clap]', '🙏': '[thanks]',
+    '👍': '[thumbs up]', '👎': '[thumbs down]', '❤': '<3', '💙': '<3', '💚': '<3',
+    '😀': ':D', '😃': ':D', '😄': ':D', '😁': ':D', '😊': ':)', '🙂': ':)', '😉': ';)',
+    '😂': '[laughing]', '🤣': '[laughing]', '😍': '[heart eyes]', '🤔': '[thinking]',
+    '😢': ':(', '😭': ':(', '🙌': '[hooray]', '⭐': '*', '🌟': '*', '✨': '*', '💯': '[100]',
+    '🎯': '[target]', '📢': '[announcement]', '📣': '[announcement]', '🔗': '[link]',
+    '📌': '[pin]', '📍': '[pin]', '💼': '[work]', '🏆': '[trophy]', '🥇': '[1st]',
+    '🎓': '[graduation]', '📚': '[books]', '📝': '[note]', '💻': '[laptop]', '🤖': '[robot]',
+    '🌍': '[globe]', '🌎': '[globe]', '🌏': '[globe]', '⚡': '[lightning]', '🔑': '[key]',
+    '👀': '[eyes]', '🧵': '[thread]', '⏰': '[clock]', '🗓': '[calendar]', '📅': '[calendar]',
+    '☕': '[coffee]', '🎁': '[gift]', '💰': '[money]', '🤯': '[mind blown]', '🥳': '[party]',
+    '✔': '[check]', '☑': '[check]'
+}
+
+# Characters that can be emoji: everything outside the Basic Multilingual
+# Plane plus the arrow, technical, symbol and dingbat blocks. Matching ranges
+# is much faster than matching a class of individual emoji.
+EMOJI_CANDIDATES = re.compile('[\U00010000-\U0010ffff\u2190-\u21ff\u2300-\u23ff\u2600-\u27bf\u2b00-\u2bff]')
+
+# Characters outside the Basic Multilingual Plane (mostly emoji)
+ASTRAL_CHARACTERS = re.compile('[\U00010000-\U0010ffff]')
+
+# Control characters other than tab and newline, and unpaired surrogates
+# (which cannot be encoded as UTF-8)
+UNPRINTABLE = re.compile('[\x00-\x08\x0b-\x1f\x7f\ud800-\udfff]')
+
+# The same, plus zero-width joiners, variation selectors and skin tones,
+# which only modify the emoji before them
+UNPRINTABLE_AND_MODIFIERS = re.compile('[\x00-\x08\x0b-\x1f\x7f\ud800-\udfff\u200d\ufe0e\ufe0f\U0001f3fb-\U0001f3ff]')
+
+def _emoji_label(match):
+    emoji = match.group()
+    return EMOJI_TEXT.get(emoji, emoji)
+
+def emoji_to_text(text):
+    """Replace the emoji of EMOJI_TEXT with their text labels."""
+    return EMOJI_CANDIDATES.sub(_emoji_label, UNPRINTABLE_AND_MODIFIERS.sub('', text))
+
+def clean_structured(text):
+    """Clean text for the structured outputs: full Unicode, minus control characters and lone surrogates."""
+    return UNPRINTABLE.sub('', text)
+
+def clean_text(text, emoji_text=False):
+    """Clean text for the text file: characters outside the BMP become '?' (or a label with emoji_text)."""
+    text = emoji_to_text(text) if emoji_text else UNPRINTABLE_AND_MODIFIERS.sub('', text)
+    return ASTRAL_CHARACTERS.sub('?', text)
+
+def clean_pdf(text, emoji_text=False):
+    """Clean text for the PDF fonts; characters missing from cp1252 become '?' when encoded."""
+    text = emoji_to_text(text) if emoji_text else UNPRINTABLE_AND_MODIFIERS.sub('', text)
+    return text.replace('\t', ' ')
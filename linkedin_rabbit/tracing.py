@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Rabbit - WebDriver Round-Trip Tracer
+
+Every WebDriver command is an HTTP round trip to chromedriver, and those
+round trips are most of a scrape's latency. This module records each
+command the driver and its elements send (find_elements, execute_script,
+.text, current_url, clicks, ...), with its latency and the scraper
+function that issued it.
+
+The recording can be exported as a Chrome trace-event file (open it in
+chrome://tracing or https://ui.perfetto.dev) and summarized per function,
+e.g. to see how many current_url round trips a run spends in find_post_elements.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter
+
+_THIS_FILE = os.path.abspath(__file__)
+_SKIPPED_FILES = (_THIS_FILE, os.path.join(os.path.dirname(_THIS_FILE), 'metrics.py'))
+
+# Comprehensions and lambdas are attributed to the function they are in
+_ANONYMOUS_SCOPES = ('<listcomp>', '<dictcomp>', '<setcomp>', '<genexpr>', '<lambda>')
+
+# Longest script or selector kept in the details of a traced command
+DETAIL_LENGTH = 80
+
+def _selenium_dir():
+    try:
+        import selenium
+    except ImportError:
+        return None
+    return os.path.dirname(os.path.abspath(selenium.__file__))
+
+class DriverTracer:
+    """Records the WebDriver commands of one driver.
+    
+    attach() wraps the driver's execute(), which every command of the
+    driver and of the WebElements it returns goes through, so elements
+    need no wrapping of their own and isinstance checks keep working.
+    """
+    
+    def __init__(self):
+        self.commands = []  # (command, caller, location, start, end, detail, thread id)
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.driver = None
+        self.selenium_dir = _selenium_dir()
+    
+    def attach(self, driver):
+        """Start recording the commands of a driver and return the tracer."""
+        execute = driver.execute
+        
+        def traced_execute(driver_command, params=None):
+            caller, location = self._caller()
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                end = time.perf_counter()
+                with self.lock:
+                    self.commands.append((driver_command, caller, location, start, end, self._detail(params), threading.get_ident()))
+        
+        driver.execute = traced_execute
+        self.driver = driver
+        return self
+    
+    def detach(self):
+        """Stop recording; the recorded commands are kept."""
+        if self.driver is not None and 'execute' in vars(self.driver):
+            del self.driver.execute
+        self.driver = None
+    
+    def _caller(self):
+        """Return the name and file:line of the innermost function outside selenium and this module."""
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            name = frame.f_code.co_name
+            if (filename not in _SKIPPED_FILES and not (self.selenium_dir and filename.startswith(self.selenium_dir))
+                    and name not in _ANONYMOUS_SCOPES):
+                return name, f"{os.path.basename(filename)}:{frame.f_lineno}"
+            frame = frame.f_back
+        return '<unknown>', ''
+    
+    @staticmethod
+    def _detail(params):
+        """Return the script or selector of a command, shortened, or None."""
+        if not isinstance(params, dict):
+            return None
+        detail = params.get('script') or params.get('value')
+        if not isinstance(detail, str):
+            return None
+        detail = ' '.join(detail.split())
+        return detail if len(detail) <= DETAIL_LENGTH else detail[:DETAIL_LENGTH - 3] + '...'
+    
+    def __len__(self):
+        return len(self.commands)
+    
+    def trace_events(self):
+        """Return the recorded commands as Chrome trace events (complete events, in microseconds)."""
+        pid = os.getpid()
+        with self.lock:
+            commands = list(self.commands)
+        events = []
+        for command, caller, location, start, end, detail, thread_id in commands:
+            args = {'caller': caller, 'location': location}
+            if detail:
+                args['detail'] = detail
+            events.append({
+                'name': command,
+                'cat': 'webdriver',
+                'ph': 'X',
+                'ts': round((start - self.origin) * 1e6, 1),
+                'dur': round((end - start) * 1e6, 1),
+                'pid': pid,
+                'tid': thread_id,
+                'args': args
+            })
+        return events
+    
+    def write_trace(self, filepath):
+        """Write a Chrome trace-event JSON file, with the per-function summary as metadata."""
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({
+                'traceEvents': self.trace_events(),
+                'displayTimeUnit': 'ms',
+                'otherData': {'summary': self.summary()}
+            }, f)
+        return filepath
+    
+    def summary(self):
+        """Return one row per calling function, the most expensive first.
+        
+        Each row has the function, the number of commands, their total and
+        mean latency in milliseconds and the count of each command.
+        """
+        rows = {}
+        with self.lock:
+            commands = list(self.commands)
+        for command, caller, _, start, end, _, _ in commands:
+            row = rows.setdefault(caller, {'function': caller, 'calls': 0, 'total_ms': 0.0, 'commands': Counter()})
+            row['calls'] += 1
+            row['total_ms'] += (end - start) * 1000
+            row['commands'][command] += 1
+        
+        summary = []
+        for row in sorted(rows.values(), key=lambda row: -row['total_ms']):
+            summary.append({
+                'function': row['function'],
+                'calls': row['calls'],
+                'total_ms': round(row['total_ms'], 1),
+                'mean_ms': round(row['total_ms'] / row['calls'], 2),
+                'commands': dict(row['commands'].most_common())
+            })
+        return summary
+    
+    def format_summary(self):
+        """Return the per-function summary as a text table."""
+        lines = [f"{'function':<32} {'calls':>6} {'total ms':>10} {'mean ms':>8}  commands"]
+        total_calls = 0
+        total_ms = 0.0
+        for row in self.summary():
+            commands = ', '.join(f"{name} x{count}" for name, count in row['commands'].items())
+            lines.append(f"{row['function'][:32]:<32} {row['calls']:>6} {row['total_ms']:>10.1f} {row['mean_ms']:>8.2f}  {commands}")
+            total_calls += row['calls']
+            total_ms += row['total_ms']
+        lines.append(f"{'total':<32} {total_calls:>6} {total_ms:>10.1f}")
+        return '\n'.join(lines)
@@ -28,6 +28,8 @@ setup(
         "fpdf>=1.7.2",
         "tqdm>=4.66.1",
         "python-dotenv>=1.0.0",
+        "lxml>=4.9.0",
+        "cssselect>=1.2.0",
     ],
     entry_points={
         "console_scripts": [
@@ -0,0 +1,96 @@
+"""Tests of the offline extractor (extract_posts_from_html) on saved page sources."""
+
+from pathlib import Path
+
+import pytest
+from lxml import html as lxml_html
+
+from linkedin_rabbit.html_extractor import (extract_posts_from_html, extract_posts_from_file, extract_posts_from_directory,
+                                            collect_valid_posts, inner_text)
+from linkedin_rabbit.linkedin_rabbit import REPOST_MARKER, NO_CONTENT_MARKER
+from linkedin_rabbit.near_duplicates import NearDuplicateIndex
+from linkedin_rabbit.records import Post
+
+FIXTURES = Path(__file__).parent / "fixtures"
+FEED = FIXTURES / "profile_feed.html"
+FEED_EXPANDED = FIXTURES / "profile_feed_expanded.html"
+
+@pytest.fixture(scope="module")
+def feed():
+    return extract_posts_from_html(FEED.read_text(encoding="utf-8"))
+
+def by_urn(records, urn):
+    """Return the first record with the given urn."""
+    return next(record for record in records if record['urn'] == urn)
+
+def test_expanded_post(feed):
+    record = by_urn(feed, "urn:li:activity:7001")
+    assert record['content'] == ("Shipping the new release today.\n\n"
+                                 "Thanks to everyone who\ntested the betas and sent & fixed bugs.")
+    assert record['date'] == "2w"
+    assert not record['is_repost']
+
+def test_truncated_post_keeps_preview(feed):
+    record = by_urn(feed, "urn:li:activity:7002")
+    assert record['content'] == "Five lessons from ten years of running a small team. First, hire for…"
+    assert record['date'] == "3mo"
+
+def test_engagement_counters(feed):
+    assert Post.from_dict(by_urn(feed, "urn:li:activity:7001")).engagement == {'likes': 1234, 'comments': 56, 'shares': 7}
+    assert Post.from_dict(by_urn(feed, "urn:li:activity:7002")).engagement == {'likes': 1200, 'comments': 3, 'shares': 0}
+
+def test_legacy_markup_falls_back_to_post_text(feed):
+    # No content or counter classes: the text is cleaned of date and engagement lines
+    record = next(record for record in feed if record['urn'] is None and record['content'] != NO_CONTENT_MARKER)
+    assert record['content'] == "Plain markup from an older layout.\nSecond paragraph."
+    assert record['date'] == "Unknown date"
+    assert record['engagement'] == {'likes': "12", 'comments': "4", 'shares': "2"}
+
+@pytest.mark.parametrize("urn", ["urn:li:activity:7003", "urn:li:activity:7004"])
+def test_reposts(feed, urn):
+    record = by_urn(feed, urn)
+    assert record['is_repost']
+    assert record['content'] == REPOST_MARKER
+
+def test_empty_placeholder(feed):
+    assert feed[-1] == {'content': NO_CONTENT_MARKER, 'date': "Unknown date",
+                        'engagement': {'likes': "0", 'comments': "0", 'shares': "0"}, 'is_repost': False, 'urn': None}
+
+def test_page_order_and_nested_wrappers(feed):
+    # The wrapper and the post inside it both match the profile selector
+    assert [record['urn'] for record in feed] == [
+        "urn:li:activity:7001", "urn:li:activity:7001", "urn:li:activity:7002",
+        "urn:li:activity:7003", "urn:li:activity:7004", None, None
+    ]
+
+def test_company_selector():
+    records = extract_posts_from_file(FEED, company=True)
+    assert [record['urn'] for record in records] == [
+        "urn:li:activity:7001", "urn:li:activity:7002", "urn:li:activity:7003", "urn:li:activity:7004", None
+    ]
+
+@pytest.mark.parametrize("source", ["", "   \n", "<html><body><p>No posts</p></body></html>"])
+def test_pages_without_posts(source):
+    assert extract_posts_from_html(source) == []
+
+def test_inner_text_skips_hidden_elements():
+    element = lxml_html.fromstring('<div>a<script>x</script><span hidden>b</span> c<br>d<p>e</p></div>')
+    assert inner_text(element) == "a c\nd\ne"
+
+def test_collect_valid_posts_across_snapshots():
+    results = extract_posts_from_directory(str(FIXTURES), max_workers=1)
+    assert [Path(filepath).name for filepath, _ in results] == [FEED.name, FEED_EXPANDED.name]
+    
+    # Without a near-duplicate index the expanded copy of the truncated post is kept
+    contents = [post['content'] for post in collect_valid_posts(results)]
+    assert len(contents) == 5
+    assert sum(content.startswith("Five lessons") for content in contents) == 2
+    
+    # With one, it is recognized as the same post
+    contents = [post['content'] for post in collect_valid_posts(results, near_duplicates=NearDuplicateIndex())]
+    assert contents == [
+        "Shipping the new release today.\n\nThanks to everyone who\ntested the betas and sent & fixed bugs.",
+        "Five lessons from ten years of running a small team. First, hire for…",
+        "Plain markup from an older layout.\nSecond paragraph.",
+        "An older post further down the feed."
+    ]
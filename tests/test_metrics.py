@@ -0,0 +1,84 @@
+"""Tests of the run metrics (MetricsCollector, collecting and metrics.timed)."""
+
+import json
+import threading
+
+from linkedin_rabbit import metrics
+from linkedin_rabbit.metrics import MetricsCollector, collecting
+
+def test_collector_adds_up_phases_and_counts():
+    collector = MetricsCollector()
+    collector.add_time('scroll', 1.5)
+    collector.add_time('scroll', 0.25)
+    collector.add_time('login', 3.0)
+    collector.count('posts_loaded', 10)
+    collector.count('posts_loaded')
+    with collector.phase('extract'):
+        pass
+    
+    report = collector.report()
+    assert list(report['phases']) == ['login', 'scroll', 'extract']  # Most expensive first
+    assert report['phases']['scroll'] == {'calls': 2, 'seconds': 1.75}
+    assert report['phases']['extract']['calls'] == 1
+    assert report['counts'] == {'posts_loaded': 11}
+    assert report['elapsed_seconds'] >= 0
+
+def test_write(tmp_path):
+    collector = MetricsCollector()
+    collector.count('scrolls', 3)
+    filepath = collector.write(str(tmp_path / "metrics.json"))
+    assert json.loads(open(filepath, encoding='utf-8').read())['counts'] == {'scrolls': 3}
+
+def test_reporting_without_a_collector_is_a_no_op():
+    assert metrics.active_collector() is None
+    metrics.count('scrolls')
+    metrics.add_time('scroll', 1.0)
+    with metrics.phase('scroll'):
+        pass
+
+def test_collecting_activates_a_collector_for_the_block():
+    with collecting() as outer:
+        metrics.count('scrolls')
+        with collecting() as inner:
+            assert metrics.active_collector() is inner
+            metrics.count('scrolls', 5)
+        assert metrics.active_collector() is outer
+        with metrics.phase('extract'):
+            pass
+    assert metrics.active_collector() is None
+    assert outer.counts == {'scrolls': 1}
+    assert inner.counts == {'scrolls': 5}
+    assert outer.phases['extract']['calls'] == 1
+
+def test_collector_is_not_shared_with_other_threads():
+    seen = []
+    with collecting():
+        thread = threading.Thread(target=lambda: seen.append(metrics.active_collector()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
+
+def test_timed():
+    @metrics.timed('extract')
+    def extract(value, scale=1):
+        """Extract a value."""
+        return value * scale
+    
+    assert extract.__name__ == 'extract' and extract.__doc__ == "Extract a value."
+    assert extract(2) == 2
+    with collecting() as collector:
+        assert extract(2, scale=3) == 6
+        extract(1)
+    assert collector.phases['extract']['calls'] == 2
+
+def test_timed_records_failed_calls():
+    @metrics.timed('login')
+    def login():
+        raise RuntimeError("no network")
+    
+    with collecting() as collector:
+        try:
+            login()
+        except RuntimeError:
+            pass
+    assert collector.phases['login']['calls'] == 1
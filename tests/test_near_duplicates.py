@@ -0,0 +1,57 @@
+"""Tests of the near-duplicate detection."""
+
+import pytest
+
+from linkedin_rabbit.near_duplicates import NearDuplicateIndex, simhash, preview_words, MAX_DISTANCE_LIMIT
+
+LONG_POST = ("Excited to announce that our team just launched the new data platform. "
+             "It took eighteen months of engineering work, hundreds of customer interviews "
+             "and more coffee than I would like to admit. Thanks to everyone who helped!")
+
+def test_exact_and_reformatted_copies():
+    index = NearDuplicateIndex()
+    assert not index.check(LONG_POST)
+    assert index.check(LONG_POST)
+    assert index.check("  " + LONG_POST.upper().replace(". ", ".\n\n") + "  ")
+    assert len(index) == 1
+
+def test_full_text_with_see_more():
+    index = NearDuplicateIndex()
+    assert not index.check(LONG_POST)
+    assert index.check(LONG_POST + "…see more")
+
+@pytest.mark.parametrize('marker', ["…see more", "... see more", "…more", "…"])
+def test_truncated_preview(marker):
+    preview = LONG_POST[:60] + marker
+    index = NearDuplicateIndex()
+    assert not index.check(LONG_POST)
+    assert index.check(preview)
+    
+    # And the other way round: the preview was seen first
+    index = NearDuplicateIndex()
+    assert not index.check(preview)
+    assert index.check(LONG_POST)
+
+def test_different_posts_with_the_same_start():
+    index = NearDuplicateIndex()
+    assert not index.check("Excited to announce that our team just launched the new mobile app for everyone.")
+    assert not index.check("Excited to announce that our team just hired three new engineers in Berlin.")
+
+@pytest.mark.parametrize('first, second', [("🚀🚀🚀", "🎉🎉"), ("!!!", "!!!"), ("", "🙏")])
+def test_featureless_texts_are_never_duplicates(first, second):
+    assert simhash(first) is None
+    index = NearDuplicateIndex()
+    assert not index.check(first)
+    assert not index.check(second)
+    assert len(index) == 0
+
+def test_preview_words():
+    assert preview_words("Hello big wor…see more") == (("hello", "big"), True)
+    assert preview_words("Hello big world") == (("hello", "big", "world"), False)
+
+def test_supported_distances():
+    assert len(NearDuplicateIndex(0).bands) == 1
+    assert len(NearDuplicateIndex(MAX_DISTANCE_LIMIT).bands) == MAX_DISTANCE_LIMIT + 1
+    for distance in (-1, MAX_DISTANCE_LIMIT + 1, 64):
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(distance)
@@ -0,0 +1,39 @@
+"""Tests of the text measuring and wrapping of the PDF renderer."""
+
+import pytest
+
+from linkedin_rabbit.pdf_renderer import CHAR_WIDTHS, MM, encode_text, escape_text, text_width, wrap_text
+
+def test_escape_text():
+    assert escape_text(b"plain") == b"plain"
+    assert escape_text(b"(a) \\ b") == b"\\(a\\) \\\\ b"
+
+def test_text_width():
+    assert text_width(b"") == 0
+    assert text_width(b"W") == pytest.approx(CHAR_WIDTHS[''][ord('W')] * 12 / 1000 / MM)
+    assert text_width(b"iiii") < text_width(b"WWWW")
+    assert text_width(b"word", size=24) == pytest.approx(2 * text_width(b"word"))
+    assert text_width(b"word", style='B') > text_width(b"word")
+
+def test_short_line_is_not_wrapped():
+    assert wrap_text(b"a short line", 100) == [b"a short line"]
+    assert wrap_text(b"", 100) == [b""]
+
+@pytest.mark.parametrize('style, size', [('', 12), ('B', 12), ('I', 8)])
+def test_wrapped_lines_fit_and_keep_the_words(style, size):
+    data = encode_text("Thanks to everyone who tested the betas, sent feedback and fixed bugs. " * 20)
+    lines = wrap_text(data, 60, style, size)
+    assert len(lines) > 1
+    assert all(text_width(line, style, size) <= 60 for line in lines)
+    assert b' '.join(lines).split() == data.split()
+
+def test_long_word_is_broken_between_characters():
+    word = b"x" * 200
+    lines = wrap_text(b"see " + word, 30)
+    assert lines[0] == b"see"
+    assert b''.join(lines[1:]) == word
+    assert all(text_width(line) <= 30 for line in lines)
+
+def test_encode_text_uses_the_pdf_encoding():
+    assert encode_text("café – “quoted”") == "café – “quoted”".encode('cp1252')
+    assert encode_text("tab\there 🦄") == b"tab here ?"
@@ -0,0 +1,84 @@
+"""Tests of post date resolution (resolve_post_date) and the --since cutoff of iter_posts."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from linkedin_rabbit import linkedin_rabbit as lr
+from linkedin_rabbit.linkedin_rabbit import ScrapeSession, YieldTracker, iter_posts, resolve_post_date, OLD_RUN_LIMIT
+
+NOW = datetime(2024, 6, 30, 12, 0)
+PROFILE = "https://www.linkedin.com/in/jane/"
+
+@pytest.mark.parametrize('text, expected', [
+    ("now", NOW),
+    ("45s", NOW - timedelta(seconds=45)),
+    ("5m", NOW - timedelta(minutes=5)),
+    ("3h", NOW - timedelta(hours=3)),
+    ("1d", NOW - timedelta(days=1)),
+    ("2w", NOW - timedelta(weeks=2)),
+    ("3mo", NOW - timedelta(days=90)),
+    ("1yr", NOW - timedelta(days=365)),
+    ("2 weeks", NOW - timedelta(weeks=2)),
+    ("3mo • Edited", NOW - timedelta(days=90)),
+    ("2024-01-31", datetime(2024, 1, 31)),
+    ("Jan 5, 2024", datetime(2024, 1, 5)),
+    ("5 January 2024", datetime(2024, 1, 5))
+])
+def test_resolve_post_date(text, expected):
+    assert resolve_post_date(text, NOW) == expected
+
+@pytest.mark.parametrize('text', ["", None, "Unknown date", "5 parsecs", "yesterday"])
+def test_unrecognized_dates(text):
+    assert resolve_post_date(text, NOW) is None
+
+class StubDriver:
+    """A driver whose feed holds one post element per date, all rendered at once."""
+    
+    current_url = PROFILE + "recent-activity/all/"
+    
+    def __init__(self, dates):
+        self.posts = [{'repost': False, 'content': [f"post {index}"], 'date': [date], 'likes': ["1"], 'comments': [],
+                       'shares': [], 'text': f"post {index}", 'urn': None} for index, date in enumerate(dates)]
+    
+    def find_elements(self, by, selector):
+        return list(self.posts)
+    
+    def execute_script(self, script, *args):
+        if script == lr.BULK_EXTRACT_SCRIPT:
+            return args[0]
+        if "scrollHeight" in script:
+            return 1000
+        return None
+
+def open_session(dates):
+    """Return a logged-in session with the stub feed of the given dates open."""
+    session = ScrapeSession("user", "password")
+    session.driver = StubDriver(dates)
+    session.logged_in = True
+    session.profile_url, session.profile_name = PROFILE, "Jane"
+    session.yield_tracker = YieldTracker()
+    return session
+
+def scrape(dates, since, num_posts=10):
+    """Return the dates of the posts iter_posts yields from a feed with the given dates, without scrolling."""
+    return [post['date'] for post in iter_posts(open_session(dates), PROFILE, num_posts, max_attempts=0, since=since)]
+
+@pytest.fixture(autouse=True)
+def no_delays(monkeypatch):
+    monkeypatch.setattr(lr, 'DELAY_SCALE', 0)
+
+def test_since_skips_older_posts():
+    since = datetime.now() - timedelta(days=30)
+    # A single older post (e.g. a pinned one) is skipped and scraping goes on
+    assert scrape(["1d", "3mo", "2w", "Unknown date"], since) == ["1d", "2w", "Unknown date"]
+
+def test_since_stops_at_a_run_of_older_posts():
+    since = datetime.now() - timedelta(days=30)
+    dates = ["1d", "2w"] + [f"{months}mo" for months in range(2, 2 + OLD_RUN_LIMIT)] + ["3d"]
+    assert scrape(dates, since) == ["1d", "2w"]
+
+def test_yielded_posts_carry_their_timestamp():
+    post = next(iter_posts(open_session(["1d"]), PROFILE, 1))
+    timestamp = datetime.fromisoformat(post['timestamp'])
+    assert abs(timestamp - (datetime.now() - timedelta(days=1))) < timedelta(minutes=1)
@@ -0,0 +1,165 @@
+"""Round-trip tests of the text output format (render_text and parse_text_posts)."""
+
+import io
+import os
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from linkedin_rabbit import records
+from linkedin_rabbit.records import (Post, PostWriter, render_text, parse_text_posts, read_text_posts, read_posts,
+                                    parse_engagement_line, parse_count, recover_post_files, merge_post_files,
+                                    count_posts, structured_path, unique_filepath)
+
+# Lines that look like parts of the format, to be kept as content
+TRICKY_LINES = [
+    "hello world", "", "-" * 80, "=" * 80, "Post #2", "Post #3", "Date: 1d",
+    "Engagement: 1 likes, 2 comments, 3 shares", "  spaced  ", "café ’ é €",
+    "\t tab", "x" * 300, "LinkedIn Posts for: someone", "Number of posts: 3"
+]
+
+def random_posts(rng):
+    """Return up to six posts built from TRICKY_LINES."""
+    return [
+        Post('\n'.join(rng.choice(TRICKY_LINES) for _ in range(rng.randint(0, 6))),
+             rng.choice(["1d", "2w", "3mo • Edited", "Unknown date"]),
+             rng.randint(0, 99999), rng.randint(0, 999), rng.randint(0, 99))
+        for _ in range(rng.randint(0, 6))
+    ]
+
+def rendered(posts, newline='\n', **options):
+    """Return the text file of posts as bytes."""
+    return ''.join(render_text(posts, "Profile", **options)).replace('\n', newline).encode('utf-8')
+
+@pytest.mark.parametrize('block_size', [1, 7, 64, records.PARSE_BLOCK_SIZE])
+@pytest.mark.parametrize('seed', range(40))
+def test_round_trip(seed, block_size, monkeypatch):
+    monkeypatch.setattr(records, 'PARSE_BLOCK_SIZE', block_size)
+    rng = random.Random(seed)
+    for _ in range(10):
+        posts = random_posts(rng)
+        newline = rng.choice(['\n', '\r\n'])
+        data = rendered(posts, newline, username=rng.choice([None, "user"]))
+        assert list(parse_text_posts(io.BytesIO(data))) == posts
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_read_text_posts(tmp_path, use_mmap):
+    posts = random_posts(random.Random(3)) + [Post("last post", "5h", 1, 2, 3)]
+    filepath = tmp_path / "posts.txt"
+    filepath.write_bytes(rendered(posts))
+    assert list(read_text_posts(str(filepath), use_mmap=use_mmap)) == posts
+
+def test_empty_file(tmp_path):
+    filepath = tmp_path / "empty.txt"
+    filepath.write_bytes(b"")
+    assert list(read_text_posts(str(filepath), use_mmap=True)) == []
+
+def test_content_is_cleaned_like_the_text_file():
+    posts = [Post("rocket 🚀 launch\x07", "1d", 1, 0, 0)]
+    assert [post.content for post in parse_text_posts(io.BytesIO(rendered(posts)))] == ["rocket ? launch"]
+
+def test_cut_off_file():
+    data = rendered([Post("first", "1d", 1, 2, 3), Post("second post", "2d", 4, 5, 6)])
+    parsed = list(parse_text_posts(io.BytesIO(data[:data.index(b"second") + 6])))
+    assert parsed == [Post("first", "1d", 1, 2, 3), Post("second", "2d", 4, 5, 6)]
+
+# A file as written before the counters were numbers: the engagement line
+# holds the counters as LinkedIn showed them
+LEGACY_FILE = (
+    "LinkedIn Posts for: Jane Doe\n"
+    "Extracted on: 2024-03-01 10:00:00\n"
+    "Number of posts: 3\n"
+    + "=" * 80 + "\n\n"
+    "Post #1\n"
+    "Date: 2w • Edited\n"
+    "Engagement: 1,234 likes, 56 comments, 7 shares\n\n"
+    "Big news today.\n"
+    "\n" + "-" * 80 + "\n\n"
+    "Post #2\n"
+    "Date: 1mo\n"
+    "Engagement: Jane and 45 others likes, 12 comments comments, 0 shares\n\n"
+    "Thanks everyone!\n"
+    "\n" + "-" * 80 + "\n\n"
+    "Post #3\n"
+    "Date: 3mo\n"
+    "Engagement: 1.2K likes, 0 comments, 3 reposts shares\n\n"
+    "Hiring.\n"
+    "\n" + "-" * 80 + "\n\n"
+)
+
+def test_legacy_engagement_lines():
+    parsed = list(parse_text_posts(io.BytesIO(LEGACY_FILE.encode('utf-8'))))
+    assert parsed == [
+        Post("Big news today.", "2w • Edited", 1234, 56, 7),
+        Post("Thanks everyone!", "1mo", 45, 12, 0),
+        Post("Hiring.", "3mo", 1200, 0, 3)
+    ]
+
+@pytest.mark.parametrize('text, counts', [
+    ("12 likes, 3 comments, 0 shares", (12, 3, 0)),
+    ("1,234 likes, 3 comments, 1 shares", (1234, 3, 1)),
+    ("Jane and 45 others likes, 12 comments comments, 0 shares", (45, 12, 0)),
+    ("2.5M likes, 0 comments, 0 shares", (2500000, 0, 0)),
+    ("5 likes", (5, 0, 0)),
+    ("", (0, 0, 0))
+])
+def test_parse_engagement_line(text, counts):
+    assert parse_engagement_line(text) == counts
+
+@pytest.mark.parametrize('value, count', [
+    (7, 7), ("1,234", 1234), ("1.2K", 1200), ("3M", 3000000), ("12 reactions", 12), ("", 0), (None, 0), ("none", 0)
+])
+def test_parse_count(value, count):
+    assert parse_count(value) == count
+
+def test_recover_post_files(tmp_path):
+    writer = PostWriter(str(tmp_path / "Jane_linkedin_posts_1.txt"), "Jane")
+    for index in range(3):
+        writer.write({'content': f"post {index}", 'date': "1d", 'engagement': {'likes': "1,234"}})
+    # A run killed in the middle of a write, by a process that no longer runs
+    writer.file.write('{"content": "cut')
+    writer.file.close()
+    checkpoint = json.loads(Path(writer.checkpoint_path).read_text())
+    assert not checkpoint['complete'] and 'posts' not in checkpoint  # The JSONL file holds the committed posts
+    Path(writer.checkpoint_path).write_text(json.dumps({**checkpoint, 'pid': None}))
+    
+    assert recover_post_files(str(tmp_path)) == [writer.filepath]
+    assert json.loads(Path(writer.checkpoint_path).read_text())['posts'] == 3
+    assert [post.content for post in read_posts(writer.filepath)] == ["post 0", "post 1", "post 2"]
+    assert list(read_text_posts(writer.filepath))[0] == Post("post 0", "1d", 1234)
+    assert recover_post_files(str(tmp_path)) == []
+
+def test_open_writer_is_not_recovered(tmp_path):
+    with PostWriter(str(tmp_path / "open.txt"), "Open") as writer:
+        writer.write({'content': "post"})
+        assert recover_post_files(str(tmp_path)) == []
+
+def test_merge_post_files(tmp_path):
+    first, second = str(tmp_path / "first.txt"), str(tmp_path / "second.txt")
+    for filepath, contents in ((first, ["a", "b"]), (second, ["b", "c"])):
+        with PostWriter(filepath, "Jane") as writer:
+            for content in contents:
+                writer.write({'content': content})
+    merged = merge_post_files([first, second], str(tmp_path / "merged.txt"), "Jane")
+    assert [post.content for post in read_text_posts(merged.filepath)] == ["a", "b", "c"]
+    assert not os.path.exists(merged.checkpoint_path)
+
+def test_merge_replaces_an_existing_file(tmp_path):
+    source, target = str(tmp_path / "source.txt"), str(tmp_path / "merged.txt")
+    with PostWriter(source, "Jane") as writer:
+        writer.write({'content': "new"})
+    with PostWriter(target, "Jane") as writer:
+        writer.write({'content': "old"})
+    merge_post_files([source], target, "Jane")
+    assert [post.content for post in read_posts(target)] == ["new"]
+    assert count_posts(target) == 1
+
+def test_unique_filepath(tmp_path):
+    filepath = str(tmp_path / "posts.txt")
+    assert unique_filepath(filepath) == filepath
+    Path(structured_path(filepath, 'jsonl')).write_text("")
+    assert unique_filepath(filepath) == str(tmp_path / "posts_2.txt")
+    Path(tmp_path / "posts_2.txt").write_text("")
+    assert unique_filepath(filepath) == str(tmp_path / "posts_3.txt")
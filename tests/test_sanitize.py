@@ -0,0 +1,32 @@
+"""Tests of the text sanitizers for the text, structured and PDF outputs."""
+
+import pytest
+
+from linkedin_rabbit.sanitize import EMOJI_TEXT, clean_pdf, clean_structured, clean_text, emoji_to_text
+
+@pytest.mark.parametrize('text, expected', [
+    ("Launch day 🚀", "Launch day [rocket]"),
+    ("Thanks 🙏🙏", "Thanks [thanks][thanks]"),
+    ("Love it ❤️", "Love it <3"),  # Variation selector
+    ("👍🏽 agreed", "[thumbs up] agreed"),  # Skin tone
+    ("A 🦄 emoji without a label", "A 🦄 emoji without a label"),
+    ("Arrows → are kept, ➡ is labelled", "Arrows → are kept, -> is labelled"),
+    ("No emoji, café – “quoted”", "No emoji, café – “quoted”")
+])
+def test_emoji_to_text(text, expected):
+    assert emoji_to_text(text) == expected
+
+def test_every_label_is_used():
+    for emoji, label in EMOJI_TEXT.items():
+        assert emoji_to_text(f"a {emoji} b") == f"a {label} b"
+
+def test_clean_pdf():
+    assert clean_pdf("line\tone\x00\x1b\nline two") == "line one\nline two"
+    assert clean_pdf("dev 👨‍💻 ❤️ 👍🏽") == "dev 👨💻 ❤ 👍"  # Missing characters become '?' when encoded
+    assert clean_pdf("Launch 🚀\t👍🏽", emoji_text=True) == "Launch [rocket] [thumbs up]"
+    assert clean_pdf("lone \ud800 surrogate") == "lone  surrogate"
+
+def test_clean_text_and_structured():
+    assert clean_text("Launch 🚀 ❤️\x07") == "Launch ? ❤"
+    assert clean_text("Launch 🚀", emoji_text=True) == "Launch [rocket]"
+    assert clean_structured("Launch 🚀 ❤️\x07\ud800") == "Launch 🚀 ❤️"
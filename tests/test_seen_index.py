@@ -0,0 +1,45 @@
+"""Tests of the on-disk index of posts scraped in earlier runs (SeenIndex)."""
+
+import pytest
+
+from linkedin_rabbit.linkedin_rabbit import SeenIndex
+
+PROFILE = "https://www.linkedin.com/in/Jane-Doe/recent-activity/all/"
+
+@pytest.fixture
+def index(tmp_path):
+    with SeenIndex(str(tmp_path / "state" / "seen_posts.sqlite3")) as index:
+        yield index
+
+def test_added_posts_are_seen(index):
+    record = {'content': "Shipping the new release today.", 'urn': "urn:li:activity:7001"}
+    assert not index.contains(PROFILE, record)
+    index.add(PROFILE, record)
+    assert index.contains(PROFILE, record)
+    assert index.count(PROFILE) == 2  # Content hash and URN
+
+def test_posts_match_by_urn_or_content(index):
+    index.add(PROFILE, {'content': "Before the edit", 'urn': "urn:li:activity:7001"})
+    assert index.contains(PROFILE, {'content': "After the edit", 'urn': "urn:li:activity:7001"})
+    assert index.contains(PROFILE, {'content': "Before the edit", 'urn': None})
+    assert not index.contains(PROFILE, {'content': "Another post", 'urn': "urn:li:activity:7002"})
+
+def test_profiles_are_kept_apart(index):
+    record = {'content': "Same words, other author"}
+    index.add(PROFILE, record)
+    assert index.contains("https://www.linkedin.com/in/jane-doe/", record)
+    assert not index.contains("https://www.linkedin.com/in/someone-else/", record)
+    assert index.count("https://www.linkedin.com/in/someone-else/") == 0
+
+def test_adding_twice_is_ignored(index):
+    record = {'content': "post", 'urn': "urn:li:activity:7001"}
+    index.add(PROFILE, record)
+    index.add(PROFILE, record)
+    assert index.count(PROFILE) == 2
+
+def test_index_persists_across_runs(tmp_path):
+    path = str(tmp_path / "seen_posts.sqlite3")
+    with SeenIndex(path) as index:
+        index.add(PROFILE, {'content': "post"})
+    with SeenIndex(path) as index:
+        assert index.contains(PROFILE, {'content': "post"})
@@ -0,0 +1,82 @@
+"""Tests of the WebDriver command recording (DriverTracer) with a stub driver."""
+
+import json
+
+from linkedin_rabbit.tracing import DETAIL_LENGTH, DriverTracer
+
+class StubDriver:
+    """Stands in for a WebDriver: every command goes through execute()."""
+    
+    def __init__(self):
+        self.executed = []
+    
+    def execute(self, driver_command, params=None):
+        self.executed.append(driver_command)
+        if driver_command == 'fail':
+            raise RuntimeError("stale element")
+        return {'value': None}
+
+def find_posts(driver):
+    return driver.execute('findElements', {'using': 'css selector', 'value': "div.feed-shared-update-v2"})
+
+def read_texts(driver, count):
+    return [driver.execute('getElementText', {'id': index}) for index in range(count)]
+
+def test_commands_are_attributed_to_their_caller():
+    driver = StubDriver()
+    tracer = DriverTracer().attach(driver)
+    find_posts(driver)
+    read_texts(driver, 3)  # Calls in a comprehension belong to the function
+    
+    assert len(tracer) == 4
+    assert driver.executed == ['findElements'] + ['getElementText'] * 3
+    rows = {row['function']: row for row in tracer.summary()}
+    assert rows['find_posts']['calls'] == 1
+    assert rows['find_posts']['commands'] == {'findElements': 1}
+    assert rows['read_texts']['commands'] == {'getElementText': 3}
+    assert tracer.commands[0][2].startswith("test_tracing.py:")
+
+def test_failed_commands_are_recorded():
+    driver = StubDriver()
+    tracer = DriverTracer().attach(driver)
+    try:
+        driver.execute('fail')
+    except RuntimeError:
+        pass
+    assert [command[0] for command in tracer.commands] == ['fail']
+
+def test_details_are_shortened():
+    driver = StubDriver()
+    tracer = DriverTracer().attach(driver)
+    driver.execute('executeScript', {'script': "return\n   " + "x" * 200, 'args': []})
+    find_posts(driver)
+    details = [command[5] for command in tracer.commands]
+    assert len(details[0]) == DETAIL_LENGTH and details[0].startswith("return xxx") and details[0].endswith("...")
+    assert details[1] == "div.feed-shared-update-v2"
+
+def test_detach_keeps_the_recording():
+    driver = StubDriver()
+    tracer = DriverTracer().attach(driver)
+    find_posts(driver)
+    tracer.detach()
+    find_posts(driver)
+    assert 'execute' not in vars(driver)
+    assert len(tracer) == 1
+    assert driver.executed == ['findElements', 'findElements']
+
+def test_trace_file(tmp_path):
+    driver = StubDriver()
+    tracer = DriverTracer().attach(driver)
+    find_posts(driver)
+    read_texts(driver, 2)
+    
+    trace = json.loads(open(tracer.write_trace(str(tmp_path / "trace.json")), encoding='utf-8').read())
+    events = trace['traceEvents']
+    assert [event['name'] for event in events] == ['findElements', 'getElementText', 'getElementText']
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+    assert events[0]['args']['caller'] == 'find_posts'
+    assert events[0]['args']['detail'] == "div.feed-shared-update-v2"
+    assert trace['otherData']['summary'] == tracer.summary()
+    
+    table = tracer.format_summary().splitlines()
+    assert table[0].startswith("function") and table[-1].split()[:2] == ['total', '3']
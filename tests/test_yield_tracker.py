@@ -0,0 +1,109 @@
+"""Tests of the valid-post ratio (YieldTracker) and the scroll budget sized from it."""
+
+import json
+
+import pytest
+
+from linkedin_rabbit import linkedin_rabbit as lr
+from linkedin_rabbit.linkedin_rabbit import (YieldTracker, ScrollBudget, DEFAULT_VALID_RATIO, MIN_VALID_RATIO,
+                                             MAX_SCROLL_ATTEMPTS, PRIOR_WEIGHT)
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    """Keep remembered yield estimates in a temporary directory."""
+    monkeypatch.setattr(lr, 'STATE_DIR', str(tmp_path))
+    monkeypatch.setattr(lr, 'YIELD_ESTIMATES_FILE', str(tmp_path / "yield_estimates.json"))
+    return tmp_path
+
+def simulate(tracker, num_posts, per_scroll, valid_every=None):
+    """Scroll a feed like iter_posts and return the scroll steps taken and the posts found.
+    
+    Every scroll loads per_scroll elements, of which every valid_every-th is
+    a valid post (none without valid_every).
+    """
+    budget = ScrollBudget(tracker, num_posts)
+    found = attempts = handled = 0
+    loaded = per_scroll
+    while True:
+        while handled < loaded and found < num_posts:
+            handled += 1
+            valid = valid_every is not None and handled % valid_every == 0
+            tracker.record(valid)
+            found += valid
+        if found >= num_posts or attempts >= budget.update(attempts, num_posts - found):
+            return attempts, found
+        attempts += 1
+        loaded += per_scroll
+        tracker.record_scroll(per_scroll)
+
+def test_ratio_starts_at_prior_and_follows_the_feed():
+    tracker = YieldTracker()
+    assert tracker.ratio == DEFAULT_VALID_RATIO
+    for _ in range(PRIOR_WEIGHT):
+        tracker.record(valid=True)
+    assert tracker.ratio == pytest.approx((PRIOR_WEIGHT + DEFAULT_VALID_RATIO * PRIOR_WEIGHT) / (2 * PRIOR_WEIGHT))
+    for _ in range(1000):
+        tracker.record(valid=False)
+    assert tracker.ratio == MIN_VALID_RATIO
+
+def test_elements_and_scrolls_needed():
+    tracker = YieldTracker()
+    assert tracker.elements_needed(10) == 40
+    assert tracker.elements_needed(0) == 0
+    assert tracker.scrolls_needed(10) == 12  # 40 elements / 5 per scroll * 1.5
+    assert tracker.scrolls_needed(10, unprocessed_elements=40) == 0
+    tracker.record_scroll(10)
+    assert tracker.scrolls_needed(10) == 6
+    tracker.record_scroll(0)  # Scrolls that load nothing do not count
+    assert tracker.loaded_per_scroll == 10
+
+def test_feed_without_valid_posts_stops_early():
+    # The old budget was re-sized on every step and ran into MAX_SCROLL_ATTEMPTS
+    steps, found = simulate(YieldTracker(), num_posts=5, per_scroll=10)
+    assert found == 0
+    assert steps < 25
+
+def test_budget_is_not_extended_while_the_estimate_holds():
+    tracker = YieldTracker()
+    budget = ScrollBudget(tracker, 10)
+    steps = budget.steps
+    assert [budget.update(attempts, 10) for attempts in range(steps)] == [steps] * steps
+
+def test_budget_grows_when_the_yield_drops():
+    tracker = YieldTracker()
+    budget = ScrollBudget(tracker, 10)
+    steps = budget.steps
+    for _ in range(30):
+        tracker.record(valid=False)
+    assert budget.update(3, 10) > steps
+
+def test_sparse_feed_still_yields_its_posts():
+    steps, found = simulate(YieldTracker(), num_posts=10, per_scroll=10, valid_every=8)
+    assert found == 10
+    assert steps < MAX_SCROLL_ATTEMPTS
+
+def test_budget_respects_the_limit():
+    tracker = YieldTracker()
+    tracker.record_scroll(1)
+    assert ScrollBudget(tracker, 10000, limit=7).steps == 7
+
+def test_run_specific_skips_are_not_remembered(state_dir):
+    url = "https://www.linkedin.com/in/Someone/recent-activity/all/"
+    tracker = YieldTracker(url)
+    for _ in range(20):
+        tracker.record(valid=True)
+    for _ in range(200):
+        tracker.record(valid=False, remember=False)
+    assert tracker.ratio < tracker.profile_ratio
+    tracker.save()
+    
+    saved = json.loads((state_dir / "yield_estimates.json").read_text())
+    assert saved == {"in/someone": round(tracker.profile_ratio, 4)}
+    assert YieldTracker(url).prior == saved["in/someone"]
+
+def test_too_few_elements_are_not_saved(state_dir):
+    tracker = YieldTracker("https://www.linkedin.com/in/someone/")
+    for _ in range(50):
+        tracker.record(valid=False, remember=False)
+    tracker.save()
+    assert not (state_dir / "yield_estimates.json").exists()